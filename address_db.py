@@ -0,0 +1,373 @@
+"""Compact memory-mapped address database compiled from weather_code.json.
+
+Layout (header little endian, arrays in native byte order)::
+
+    header   magic b"KWAD", version u32, count u32
+    offsets  u32[count + 1]  byte offsets of each key inside the string table
+    x        i16[count]      KMA grid X per key
+    y        i16[count]      KMA grid Y per key
+    strings  utf-8 keys, sorted, concatenated
+
+Keys are sorted by code point, which is also UTF-8 byte order, so lookups
+binary-search the string table directly without building Python dicts.
+
+weather_code.json itself is built from the bundled xlsx workbooks by
+build_from_xlsx() (`python address_db.py --xlsx`).
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import time
+from array import array
+from collections.abc import Mapping, Sequence
+
+from kma_grid import CoordinateConverter
+
+MAGIC = b"KWAD"
+VERSION = 1
+HEADER = struct.Struct("<4sII")
+
+# xlsx sources in priority order: the KMA guide publishes official grid
+# cells; the 행정구역별 sheet only has lat/lon, projected through
+# CoordinateConverter. The first source to name an address wins.
+KMA_GUIDE_XLSX = "기상청41_단기예보 조회서비스_오픈API활용가이드_격자_위경도(2510).xlsx"
+ADMIN_XLSX = "행정구역별_위경도_좌표.xlsx"
+DEFAULT_SOURCES = (KMA_GUIDE_XLSX, ADMIN_XLSX)
+NAME_COLUMNS = (("1단계", "2단계", "3단계"), ("시도", "시군구", "읍면동/구", "읍/면/리/동", "리"))
+LAT_COLUMNS = ("위도(초/100)", "위도")
+LON_COLUMNS = ("경도(초/100)", "경도")
+GRID_COLUMNS = ("격자 X", "격자 Y")
+BUILD_VERSION = 1
+
+
+def db_path_for(json_path):
+    """Default location of the compiled database next to the JSON source."""
+    return os.path.splitext(json_path)[0] + ".bin"
+
+
+def build(json_path, db_path=None):
+    """Compile weather_code.json into the binary layout. Returns the key count."""
+    db_path = db_path or db_path_for(json_path)
+    with open(json_path, "r", encoding="utf-8") as f:
+        data_map = json.load(f)
+    return write_table(data_map.items(), db_path)
+
+
+def write_table(entries, db_path):
+    """Write (address, {'x':.., 'y':..}) pairs to db_path atomically."""
+    entries = sorted(entries, key=lambda item: item[0])
+    offsets = array("I", [0])
+    xs = array("h")
+    ys = array("h")
+    blob = bytearray()
+    for key, coord in entries:
+        blob += key.encode("utf-8")
+        offsets.append(len(blob))
+        xs.append(int(coord["x"]))
+        ys.append(int(coord["y"]))
+
+    tmp_path = db_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(entries)))
+        f.write(offsets.tobytes())
+        f.write(xs.tobytes())
+        f.write(ys.tobytes())
+        f.write(blob)
+    os.replace(tmp_path, db_path)
+    return len(entries)
+
+
+def manifest_path_for(json_path):
+    """Build manifest recording the source hashes behind json_path."""
+    return os.path.splitext(json_path)[0] + ".manifest.json"
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _pick(columns, names):
+    for name in names:
+        if name in columns:
+            return columns[name]
+    return None
+
+
+def iter_xlsx_rows(path):
+    """
+    Stream (address, lat, lon, grid) tuples from every sheet of an
+    address workbook. grid is (x, y) when the sheet publishes it, else None.
+    Uses openpyxl's read-only row iterator, so memory stays flat.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:
+            rows = ws.iter_rows(values_only=True)
+            header = next(rows, None)
+            if not header:
+                continue
+            columns = {str(name).strip(): i for i, name in enumerate(header) if name is not None}
+            names = next(([columns[n] for n in group] for group in NAME_COLUMNS
+                          if all(n in columns for n in group)), None)
+            lat_col, lon_col = _pick(columns, LAT_COLUMNS), _pick(columns, LON_COLUMNS)
+            if names is None or lat_col is None or lon_col is None:
+                print(f"[DEBUG] Skipping sheet {ws.title!r} in {path}: unknown header")
+                continue
+            gx_col, gy_col = (columns.get(n) for n in GRID_COLUMNS)
+            width = max(names + [lat_col, lon_col] + [c for c in (gx_col, gy_col) if c is not None]) + 1
+
+            for row in rows:
+                if len(row) < width:
+                    row = tuple(row) + (None,) * (width - len(row))
+                parts = [str(row[i]).strip() for i in names if row[i] not in (None, "")]
+                lat, lon = row[lat_col], row[lon_col]
+                grid = None
+                if gx_col is not None and row[gx_col] is not None and row[gy_col] is not None:
+                    grid = (int(row[gx_col]), int(row[gy_col]))
+                yield " ".join(parts), lat, lon, grid
+    finally:
+        wb.close()
+
+
+def build_from_xlsx(sources, json_path, db_path=None, manifest_path=None, force=False):
+    """
+    Build weather_code.json and its binary database from address workbooks.
+    Skipped when the manifest shows the same sources and an untouched JSON
+    (the binary DB is recompiled from the JSON if only it is missing).
+    Returns a stats dict; stats["skipped"] tells whether work was done.
+    """
+    db_path = db_path or db_path_for(json_path)
+    manifest_path = manifest_path or manifest_path_for(json_path)
+    start_t = time.time()
+
+    source_hashes = {os.path.basename(path): file_sha256(path) for path in sources}
+    if not force and os.path.exists(json_path) and os.path.exists(manifest_path):
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        if (manifest.get("version") == BUILD_VERSION
+                and manifest.get("sources") == source_hashes
+                and manifest.get("json_sha256") == file_sha256(json_path)):
+            if not os.path.exists(db_path):
+                build(json_path, db_path)
+            stats = dict(manifest.get("stats", {}))
+            stats.update(skipped=True, seconds=time.time() - start_t)
+            return stats
+
+    data_map = {}
+    stats = {"rows": 0, "addresses": 0, "duplicates": 0, "conflicts": 0,
+             "projected": 0, "grid_mismatches": 0, "invalid": 0}
+    for path in sources:
+        for address, lat, lon, grid in iter_xlsx_rows(path):
+            stats["rows"] += 1
+            if not address:
+                stats["invalid"] += 1
+                continue
+            try:
+                projected = CoordinateConverter.to_grid(float(lat), float(lon))
+            except (TypeError, ValueError):
+                projected = None
+            if grid is None:
+                if projected is None:
+                    stats["invalid"] += 1
+                    continue
+                grid = projected
+                stats["projected"] += 1
+            elif projected is not None and projected != grid:
+                stats["grid_mismatches"] += 1
+
+            coord = {"x": grid[0], "y": grid[1]}
+            existing = data_map.get(address)
+            if existing is not None:
+                stats["duplicates"] += 1
+                if existing != coord:
+                    stats["conflicts"] += 1
+                continue
+            data_map[address] = coord
+
+    data_map = dict(sorted(data_map.items()))
+    stats["addresses"] = len(data_map)
+
+    tmp_path = json_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data_map, f, ensure_ascii=False)
+    os.replace(tmp_path, json_path)
+    write_table(data_map.items(), db_path)
+
+    manifest = {
+        "version": BUILD_VERSION,
+        "sources": source_hashes,
+        "json_sha256": file_sha256(json_path),
+        "stats": stats,
+    }
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+    stats = dict(stats, skipped=False, seconds=time.time() - start_t)
+    return stats
+
+
+class _KeyList(Sequence):
+    """Sorted address keys, decoded from the string table on access."""
+
+    def __init__(self, table):
+        self._table = table
+
+    def __len__(self):
+        return self._table.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._table.key_at(i) for i in range(*index.indices(self._table.count))]
+        if index < 0:
+            index += self._table.count
+        if not 0 <= index < self._table.count:
+            raise IndexError(index)
+        return self._table.key_at(index)
+
+
+class AddressTable(Mapping):
+    """
+    Read-only view over a compiled address database.
+    Behaves like the old `{address: {'x': .., 'y': ..}}` dict.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"Unsupported address database: {path}")
+
+        self.count = count
+        view = memoryview(self._mm)
+        pos = HEADER.size
+        self._offsets = view[pos:pos + 4 * (count + 1)].cast("I")
+        pos += 4 * (count + 1)
+        self._xs = view[pos:pos + 2 * count].cast("h")
+        pos += 2 * count
+        self._ys = view[pos:pos + 2 * count].cast("h")
+        pos += 2 * count
+        self._strings_start = pos
+        self.keys_list = _KeyList(self)
+
+    def close(self):
+        for view in (self._offsets, self._xs, self._ys):
+            view.release()
+        self._mm.close()
+
+    def _key_bytes(self, index):
+        start = self._strings_start + self._offsets[index]
+        end = self._strings_start + self._offsets[index + 1]
+        return self._mm[start:end]
+
+    def key_at(self, index):
+        return self._key_bytes(index).decode("utf-8")
+
+    def coord_at(self, index):
+        return self._xs[index], self._ys[index]
+
+    def index_of(self, key):
+        """Binary search for key; returns its id or -1."""
+        target = key.encode("utf-8")
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_bytes(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count and self._key_bytes(lo) == target:
+            return lo
+        return -1
+
+    def coords(self, key):
+        """(x, y) for key, or None if unknown."""
+        index = self.index_of(key)
+        if index < 0:
+            return None
+        return self.coord_at(index)
+
+    def __getitem__(self, key):
+        if not isinstance(key, str):
+            raise KeyError(key)
+        index = self.index_of(key)
+        if index < 0:
+            raise KeyError(key)
+        x, y = self.coord_at(index)
+        return {"x": x, "y": y}
+
+    def __contains__(self, key):
+        return isinstance(key, str) and self.index_of(key) >= 0
+
+    def __iter__(self):
+        return iter(self.keys_list)
+
+    def __len__(self):
+        return self.count
+
+
+def open_address_db(json_path, db_path=None):
+    """
+    Open the compiled database for json_path, rebuilding it first when it
+    is missing or older than the JSON source.
+    """
+    db_path = db_path or db_path_for(json_path)
+    stale = not os.path.exists(db_path)
+    if not stale and os.path.exists(json_path):
+        stale = os.path.getmtime(db_path) < os.path.getmtime(json_path)
+    if stale:
+        build(json_path, db_path)
+    return AddressTable(db_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile weather_code.json into the binary address database")
+    parser.add_argument("json_path", nargs="?", default="weather_code.json")
+    parser.add_argument("-o", "--output", help="output path (default: <json_path>.bin)")
+    parser.add_argument("--xlsx", nargs="*", metavar="WORKBOOK",
+                        help="rebuild json_path from address workbooks first (default: the bundled xlsx files)")
+    parser.add_argument("--force", action="store_true", help="with --xlsx, rebuild even if the sources are unchanged")
+    args = parser.parse_args()
+
+    if args.xlsx is not None:
+        base_dir = os.path.dirname(os.path.abspath(args.json_path))
+        sources = args.xlsx or [os.path.join(base_dir, name) for name in DEFAULT_SOURCES]
+        stats = build_from_xlsx(sources, args.json_path, args.output, force=args.force)
+        output = args.output or db_path_for(args.json_path)
+        if stats["skipped"]:
+            print(f"Sources unchanged, kept {args.json_path} and {output} ({stats['seconds']:.2f}s)")
+        else:
+            rate = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+            print(f"Read {stats['rows']} rows in {stats['seconds']:.2f}s ({rate:.0f} rows/s): "
+                  f"{stats['addresses']} addresses, {stats['duplicates']} duplicates "
+                  f"({stats['conflicts']} conflicting), {stats['projected']} projected, "
+                  f"{stats['grid_mismatches']} published cells differ from the projection")
+            print(f"Wrote {args.json_path} and {output} ({os.path.getsize(output)} bytes)")
+        return 0
+
+    start_t = time.time()
+    count = build(args.json_path, args.output)
+    output = args.output or db_path_for(args.json_path)
+    print(f"Compiled {count} addresses into {output} ({os.path.getsize(output)} bytes, {time.time() - start_t:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
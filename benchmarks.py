@@ -0,0 +1,497 @@
+"""Micro-benchmarks for the weather tools.
+
+Usage: python benchmarks.py <name>   (see --help for the list)
+Each benchmark prints a small before/after table; nothing touches the network.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+JSON_DB_PATH = os.path.join(ROOT, "weather_code.json")
+
+
+# --- startup: address DB load time and resident memory ---
+STARTUP_SNIPPET = r"""
+import json, resource, sys, time
+
+def rss_kb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+mode, path = sys.argv[1], sys.argv[2]
+before = rss_kb()
+start = time.perf_counter()
+if mode == "json":
+    with open(path, "r", encoding="utf-8") as f:
+        data_map = json.load(f)
+    keys = sorted(data_map.keys())
+    coord = data_map["대전광역시 유성구 구성동"]
+else:
+    from address_db import open_address_db
+    data_map = open_address_db(path)
+    keys = data_map.keys_list
+    coord = data_map["대전광역시 유성구 구성동"]
+elapsed = time.perf_counter() - start
+after = rss_kb()
+print(json.dumps({"seconds": elapsed, "rss_kb": after - before, "count": len(keys)}))
+"""
+
+
+def bench_startup(repeat):
+    from address_db import build, db_path_for
+
+    build(JSON_DB_PATH, db_path_for(JSON_DB_PATH))
+    print(f"{'mode':<8}{'load ms (median)':>18}{'RSS +KB':>15}{'keys':>8}")
+    for mode in ("json", "binary"):
+        runs = []
+        for _ in range(repeat):
+            out = subprocess.run(
+                [sys.executable, "-c", STARTUP_SNIPPET, mode, JSON_DB_PATH],
+                cwd=ROOT, capture_output=True, text=True, check=True,
+            ).stdout
+            runs.append(json.loads(out))
+        runs.sort(key=lambda r: r["seconds"])
+        mid = runs[len(runs) // 2]
+        print(f"{mode:<8}{mid['seconds'] * 1000:>18.2f}{mid['rss_kb']:>15}{mid['count']:>8}")
+
+
+# --- grid_parse: KMA apihub grid text -> values ---
+def make_grid_response(nx=149, ny=253, per_line=10):
+    """Synthetic nph-dfs_shrt_grd body in the apihub layout."""
+    import random
+
+    rng = random.Random(7)
+    values = [round(rng.uniform(-10.0, 35.0), 1) if rng.random() > 0.05 else -99.0 for _ in range(nx * ny)]
+    lines = []
+    for i in range(0, len(values), per_line):
+        lines.append(", ".join(f"{v:6.1f}" for v in values[i:i + per_line]) + ",")
+    lines.append("=")
+    return "\n".join(lines)
+
+
+def legacy_parse_grid(text, nx=149, ny=253):
+    """The regex/float-list parser headless_weather used before numpy."""
+    import re
+
+    tokens = re.split(r'[,\s]+', text)
+    values = [float(t) for t in tokens if t.strip() and not t.startswith('=')]
+    if len(values) >= nx * ny:
+        return values[-(nx * ny):]
+    return None
+
+
+def measure(func, repeat):
+    """Median seconds and tracemalloc peak bytes of func()."""
+    import tracemalloc
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    times.sort()
+    return times[len(times) // 2], peak
+
+
+def bench_grid_parse(repeat):
+    from headless_weather import WeatherFetcher
+
+    text = make_grid_response()
+    print(f"response: {len(text) / 1024:.0f} KiB, {WeatherFetcher.NX * WeatherFetcher.NY} values")
+    print(f"{'parser':<10}{'ms/grid (median)':>18}{'peak MiB':>10}")
+    for name, func in (
+        ("legacy", lambda: legacy_parse_grid(text)),
+        ("numpy", lambda: WeatherFetcher.parse_grid(text)),
+    ):
+        seconds, peak = measure(func, repeat)
+        print(f"{name:<10}{seconds * 1000:>18.2f}{peak / 2**20:>10.2f}")
+
+
+# --- cell_stream: one cell from a streamed grid vs. full parse ---
+def iter_chunks(body, size=16 * 1024):
+    view = memoryview(body)
+    for start in range(0, len(body), size):
+        yield bytes(view[start:start + size])
+
+
+def bench_cell_stream(repeat):
+    from headless_weather import GridCellReader, WeatherFetcher
+
+    nx = WeatherFetcher.NX
+    print(f"{'grid':<10}{'method':<14}{'ms/request':>12}{'peak KiB':>10}{'KiB read':>10}")
+    for scale in (1, 4):
+        ny = WeatherFetcher.NY * scale
+        body = make_grid_response(nx=nx, ny=ny).encode()
+        index = 101 * nx + 67  # Daejeon cell
+
+        def full_legacy():
+            content = b"".join(iter_chunks(body))
+            return legacy_parse_grid(content.decode(), nx=nx, ny=ny)[index]
+
+        def full_numpy():
+            content = b"".join(iter_chunks(body))
+            return WeatherFetcher.parse_grid(content.decode())
+
+        read = {}
+
+        def streamed():
+            reader = GridCellReader([index])
+            read["bytes"] = 0
+            for chunk in iter_chunks(body):
+                read["bytes"] += len(chunk)
+                if reader.feed(chunk):
+                    break
+            return reader.finish()[index]
+
+        for name, func, nbytes in (
+            ("legacy", full_legacy, len(body)),
+            ("numpy", full_numpy, len(body)),
+            ("stream-cell", streamed, None),
+        ):
+            if scale > 1 and name == "numpy":
+                continue  # parse_grid is fixed to the KMA grid shape
+            seconds, peak = measure(func, repeat)
+            nbytes = nbytes if nbytes is not None else read["bytes"]
+            print(f"{nx}x{ny:<6}{name:<14}{seconds * 1000:>12.2f}{peak / 1024:>10.0f}{nbytes / 1024:>10.0f}")
+
+
+# --- projection: lat/lon -> KMA grid ---
+def bench_projection(repeat):
+    import numpy as np
+
+    from kma_grid import CoordinateConverter
+
+    rng = np.random.default_rng(11)
+    lats = rng.uniform(32.5, 39.0, 1_000_000)
+    lons = rng.uniform(124.0, 132.0, 1_000_000)
+    scalar_n = 100_000
+    scalar_lats, scalar_lons = lats[:scalar_n].tolist(), lons[:scalar_n].tolist()
+
+    seconds, _ = measure(lambda: [CoordinateConverter.to_grid(a, b) for a, b in zip(scalar_lats, scalar_lons)], repeat)
+    print(f"{'to_grid (scalar)':<20}{scalar_n / seconds / 1e6:>8.2f} M points/s")
+    seconds, _ = measure(lambda: CoordinateConverter.to_grid_many(lats, lons), repeat)
+    print(f"{'to_grid_many':<20}{len(lats) / seconds / 1e6:>8.2f} M points/s")
+
+
+# --- forecast_parse: getVilageFcst items -> per-hour values ---
+def make_forecast_items(hours=80):
+    """Synthetic getVilageFcst items: 12 categories per forecast hour."""
+    import datetime as dt
+
+    start = dt.datetime(2026, 7, 9, 15)
+    values = {"TMP": "24", "UUU": "1.2", "VVV": "-0.4", "VEC": "210", "WSD": "3.1", "SKY": "3",
+              "PTY": "0", "POP": "20", "WAV": "0", "PCP": "1mm 미만", "REH": "80", "SNO": "적설없음"}
+    items = []
+    for h in range(hours):
+        t = start + dt.timedelta(hours=h)
+        for category, value in values.items():
+            items.append({"baseDate": "20260709", "baseTime": "1400", "category": category,
+                          "fcstDate": t.strftime("%Y%m%d"), "fcstTime": t.strftime("%H%M"),
+                          "fcstValue": value, "nx": 67, "ny": 101})
+    return items
+
+
+def legacy_timeseries(items, count=36):
+    """The per-hour dict builder get_timeseries used before ForecastTable."""
+    forecast_map = {}
+    for item in items:
+        category = item.get('category', '')
+        value = item.get('fcstValue', '')
+        key = f"{item.get('fcstDate', '')}{item.get('fcstTime', '')}"
+        if key not in forecast_map:
+            forecast_map[key] = {'tmef': key}
+        try:
+            if category in ['TMP', 'WSD', 'REH', 'POP']:
+                forecast_map[key][category] = float(value)
+            elif category == 'PCP':
+                if value == '강수없음':
+                    forecast_map[key][category] = 0
+                elif '1mm' in value or '미만' in value:
+                    forecast_map[key][category] = 1
+                elif '30' in value or '50' in value:
+                    forecast_map[key][category] = 3
+                else:
+                    forecast_map[key][category] = 2
+            elif category == 'SNO':
+                if value == '적설없음':
+                    forecast_map[key][category] = 0
+                elif '1cm' in value or '미만' in value:
+                    forecast_map[key][category] = 1
+                else:
+                    forecast_map[key][category] = 2
+            elif category in ['SKY', 'PTY']:
+                forecast_map[key][category] = int(value)
+        except ValueError:
+            pass
+    return [forecast_map[key] for key in sorted(forecast_map)[:count]]
+
+
+def bench_forecast_parse(repeat):
+    from kma_forecast import ForecastTable
+
+    items = make_forecast_items()
+    assert ForecastTable.from_items(items, count=36).to_dicts() == legacy_timeseries(items)
+    print(f"response: {len(items)} items")
+    print(f"{'parser':<14}{'ms/response':>12}{'peak KiB':>10}")
+    for name, func in (
+        ("legacy dicts", lambda: legacy_timeseries(items)),
+        ("ForecastTable", lambda: ForecastTable.from_items(items, count=36)),
+    ):
+        seconds, peak = measure(func, repeat * 20)
+        print(f"{name:<14}{seconds * 1000:>12.3f}{peak / 1024:>10.1f}")
+
+
+# --- scheduler_window: planned slice vs. full getVilageFcst download ---
+def make_vilage_items(base_date="20260709", base_time="0200", last_day_offset=3):
+    """getVilageFcst items in API order: hour by hour, TMN at 06, TMX at 15."""
+    import datetime as dt
+
+    from kma_forecast import HOUR_CATEGORIES
+
+    base = dt.datetime.strptime(base_date + base_time, "%Y%m%d%H%M")
+    end = (base + dt.timedelta(days=last_day_offset)).replace(hour=23)
+    items = []
+    t = base + dt.timedelta(hours=1)
+    while t <= end:
+        extra = ["TMN"] if t.hour == 6 else ["TMX"] if t.hour == 15 else []
+        for category in list(HOUR_CATEGORIES) + extra:
+            value = {"SKY": "3", "PTY": "0", "PCP": "강수없음", "SNO": "적설없음"}.get(category, "21.5")
+            items.append({"baseDate": base_date, "baseTime": base_time, "category": category,
+                          "fcstDate": t.strftime("%Y%m%d"), "fcstTime": t.strftime("%H%M"),
+                          "fcstValue": value, "nx": 67, "ny": 101})
+        t += dt.timedelta(hours=1)
+    return items
+
+
+class _SlicingSession:
+    """In-process getVilageFcst serving pages of a fixed item list."""
+    def __init__(self, items):
+        self.items = items
+        self.bytes = 0
+
+    def get(self, url, params=None, timeout=None):
+        rows, page = params["numOfRows"], params["pageNo"]
+        body = json.dumps({"response": {
+            "header": {"resultCode": "00", "resultMsg": "NORMAL_SERVICE"},
+            "body": {"dataType": "JSON", "items": {"item": self.items[(page - 1) * rows:page * rows]},
+                     "pageNo": page, "numOfRows": rows, "totalCount": len(self.items)},
+        }}, ensure_ascii=False).encode()
+        self.bytes += len(body)
+        response = type("Response", (), {})()
+        response.raise_for_status = lambda: None
+        response.json = lambda: json.loads(body)
+        return response
+
+
+def bench_scheduler_window(repeat):
+    from unittest import mock
+
+    import weather_scheduler
+    from kma_forecast import ForecastTable
+    from weather_scheduler import WeatherFetcher
+
+    items = make_vilage_items()
+    targets = [f"20260710{h:02d}00" for h in range(4, 9)]
+
+    def full():
+        return ForecastTable.from_items(WeatherFetcher.fetch_forecast(67, 101))
+
+    def planned():
+        return WeatherFetcher.fetch_window(67, 101, targets)
+
+    print(f"issuance 20260709 0200: {len(items)} rows, window {targets[0][8:10]}-{targets[-1][8:10]}h next day")
+    print(f"{'fetch':<10}{'requests':>10}{'KiB':>8}{'ms/run':>9}")
+    for name, func in (("full", full), ("planned", planned)):
+        session = _SlicingSession(items)
+        with mock.patch.object(WeatherFetcher, "_session", session), \
+                mock.patch.object(WeatherFetcher, "_pager", None), \
+                mock.patch.object(WeatherFetcher, "get_base_datetime", return_value=("20260709", "0200")), \
+                mock.patch("builtins.print"):
+            pager = WeatherFetcher.get_pager()
+            table = func()
+            requests_per_run = pager.stats["pages"]
+            bytes_per_run = session.bytes
+            seconds, _ = measure(func, repeat)
+        assert table.covers(targets, weather_scheduler.TARGET_CATEGORIES)
+        print(f"{name:<10}{requests_per_run:>10}{bytes_per_run / 1024:>8.1f}{seconds * 1000:>9.2f}")
+
+
+# --- reverse_geocode: lat/lon -> nearest address ---
+def bench_reverse_geocode(repeat):
+    import numpy as np
+
+    from address_db import open_address_db
+    from kma_grid import CoordinateConverter
+    from weather_app import ReverseGeocoder
+
+    table = open_address_db(JSON_DB_PATH)
+    start = time.perf_counter()
+    geocoder = ReverseGeocoder.from_mapping(table)
+    print(f"index build: {(time.perf_counter() - start) * 1000:.0f} ms, {len(geocoder.cells)} cells")
+
+    rng = np.random.default_rng(13)
+    n = 100_000
+    # Jitter around real cells, like GPS fixes of users inside Korea
+    cells = np.array(list(geocoder.cells), dtype=np.float64)
+    picks = cells[rng.integers(0, len(cells), n)] + rng.uniform(-1.5, 1.5, (n, 2))
+    lats, lons = zip(*(CoordinateConverter.to_latlon(x, y) for x, y in picks.tolist()))
+    lats, lons = np.array(lats), np.array(lons)
+    scalar_n = 10_000
+
+    seconds, _ = measure(lambda: [geocoder.nearest(a, b, limit=1) for a, b in zip(lats[:scalar_n], lons[:scalar_n])], repeat)
+    print(f"{'nearest (scalar)':<20}{scalar_n / seconds:>10.0f} lookups/s")
+    seconds, _ = measure(lambda: geocoder.nearest_many(lats, lons), repeat)
+    print(f"{'nearest_many':<20}{n / seconds:>10.0f} lookups/s  ({seconds:.2f}s for {n})")
+    table.close()
+
+
+# --- naver_compare: hourly block out of the comparison page ---
+def make_naver_page(days=3):
+    """A comparison page shaped like the real one: big script payload, hourly block in the middle."""
+    providers = ("KMA", "TWC", "WEATHERNEWS", "ACCUWEATHER")
+    hourly = {"domesticHourlyListMap": {
+        code: [
+            {"aplYmd": f"202607{9 + h // 24:02d}", "aplTm": f"{h % 24:02d}", "wetrTxt": "구름많음", "tmpr": 24.0,
+             "rainProb": 20, "rainAmt": "-", "snowAmt": "-", "windDrctnName": "남서풍", "fcastYmdt": "20260709051200"}
+            for h in range(days * 24)
+        ]
+        for code in providers
+    }}
+    choice = {
+        "compareCurrent~~1": {"rows": [{"code": code, "tmpr": 23.5, "wetrTxt": "흐림"} for code in providers]},
+        "compareHourlyFcast~~1": hourly,
+        "compareWeeklyFcast~~1": {"rows": [{"code": code, "day": d, "desc": "비 온 뒤 갬" * 4}
+                                           for code in providers for d in range(10)] * 40},
+        "compareMap~~1": {"points": [{"lat": 36 + i / 1000, "lng": 127 + i / 1000, "name": "지점"} for i in range(4000)]},
+    }
+    payload = json.dumps({"success": True, "results": {"choiceResult": choice}}, ensure_ascii=False)
+    head = "<html><head><style>" + ".c{color:#333}" * 8000 + "</style></head><body><script>"
+    tail = "</script>" + "<div class=\"item\">날씨 비교</div>" * 6000 + "</body></html>"
+    return (head + "var blockApiResult = " + payload + ";" + tail).encode("utf-8")
+
+
+def legacy_block_api_result(html):
+    marker = "var blockApiResult = "
+    start = html.find(marker)
+    payload, _ = json.JSONDecoder().raw_decode(html[start + len(marker):])
+    return payload["results"]["choiceResult"]["compareHourlyFcast~~1"]
+
+
+def bench_naver_compare(repeat):
+    from naver_compare import HourlyBlockReader, extract_hourly_block
+
+    body = make_naver_page()
+    read = {}
+
+    def full_legacy():
+        return legacy_block_api_result(b"".join(iter_chunks(body)).decode("utf-8"))
+
+    def full_in_place():
+        return extract_hourly_block(b"".join(iter_chunks(body)).decode("utf-8"))
+
+    def streamed():
+        reader = HourlyBlockReader()
+        for chunk in iter_chunks(body):
+            if reader.feed(chunk):
+                break
+        read["bytes"] = reader.bytes_read
+        return reader.finish()
+
+    expected = full_legacy()
+    print(f"page: {len(body) / 1024:.0f} KiB, hourly block {len(json.dumps(expected, ensure_ascii=False)) / 1024:.0f} KiB")
+    print(f"{'method':<14}{'ms/page':>10}{'peak KiB':>10}{'KiB read':>10}")
+    for name, func in (("legacy", full_legacy), ("in-place", full_in_place), ("stream-block", streamed)):
+        assert func() == expected
+        seconds, peak = measure(func, repeat)
+        nbytes = read["bytes"] if name == "stream-block" else len(body)
+        print(f"{name:<14}{seconds * 1000:>10.2f}{peak / 1024:>10.0f}{nbytes / 1024:>10.0f}")
+
+
+# --- table_profile: training table structure checks on a cafe-sized image ---
+def make_training_table(width=1600, row_height=110):
+    from PIL import Image, ImageDraw
+
+    height = row_height * 9 + 4
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, row_height, width - 1, row_height * 2), fill=(146, 208, 80))
+    row_ends = [row_height * (i + 3) for i in range(7)]
+    for y in (0, *row_ends):
+        draw.line((0, y, width - 1, y), fill=(212, 212, 212), width=2)
+    draw.line((int(width * 0.23), row_height * 2, int(width * 0.23), row_ends[-1]), fill=(212, 212, 212), width=2)
+    return image
+
+
+def legacy_table_checks(image):
+    """The per-pixel loops: grid rows, header rows, then the date column."""
+    def is_dark(p):
+        return max(p) < 230 and max(p) - min(p) < 12
+
+    pixels = image.convert("RGB").load()
+    grid_rows = [y for y in range(image.height)
+                 if sum(1 for x in range(image.width) if is_dark(pixels[x, y])) >= int(image.width * 0.72)]
+    pixels = image.convert("RGB").load()
+    green_rows = [y for y in range(image.height)
+                  if sum(1 for x in range(image.width)
+                         if pixels[x, y][1] >= 145 and pixels[x, y][1] >= pixels[x, y][0] + 25
+                         and pixels[x, y][1] >= pixels[x, y][2] + 45) >= int(image.width * 0.55)]
+    top, bottom = green_rows[-1] + 1, grid_rows[-1]
+    pixels = image.convert("RGB").load()
+    columns = [x for x in range(1, image.width - 1)
+               if sum(1 for y in range(top, bottom + 1) if is_dark(pixels[x, y])) >= int((bottom - top) * 0.72)]
+    return grid_rows, green_rows, columns
+
+
+def bench_table_profile(repeat):
+    import update_training_schedule as schedule
+
+    image = make_training_table()
+    print(f"table image: {image.width}x{image.height}")
+    print(f"{'method':<12}{'ms/image':>10}{'peak MiB':>10}")
+    for name, func, runs in (
+        ("legacy", lambda: legacy_table_checks(image), 1),
+        ("numpy", lambda: schedule.validate_schedule_table(image), repeat),
+    ):
+        seconds, peak = measure(func, runs)
+        print(f"{name:<12}{seconds * 1000:>10.1f}{peak / 2**20:>10.1f}")
+
+
+BENCHMARKS = {
+    "startup": bench_startup,
+    "grid_parse": bench_grid_parse,
+    "cell_stream": bench_cell_stream,
+    "projection": bench_projection,
+    "reverse_geocode": bench_reverse_geocode,
+    "forecast_parse": bench_forecast_parse,
+    "scheduler_window": bench_scheduler_window,
+    "naver_compare": bench_naver_compare,
+    "table_profile": bench_table_profile,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("name", choices=sorted(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    BENCHMARKS[args.name](args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
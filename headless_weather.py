@@ -1,10 +1,20 @@
+import asyncio
 import json
+import math
+import os
+import random
+import shutil
 import time
 import requests
 import threading
-import concurrent.futures
 from datetime import datetime, timedelta
 import sys
+import warnings
+
+import numpy as np
+
+from address_db import open_address_db
+from kma_forecast import ForecastTable
 
 # --- Configuration ---
 JSON_DB_PATH = "weather_code.json" # Relative path, assuming in same repo
@@ -13,6 +23,339 @@ LOCATIONS_TO_CHECK = [
     "대전광역시 유성구 구성동",
     "부산광역시 해운대구 우제1동"
 ]
+GRID_ARCHIVE_DIR = "grid_archive" # Parsed grids reused across runs (None disables)
+GRID_ARCHIVE_KEEP_ISSUANCES = 3
+GRID_ARCHIVE_MAX_BYTES = 512 * 1024 * 1024
+FETCH_DEADLINE_SECONDS = 180 # Total network budget per run
+
+# --- 0. Grid Archive ---
+class GridArchive:
+    """
+    On-disk archive of parsed grids, one .npy file per (tmfc, tmef, var)
+    stored as <root>/<tmfc>/<var>_<tmef>.npy.
+    Reads are memory-mapped, so a point lookup only pages in what it needs.
+    """
+    def __init__(self, root, keep_issuances=GRID_ARCHIVE_KEEP_ISSUANCES, max_bytes=GRID_ARCHIVE_MAX_BYTES):
+        self.root = root
+        self.keep_issuances = keep_issuances
+        self.max_bytes = max_bytes
+
+    def path(self, tmfc, tmef, var):
+        return os.path.join(self.root, tmfc, f"{var}_{tmef}.npy")
+
+    def get(self, tmfc, tmef, var):
+        path = self.path(tmfc, tmef, var)
+        if not os.path.exists(path):
+            return None
+        try:
+            return np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+
+    def put(self, tmfc, tmef, var, grid):
+        path = self.path(tmfc, tmef, var)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, np.ascontiguousarray(grid, dtype=np.float32))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[WARN] Grid archive write failed: {e}")
+
+    def issuances(self):
+        """Archived tmfc directories, oldest first."""
+        try:
+            names = os.listdir(self.root)
+        except OSError:
+            return []
+        return sorted(n for n in names if n.isdigit() and os.path.isdir(os.path.join(self.root, n)))
+
+    def _files(self, tmfc):
+        folder = os.path.join(self.root, tmfc)
+        return [os.path.join(folder, n) for n in os.listdir(folder) if n.endswith(".npy")]
+
+    def size_bytes(self):
+        return sum(os.path.getsize(p) for tmfc in self.issuances() for p in self._files(tmfc))
+
+    def prune(self):
+        """
+        Keep only the newest `keep_issuances` issuances, then drop the oldest
+        issuances (and finally the oldest files) until under `max_bytes`.
+        Returns the number of bytes freed.
+        """
+        freed = 0
+        issuances = self.issuances()
+        for tmfc in issuances[:-self.keep_issuances] if self.keep_issuances else issuances:
+            freed += self._remove_issuance(tmfc)
+        issuances = self.issuances()
+
+        total = self.size_bytes()
+        while total > self.max_bytes and len(issuances) > 1:
+            removed = self._remove_issuance(issuances.pop(0))
+            freed += removed
+            total -= removed
+
+        if total > self.max_bytes and issuances:
+            files = sorted(self._files(issuances[0]), key=os.path.getmtime)
+            for path in files:
+                if total <= self.max_bytes:
+                    break
+                size = os.path.getsize(path)
+                os.remove(path)
+                freed += size
+                total -= size
+        return freed
+
+    def _remove_issuance(self, tmfc):
+        folder = os.path.join(self.root, tmfc)
+        size = sum(os.path.getsize(p) for p in self._files(tmfc))
+        shutil.rmtree(folder, ignore_errors=True)
+        return size
+
+
+# --- 0-1. Async Fetch Engine ---
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit for asyncio tasks.
+    Grows by ~1 per window of fast successes, shrinks 25% when latency
+    exceeds `slow_factor` x the best latency seen, halves on errors.
+    """
+    def __init__(self, initial=4, minimum=1, maximum=16, slow_factor=2.5):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.slow_factor = slow_factor
+        self.in_flight = 0
+        self.best_latency = None
+        self.peak_limit = self.limit
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, latency=None, ok=True):
+        async with self._cond:
+            self.in_flight -= 1
+            if not ok:
+                self.limit = max(self.minimum, self.limit / 2)
+            elif latency is not None:
+                if self.best_latency is None or latency < self.best_latency:
+                    self.best_latency = latency
+                if latency > self.best_latency * self.slow_factor:
+                    self.limit = max(self.minimum, self.limit * 0.75)
+                else:
+                    self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self.peak_limit = max(self.peak_limit, self.limit)
+            self._cond.notify_all()
+
+
+class BodyReader:
+    """Collects the whole response body and hands it to parse() at the end."""
+    def __init__(self, parse):
+        self.parse = parse
+        self.chunks = []
+
+    def feed(self, chunk):
+        self.chunks.append(chunk)
+        return False
+
+    def finish(self):
+        return self.parse(b"".join(self.chunks))
+
+
+class GridCellReader:
+    """
+    Streams an nph-dfs_shrt_grd body and converts only the wanted cell
+    indices (grid_y * NX + grid_x) to floats. Values are counted line by
+    line as bytes arrive; once the last wanted index has passed, feed()
+    returns True so the caller can drop the connection. Memory use is
+    one line plus the wanted values, independent of the grid size.
+    """
+    _SEPARATORS = bytes.maketrans(b",=", b"  ")
+
+    def __init__(self, indices, missing_threshold=-90.0):
+        self.wanted = sorted(set(indices))
+        self.missing_threshold = missing_threshold
+        self.values = {}
+        self.count = 0  # values seen so far
+        self._next = 0  # position in self.wanted
+        self._carry = b""
+
+    @property
+    def done(self):
+        return self._next >= len(self.wanted)
+
+    def feed(self, chunk):
+        if self.done:
+            return True
+        data = self._carry + chunk
+        cut = data.rfind(b"\n") + 1
+        self._carry = data[cut:]
+        if cut:
+            self._consume(data[:cut])
+        return self.done
+
+    def finish(self):
+        if self._carry and not self.done:
+            self._consume(self._carry)
+        self._carry = b""
+        if not self.done:
+            return None # Body ended before the wanted cells
+        return self.values
+
+    def _consume(self, block):
+        for line in block.split(b"\n"):
+            if line.lstrip().startswith(b"#"):
+                continue
+            tokens = line.translate(self._SEPARATORS).split()
+            end = self.count + len(tokens)
+            while self._next < len(self.wanted) and self.wanted[self._next] < end:
+                index = self.wanted[self._next]
+                value = float(tokens[index - self.count])
+                self.values[index] = math.nan if value <= self.missing_threshold else value
+                self._next += 1
+            self.count = end
+            if self.done:
+                return
+
+
+class AsyncFetchEngine:
+    """
+    Runs many GET requests on one asyncio loop with an AdaptiveLimiter,
+    exponential backoff with full jitter and a total deadline per run.
+    Uses httpx (HTTP/2 when the `h2` package is installed) and falls back
+    to the pooled requests session on worker threads.
+    """
+    CHUNK_SIZE = 16 * 1024
+
+    def __init__(self, deadline=FETCH_DEADLINE_SECONDS, max_attempts=5, request_timeout=10.0,
+                 backoff_base=0.5, backoff_cap=8.0, limiter=None):
+        self.deadline = deadline
+        self.max_attempts = max_attempts
+        self.request_timeout = request_timeout
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.limiter = limiter
+        self.latencies = []
+        self.stats = {"requests": 0, "retries": 0, "failures": 0, "deadline_exceeded": 0}
+        self.http_version = None
+        self.bytes_read = 0
+
+    def run(self, jobs, parse):
+        """
+        jobs: {key: url}; parse(bytes) -> value, or None to retry.
+        Returns {key: value or None}.
+        """
+        return self.run_streaming(jobs, lambda key: BodyReader(parse))
+
+    def run_streaming(self, jobs, make_reader):
+        """
+        jobs: {key: url}; make_reader(key) -> object with feed(chunk) -> bool
+        (True once it has everything it needs) and finish() -> value or None.
+        The response body is abandoned as soon as feed() returns True.
+        """
+        return asyncio.run(self._run(jobs, make_reader))
+
+    async def _run(self, jobs, make_reader):
+        self.limiter = self.limiter or AdaptiveLimiter()
+        self._end = asyncio.get_running_loop().time() + self.deadline
+        client = self._make_client()
+        try:
+            keys = list(jobs)
+            values = await asyncio.gather(*(self._fetch(client, jobs[k], lambda k=k: make_reader(k)) for k in keys))
+        finally:
+            if client is not None:
+                await client.aclose()
+        return dict(zip(keys, values))
+
+    def _make_client(self):
+        try:
+            import httpx
+        except ImportError:
+            return None
+        limits = httpx.Limits(max_connections=self.limiter.maximum, max_keepalive_connections=self.limiter.maximum)
+        try:
+            return httpx.AsyncClient(http2=True, limits=limits)
+        except ImportError: # h2 not installed
+            return httpx.AsyncClient(limits=limits)
+
+    async def _get(self, client, url, timeout, reader):
+        """Stream the body of url into reader, closing early once it is satisfied."""
+        if client is None:
+            await asyncio.to_thread(self._get_blocking, url, timeout, reader)
+            return
+        async with client.stream("GET", url, timeout=timeout) as resp:
+            self.http_version = self.http_version or resp.http_version
+            resp.raise_for_status()
+            async for chunk in resp.aiter_bytes(self.CHUNK_SIZE):
+                self.bytes_read += len(chunk)
+                if reader.feed(chunk):
+                    break
+
+    def _get_blocking(self, url, timeout, reader):
+        session = WeatherFetcher.get_session()
+        with session.get(url, timeout=timeout, stream=True) as resp:
+            self.http_version = self.http_version or "HTTP/1.1 (requests)"
+            resp.raise_for_status()
+            for chunk in resp.iter_content(self.CHUNK_SIZE):
+                self.bytes_read += len(chunk)
+                if reader.feed(chunk):
+                    break
+
+    def _remaining(self):
+        return self._end - asyncio.get_running_loop().time()
+
+    async def _fetch(self, client, url, make_reader):
+        for attempt in range(self.max_attempts):
+            if self._remaining() <= 0:
+                self.stats["deadline_exceeded"] += 1
+                return None
+            if attempt:
+                self.stats["retries"] += 1
+                delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+                await asyncio.sleep(min(delay, max(self._remaining(), 0)))
+                if self._remaining() <= 0:
+                    self.stats["deadline_exceeded"] += 1
+                    return None
+
+            await self.limiter.acquire()
+            start = time.perf_counter()
+            latency = None
+            ok = False
+            try:
+                self.stats["requests"] += 1
+                timeout = min(self.request_timeout, max(self._remaining(), 0.1))
+                reader = make_reader()
+                await self._get(client, url, timeout, reader)
+                latency = time.perf_counter() - start
+                self.latencies.append(latency)
+                value = reader.finish()
+                ok = value is not None
+                if ok:
+                    return value
+            except Exception:
+                latency = time.perf_counter() - start
+            finally:
+                await self.limiter.release(latency, ok)
+        self.stats["failures"] += 1
+        return None
+
+    def latency_percentiles(self, quantiles=(50, 90, 99)):
+        if not self.latencies:
+            return {}
+        ordered = sorted(self.latencies)
+        return {q: ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))] for q in quantiles}
+
+    def report(self):
+        pct = " ".join(f"p{q}={v * 1000:.0f}ms" for q, v in self.latency_percentiles().items()) or "no samples"
+        return (f"[NET] {self.stats['requests']} requests ({self.http_version or '-'}, "
+                f"{self.bytes_read / 2**20:.1f} MiB read), "
+                f"{self.stats['retries']} retries, {self.stats['failures']} failed, "
+                f"{self.stats['deadline_exceeded']} past deadline, "
+                f"concurrency {self.limiter.limit:.1f} (peak {self.limiter.peak_limit:.1f}), latency {pct}")
 
 # --- 1. Weather Fetcher (Robust Backend Version) ---
 class WeatherFetcher:
@@ -20,8 +363,11 @@ class WeatherFetcher:
     AUTH_KEY = "JuUArlO6SrylAK5Tuoq8Ig"
     NX = 149
     NY = 253
+    MISSING_THRESHOLD = -90.0  # KMA marks missing cells with -99 (or lower)
+    VALUE_DECIMALS = 1  # Grid text carries one decimal; float32 cells are rounded back to it
     
     _session = None
+    _archive = None
 
     @classmethod
     def get_session(cls):
@@ -32,6 +378,12 @@ class WeatherFetcher:
             cls._session.mount('http://', adapter)
         return cls._session
 
+    @classmethod
+    def get_archive(cls):
+        if cls._archive is None and GRID_ARCHIVE_DIR:
+            cls._archive = GridArchive(GRID_ARCHIVE_DIR)
+        return cls._archive
+
     @staticmethod
     def get_tmfc():
         now = datetime.now()
@@ -54,61 +406,125 @@ class WeatherFetcher:
         return target.strftime("%Y%m%d%H%M")
 
     @staticmethod
-    def fetch_grid_data(var, tmfc, tmef):
-        url = f"{WeatherFetcher.BASE_URL}?tmfc={tmfc}&tmef={tmef}&vars={var}&authKey={WeatherFetcher.AUTH_KEY}"
-        session = WeatherFetcher.get_session()
-        
-        for _ in range(5): # 5 retries
+    def parse_grid(text):
+        """
+        Parse an nph-dfs_shrt_grd response into a float32 array of shape
+        (NY, NX). Header lines ('#') and '=' markers are skipped, numbers are
+        converted in bulk by numpy and missing values become NaN.
+        Returns None if the response holds fewer than NX * NY values.
+        """
+        if "#" in text:
+            text = "\n".join(line for line in text.splitlines() if not line.lstrip().startswith("#"))
+        text = text.replace(",", " ").replace("=", " ")
+        with warnings.catch_warnings():
+            # numpy only warns on trailing garbage; treat it as a bad response
+            warnings.simplefilter("error", DeprecationWarning)
             try:
-                resp = session.get(url, timeout=10)
-                resp.raise_for_status()
-                import re
-                tokens = re.split(r'[,\s]+', resp.text)
-                values = [float(t) for t in tokens if t.strip() and not t.startswith('=')]
-                if len(values) >= WeatherFetcher.NX * WeatherFetcher.NY:
-                   return values[-(WeatherFetcher.NX * WeatherFetcher.NY):]
-            except:
-                time.sleep(1.0)
-                continue
-        return None
+                values = np.fromstring(text, dtype=np.float32, sep=" ")
+            except (ValueError, DeprecationWarning):
+                return None
+
+        grid_size = WeatherFetcher.NX * WeatherFetcher.NY
+        if values.size < grid_size:
+            return None
+        grid = values[-grid_size:].reshape(WeatherFetcher.NY, WeatherFetcher.NX)
+        grid[grid <= WeatherFetcher.MISSING_THRESHOLD] = np.nan
+        return grid
+
+    @staticmethod
+    def grid_url(var, tmfc, tmef):
+        return f"{WeatherFetcher.BASE_URL}?tmfc={tmfc}&tmef={tmef}&vars={var}&authKey={WeatherFetcher.AUTH_KEY}"
+
+    @staticmethod
+    def fetch_grids(tmfc, keys):
+        """
+        Download the (var, tmef) grids in `keys` through AsyncFetchEngine.
+        Returns {(var, tmef): grid or None} and prints latency percentiles.
+        """
+        if not keys:
+            return {}
+        engine = AsyncFetchEngine()
+        jobs = {(var, tmef): WeatherFetcher.grid_url(var, tmfc, tmef) for var, tmef in keys}
+        grids = engine.run(jobs, lambda body: WeatherFetcher.parse_grid(body.decode("utf-8", "replace")))
+        print(engine.report())
+        return grids
+
+    @staticmethod
+    def fetch_cells(tmfc, keys, indices):
+        """
+        Stream the (var, tmef) grids in `keys`, keeping only the cell
+        `indices` and closing each response once they have been read.
+        Returns {(var, tmef): {index: value} or None}.
+        """
+        if not keys:
+            return {}
+        engine = AsyncFetchEngine()
+        jobs = {(var, tmef): WeatherFetcher.grid_url(var, tmfc, tmef) for var, tmef in keys}
+        cells = engine.run_streaming(jobs, lambda key: GridCellReader(indices, missing_threshold=WeatherFetcher.MISSING_THRESHOLD))
+        print(engine.report())
+        return cells
+
+    @staticmethod
+    def fetch_grid_data(var, tmfc, tmef):
+        return WeatherFetcher.fetch_grids(tmfc, [(var, tmef)]).get((var, tmef))
 
     @staticmethod
     def get_timeseries(grid_x, grid_y, count=24): # Fetch 24 hours for backend report
+        return WeatherFetcher.get_timeseries_many([(grid_x, grid_y)], count=count)[(grid_x, grid_y)]
+
+    @staticmethod
+    def get_timeseries_many(points, count=24):
+        """
+        Batch version of get_timeseries for several (grid_x, grid_y) points.
+        Each (var, tmef) grid is downloaded once and every point is read
+        from it, so extra locations cost no extra requests.
+        Returns {(grid_x, grid_y): ForecastTable}, the same structure the
+        GUI and the scheduler use.
+        """
+        points = list(dict.fromkeys(points))
         tmfc = WeatherFetcher.get_tmfc()
         base_tmef = WeatherFetcher.get_tmef(tmfc)
         
-        timestamps = []
-        dt_base = datetime.strptime(base_tmef, "%Y%m%d%H%M")
-        for i in range(count):
-            ts = (dt_base + timedelta(hours=i)).strftime("%Y%m%d%H%M")
-            timestamps.append(ts)
-
-        results_list = [{"tmef": ts, "_lock": threading.Lock()} for ts in timestamps]
         targets = ["TMP", "SKY", "PTY", "POP"] # Reduced targets for summary
+        results = {point: ForecastTable(base_tmef, count, targets) for point in points}
+        timestamps = [results[points[0]].tmef(i) for i in range(count)] if points else []
+        inside = [p for p in points if 0 <= p[0] < WeatherFetcher.NX and 0 <= p[1] < WeatherFetcher.NY]
+        archive = WeatherFetcher.get_archive()
         
-        all_tasks = [(idx, t) for idx in range(count) for t in targets]
-        
-        def fetch_task(hour_idx, var_name):
-            tmef = str(results_list[hour_idx]["tmef"])
-            data = WeatherFetcher.fetch_grid_data(var_name, tmfc, tmef)
-            if data:
-                g_idx = grid_y * WeatherFetcher.NX + grid_x
-                if 0 <= g_idx < len(data):
-                    val = data[g_idx]
-                    with results_list[hour_idx]["_lock"]:
-                        results_list[hour_idx][var_name] = val
-
-        # Conservative concurrency
-        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-            futures = [executor.submit(fetch_task, idx, t) for idx, t in all_tasks]
-            concurrent.futures.wait(futures)
+        all_keys = [(var_name, tmef) for tmef in timestamps for var_name in targets]
+        cell_values = {} # (var, tmef) -> {(gx, gy): value}
+
+        if archive:
+            # Full grids, so later runs and other tools can reuse them
+            grids = {}
+            for key in all_keys:
+                grid = archive.get(tmfc, key[1], key[0])
+                if grid is not None:
+                    grids[key] = grid
+            fetched = WeatherFetcher.fetch_grids(tmfc, [key for key in all_keys if key not in grids])
+            for (var_name, tmef), grid in fetched.items():
+                if grid is not None:
+                    grids[(var_name, tmef)] = grid
+                    archive.put(tmfc, tmef, var_name, grid)
+            for key, grid in grids.items():
+                cell_values[key] = {
+                    (gx, gy): round(float(grid[gy, gx]), WeatherFetcher.VALUE_DECIMALS) for gx, gy in inside
+                }
+        else:
+            # No archive: stream only the needed cells and stop reading early
+            indexes = {gy * WeatherFetcher.NX + gx: (gx, gy) for gx, gy in inside}
+            fetched = WeatherFetcher.fetch_cells(tmfc, all_keys, list(indexes)) if indexes else {}
+            for key, values in fetched.items():
+                if values is not None:
+                    cell_values[key] = {indexes[i]: v for i, v in values.items()}
+
+        for hour_idx, tmef in enumerate(timestamps):
+            for var_name in targets:
+                for point, val in cell_values.get((var_name, tmef), {}).items():
+                    # NaN (missing cell) simply stays missing in the table
+                    results[point].set(var_name, hour_idx, val)
             
-        clean_results = []
-        for r in results_list:
-            d = r.copy()
-            del d["_lock"]
-            clean_results.append(d)
-        return clean_results
+        return results
 
 # --- 2. Data Loader ---
 def load_coords(json_path):
@@ -117,11 +533,24 @@ def load_coords(json_path):
     if not os.path.exists(json_path):
         print(f"[ERROR] {json_path} not found.")
         return {}
+    try:
+        # Memory-mapped lookups; no per-address dicts are built
+        return open_address_db(json_path)
+    except Exception as e:
+        print(f"[WARN] Binary address DB unavailable ({e}), loading JSON.")
     with open(json_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 # --- 3. Main Execution ---
 def main():
+    global GRID_ARCHIVE_DIR
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--no-archive", action="store_true", help="stream only the needed cells instead of archiving full grids")
+    args = parser.parse_args()
+    if args.no_archive:
+        GRID_ARCHIVE_DIR = None
+
     print(f"--- Weather Backend Report [{datetime.now().strftime('%Y-%m-%d %H:%M')}] ---")
     
     # 1. Load Data
@@ -134,19 +563,25 @@ def main():
     
     final_report = []
     
+    locations = []
     for loc in LOCATIONS_TO_CHECK:
         if loc not in coords_map:
             print(f"[SKIP] Unknown location: {loc}")
             continue
-            
         coord = coords_map[loc]
-        gx, gy = coord['x'], coord['y']
-        print(f"\n[FETCH] Processing {loc} (Grid: {gx}, {gy})...")
-        
-        data = WeatherFetcher.get_timeseries(gx, gy, count=6) # Get next 6 hours summary
+        locations.append((loc, (coord['x'], coord['y'])))
+
+    # Every grid is downloaded once for all locations
+    points = [point for _, point in locations]
+    print(f"\n[FETCH] {len(locations)} locations, {len(set(points))} unique grid cells...")
+    timeseries = WeatherFetcher.get_timeseries_many(points, count=6) if points else {} # Next 6 hours summary
+
+    for loc, (gx, gy) in locations:
+        print(f"\n[RESULT] {loc} (Grid: {gx}, {gy})")
+        data = timeseries.get((gx, gy))
         
         # Summarize first valid data point
-        if data and data[0]:
+        if data and data.has_data(0):
             current = data[0]
             # Format report line
             sky_map = {1: "Sunny", 3: "Cloudy", 4: "Overcast"}
@@ -163,6 +598,12 @@ def main():
         else:
             final_report.append(f"| {loc} | Fetch Failed | - | - | - | - |")
 
+    archive = WeatherFetcher.get_archive()
+    if archive:
+        freed = archive.prune()
+        print(f"\n[ARCHIVE] {archive.root}: {len(archive.issuances())} issuances, "
+              f"{archive.size_bytes() / 2**20:.1f} MiB (pruned {freed / 2**20:.1f} MiB)")
+
     # 3. Output for GitHub Actions (Markdown)
     print("\n\n### :white_sun_small_cloud: Weather Report Summary")
     print("| Location | Time | Temp | Sky | Precip | POP |")
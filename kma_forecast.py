@@ -0,0 +1,354 @@
+"""Columnar KMA short-term forecast shared by the GUI, scheduler and report.
+
+getVilageFcst answers with one item per (fcstDate, fcstTime, category).
+ForecastTable stores them as one float64 array per category, indexed by the
+hour offset from the first forecast time, with NaN for missing values.
+Every raw value is decoded exactly once, through DECODERS.
+
+ForecastPager downloads every page of a getVilageFcst answer over a
+caller-provided requests session; plan_window() picks the single
+numOfRows/pageNo slice that covers a few target hours instead.
+
+Stdlib only, so weather_scheduler can import it without the GUI stack.
+"""
+
+import math
+import threading
+from array import array
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+MISSING = float("nan")
+TIME_FORMAT = "%Y%m%d%H%M"
+
+
+def _bucket(rules, default):
+    """Decoder mapping a descriptive string to a code by substring rules."""
+    def decode(raw):
+        for needle, code in rules:
+            if needle in raw:
+                return code
+        return default
+    return decode
+
+
+# category -> raw string decoder; anything not listed is skipped.
+# PCP: 0 none, 1 under 1mm, 2 normal, 3 30mm+; SNO: 0 none, 1 under 1cm, 2 more
+DECODERS = {
+    "TMP": float,
+    "WSD": float,
+    "REH": float,
+    "POP": float,
+    "SKY": int,
+    "PTY": int,
+    "PCP": _bucket((("강수없음", 0), ("1mm", 1), ("미만", 1), ("30", 3), ("50", 3)), 2),
+    "SNO": _bucket((("적설없음", 0), ("1cm", 1), ("미만", 1)), 2),
+}
+# Code categories are handed out as int
+CODE_CATEGORIES = frozenset(("SKY", "PTY", "PCP", "SNO"))
+
+# getVilageFcst rows are ordered by forecast time, starting one hour after
+# the base time, with these categories per hour; TMN joins at 06:00 and
+# TMX at 15:00.
+HOUR_CATEGORIES = ("TMP", "UUU", "VVV", "VEC", "WSD", "SKY", "PTY", "POP", "WAV", "PCP", "REH", "SNO")
+PLAN_SLACK_ROWS = len(HOUR_CATEGORIES)
+
+
+def hour_number(tmef):
+    """Absolute hour count of a YYYYMMDDHHMM string (minutes ignored)."""
+    day = date(int(tmef[:4]), int(tmef[4:6]), int(tmef[6:8])).toordinal()
+    hour = int(tmef[8:10])
+    if not 0 <= hour < 24:
+        raise ValueError(tmef)
+    return day * 24 + hour
+
+
+class ForecastRow(Mapping):
+    """
+    Read-only view of one forecast hour: row["TMP"], row.get("SKY"), "PTY" in row.
+    Missing categories are absent, like the per-hour dicts this replaces.
+    """
+    __slots__ = ("table", "index")
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    @property
+    def tmef(self):
+        return self.table.tmef(self.index)
+
+    def __getitem__(self, category):
+        if category == "tmef":
+            return self.tmef
+        value = self.table.get(category, self.index)
+        if value is None:
+            raise KeyError(category)
+        return value
+
+    def __iter__(self):
+        yield "tmef"
+        for category, column in self.table.columns.items():
+            if not math.isnan(column[self.index]):
+                yield category
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"ForecastRow({dict(self)!r})"
+
+
+class ForecastTable:
+    """
+    Forecast for one grid cell: `count` consecutive hours starting at
+    `start` (YYYYMMDDHHMM), one array('d') per category in `columns`.
+    Iterating yields ForecastRow views; no per-hour dicts are built.
+    """
+    __slots__ = ("start", "count", "columns", "_times")
+
+    def __init__(self, start, count, categories=()):
+        self.start = start
+        self.count = count
+        self.columns = {}
+        self._times = None
+        for category in categories:
+            self.column(category)
+
+    @classmethod
+    def from_items(cls, items, count=None, categories=None):
+        """
+        Build from getVilageFcst items, decoding each value once.
+        Keeps at most `count` hours from the earliest forecast time and,
+        if given, only `categories` (others are skipped before decoding).
+        """
+        if not items:
+            return cls(None, 0)
+        decoders = DECODERS
+        if categories is not None:
+            decoders = {c: DECODERS[c] for c in categories if c in DECODERS}
+
+        # Forecast times repeat once per category: convert each only once.
+        # hours[fcstDate][fcstTime] -> absolute hour number (None if invalid)
+        hours = {}
+        for item in items:
+            day = hours.setdefault(item.get("fcstDate", ""), {})
+            time = item.get("fcstTime", "")
+            if time not in day:
+                try:
+                    day[time] = hour_number(item.get("fcstDate", "") + time)
+                except (ValueError, TypeError):
+                    day[time] = None
+        slots = [(h, d, t) for d, times in hours.items() for t, h in times.items() if h is not None]
+        if not slots:
+            return cls(None, 0)
+        first, first_date, first_time = min(slots)
+        span = max(slots)[0] - first + 1
+        if count is not None:
+            span = min(span, count)
+        table = cls(first_date + first_time[:2] + "00", span)
+
+        columns = table.columns
+        for item in items:
+            category = item.get("category")
+            decode = decoders.get(category)
+            if decode is None:
+                continue
+            hour = hours[item.get("fcstDate", "")][item.get("fcstTime", "")]
+            if hour is None:
+                continue
+            index = hour - first
+            if not 0 <= index < span:
+                continue
+            try:
+                value = decode(item.get("fcstValue", ""))
+            except (TypeError, ValueError):
+                continue
+            column = columns.get(category)
+            if column is None:
+                column = table.column(category)
+            column[index] = value
+        return table
+
+    def column(self, category):
+        """The array for category, created (all missing) on first use."""
+        column = self.columns.get(category)
+        if column is None:
+            column = self.columns[category] = array("d", [MISSING]) * self.count
+        return column
+
+    def set(self, category, index, value):
+        self.column(category)[index] = value
+
+    def get(self, category, index, default=None):
+        """Value at hour `index`, or default when missing."""
+        column = self.columns.get(category)
+        if column is None:
+            return default
+        value = column[index]
+        if math.isnan(value):
+            return default
+        return int(value) if category in CODE_CATEGORIES else value
+
+    def has_data(self, index):
+        return any(not math.isnan(column[index]) for column in self.columns.values())
+
+    def covers(self, tmefs, categories):
+        """True if every hour in tmefs has a value for every category."""
+        for tmef in tmefs:
+            index = self.offset_of(tmef)
+            if index is None:
+                return False
+            for category in categories:
+                column = self.columns.get(category)
+                if column is None or math.isnan(column[index]):
+                    return False
+        return True
+
+    def tmef(self, index):
+        if self._times is None:
+            base = datetime.strptime(self.start, TIME_FORMAT) if self.start else None
+            self._times = [(base + timedelta(hours=i)).strftime(TIME_FORMAT) for i in range(self.count)]
+        return self._times[index]
+
+    def offset_of(self, tmef):
+        """Hour index of a YYYYMMDDHHMM string, or None if outside the table."""
+        if not self.start:
+            return None
+        index = hour_number(tmef) - hour_number(self.start)
+        return index if 0 <= index < self.count else None
+
+    def to_dicts(self):
+        """The old list-of-dicts shape, for JSON output."""
+        return [dict(row) for row in self]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return ForecastRow(self, index)
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield ForecastRow(self, index)
+
+    def __eq__(self, other):
+        if not isinstance(other, ForecastTable):
+            return NotImplemented
+        return self.start == other.start and self.to_dicts() == other.to_dicts()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ForecastTable(start={self.start!r}, count={self.count}, columns={sorted(self.columns)})"
+
+
+def rows_in_hour(hour_of_day):
+    return len(HOUR_CATEGORIES) + (hour_of_day == 6) + (hour_of_day == 15)
+
+
+def page_covering(lo, hi):
+    """Smallest (numOfRows, pageNo) whose single page spans rows [lo, hi)."""
+    rows = max(hi - lo, 1)
+    while lo // rows != (hi - 1) // rows:
+        rows += 1
+    return rows, lo // rows + 1
+
+
+def plan_window(base_date, base_time, tmefs, slack=PLAN_SLACK_ROWS):
+    """
+    (numOfRows, pageNo) of the one page holding the rows for the forecast
+    hours in tmefs, padded by `slack` rows on both sides, or None when a
+    target hour precedes the first forecast hour of the issuance.
+    Relies on the row layout above; callers check the result with
+    ForecastTable.covers() and fall back to a full fetch.
+    """
+    first_hour = hour_number(base_date + base_time) + 1
+    targets = [hour_number(tmef) for tmef in tmefs]
+    if not targets or min(targets) < first_hour:
+        return None
+    lo = sum(rows_in_hour(h % 24) for h in range(first_hour, min(targets)))
+    hi = lo + sum(rows_in_hour(h % 24) for h in range(min(targets), max(targets) + 1))
+    return page_covering(max(lo - slack, 0), hi + slack)
+
+
+class ForecastAPIError(Exception):
+    """getVilageFcst answered with a resultCode other than '00'."""
+
+
+class ForecastPager:
+    """
+    Fetches all pages of a getVilageFcst query. Page 1 carries totalCount;
+    the remaining pages are requested concurrently over the shared session
+    and merged in page order.
+    The page count seen per (base_time, numOfRows) is remembered, so the
+    next query for the same issuance requests every page at once and the
+    whole horizon arrives in about one round-trip.
+    """
+    def __init__(self, session, url, timeout=30, max_workers=4):
+        self.session = session
+        self.url = url
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self._pages_hint = {}  # (base_time, numOfRows) -> pages last seen
+        self._lock = threading.Lock()
+        self.stats = {"queries": 0, "pages": 0, "speculative_pages": 0, "wasted_pages": 0}
+
+    def fetch(self, params):
+        """All items for params (any pageNo in it is ignored)."""
+        rows = int(params.get("numOfRows", 1000))
+        hint_key = (params.get("base_time"), rows)
+        with self._lock:
+            guess = self._pages_hint.get(hint_key, 1)
+            self.stats["queries"] += 1
+
+        # Threads are only started as pages are submitted
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = {page: pool.submit(self._get_page, params, page) for page in range(1, guess + 1)}
+            body = futures[1].result()
+            total = int(body.get("totalCount") or 0)
+            pages = max(1, -(-total // rows))
+            for page in range(guess + 1, pages + 1):
+                futures[page] = pool.submit(self._get_page, params, page)
+
+            items = page_items(body)
+            for page in range(2, pages + 1):
+                items.extend(page_items(futures[page].result()))
+        finally:
+            # Speculative pages past totalCount are not waited for
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        with self._lock:
+            self._pages_hint[hint_key] = pages
+            self.stats["pages"] += pages
+            self.stats["speculative_pages"] += min(guess, pages) - 1
+            self.stats["wasted_pages"] += max(guess - pages, 0)
+        return items
+
+    def fetch_page(self, params, page):
+        """Items of a single page, e.g. a slice chosen by plan_window()."""
+        with self._lock:
+            self.stats["queries"] += 1
+            self.stats["pages"] += 1
+        return page_items(self._get_page(params, page))
+
+    def _get_page(self, params, page):
+        resp = self.session.get(self.url, params=dict(params, pageNo=page), timeout=self.timeout)
+        resp.raise_for_status()
+        data = resp.json()
+        header = data.get("response", {}).get("header", {})
+        if header.get("resultCode") != "00":
+            raise ForecastAPIError(header.get("resultMsg"))
+        return data.get("response", {}).get("body", {})
+
+
+def page_items(body):
+    """The item list of one getVilageFcst response body."""
+    items = (body.get("items") or {}).get("item") or []
+    return [items] if isinstance(items, dict) else list(items)
@@ -0,0 +1,139 @@
+"""KMA grid projection: latitude/longitude <-> short-term forecast grid (X, Y).
+
+Stdlib only (numpy just for the *_many helpers, imported when called), so
+the address DB build and the headless tools can use it without the Tk GUI.
+"""
+
+import math
+
+
+class CoordinateConverter:
+    """
+    Converts Latitude/Longitude to KMA Grid (X, Y).
+    Based on the official KMA conversion algorithm.
+    """
+    RE = 6371.00877  # Earth radius (km)
+    GRID = 5.0       # Grid interval (km)
+    SLAT1 = 30.0     # Projection latitude 1
+    SLAT2 = 60.0     # Projection latitude 2
+    OLON = 126.0     # Origin longitude
+    OLAT = 38.0      # Origin latitude
+    XO = 43          # Origin X (Grid)
+    YO = 136         # Origin Y (Grid)
+
+    _consts = None
+
+    @classmethod
+    def constants(cls):
+        """
+        Lambert conformal conic constants (re, olon, sn, sf, ro), computed
+        once per class instead of on every conversion.
+        """
+        if cls.__dict__.get('_consts') is None:
+            degrad = math.pi / 180.0
+
+            re = cls.RE / cls.GRID
+            slat1 = cls.SLAT1 * degrad
+            slat2 = cls.SLAT2 * degrad
+            olon = cls.OLON * degrad
+            olat = cls.OLAT * degrad
+
+            sn = math.tan(math.pi * 0.25 + slat2 * 0.5) / math.tan(math.pi * 0.25 + slat1 * 0.5)
+            sn = math.log(math.cos(slat1) / math.cos(slat2)) / math.log(sn)
+            sf = math.tan(math.pi * 0.25 + slat1 * 0.5)
+            sf = math.pow(sf, sn) * math.cos(slat1) / sn
+            ro = math.tan(math.pi * 0.25 + olat * 0.5)
+            ro = re * sf / math.pow(ro, sn)
+            cls._consts = (re, olon, sn, sf, ro)
+        return cls._consts
+
+    @classmethod
+    def project(cls, lat, lon):
+        """Continuous (unrounded) grid coordinates for lat/lon."""
+        degrad = math.pi / 180.0
+        re, olon, sn, sf, ro = cls.constants()
+
+        ra = math.tan(math.pi * 0.25 + lat * degrad * 0.5)
+        ra = re * sf / math.pow(ra, sn)
+
+        theta = lon * degrad - olon
+        if theta > math.pi:
+            theta -= 2.0 * math.pi
+        if theta < -math.pi:
+            theta += 2.0 * math.pi
+        theta *= sn
+
+        x = ra * math.sin(theta) + cls.XO
+        y = ro - ra * math.cos(theta) + cls.YO
+        return x, y
+
+    @classmethod
+    def to_grid(cls, lat, lon):
+        x, y = cls.project(lat, lon)
+        return int(math.floor(x + 0.5)), int(math.floor(y + 0.5))
+
+    @classmethod
+    def to_latlon(cls, x, y):
+        """Inverse projection: grid coordinates (cell centre if ints) to (lat, lon)."""
+        degrad = math.pi / 180.0
+        re, olon, sn, sf, ro = cls.constants()
+
+        xn = x - cls.XO
+        yn = ro - (y - cls.YO)
+        ra = math.sqrt(xn * xn + yn * yn)
+        if sn < 0.0:
+            ra = -ra
+        alat = math.pow(re * sf / ra, 1.0 / sn)
+        alat = 2.0 * math.atan(alat) - math.pi * 0.5
+
+        if abs(xn) <= 0.0:
+            theta = 0.0
+        elif abs(yn) <= 0.0:
+            theta = math.pi * 0.5
+            if xn < 0.0:
+                theta = -theta
+        else:
+            theta = math.atan2(xn, yn)
+        alon = theta / sn + olon
+        return alat / degrad, alon / degrad
+
+    @classmethod
+    def project_many(cls, lats, lons):
+        """Vectorized project() over array-likes; returns float64 arrays."""
+        import numpy as np
+
+        degrad = math.pi / 180.0
+        re, olon, sn, sf, ro = cls.constants()
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+
+        ra = re * sf / np.power(np.tan(math.pi * 0.25 + lats * degrad * 0.5), sn)
+        theta = lons * degrad - olon
+        theta = np.where(theta > math.pi, theta - 2.0 * math.pi, theta)
+        theta = np.where(theta < -math.pi, theta + 2.0 * math.pi, theta)
+        theta *= sn
+
+        x = ra * np.sin(theta) + cls.XO
+        y = ro - ra * np.cos(theta) + cls.YO
+        return x, y
+
+    @classmethod
+    def to_grid_many(cls, lats, lons):
+        """
+        Vectorized to_grid(); returns int64 arrays (xs, ys).
+        numpy's tan/pow may differ from libm in the last bit, so points that
+        land within 1e-9 of a rounding boundary are redone with to_grid()
+        to keep results identical to the scalar path.
+        """
+        import numpy as np
+
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        x, y = cls.project_many(lats, lons)
+        xs = np.floor(x + 0.5).astype(np.int64)
+        ys = np.floor(y + 0.5).astype(np.int64)
+
+        edge = (np.abs((x + 0.5) - np.round(x + 0.5)) < 1e-9) | (np.abs((y + 0.5) - np.round(y + 0.5)) < 1e-9)
+        for i in np.flatnonzero(edge):
+            xs.flat[i], ys.flat[i] = cls.to_grid(float(lats.flat[i]), float(lons.flat[i]))
+        return xs, ys
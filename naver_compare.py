@@ -0,0 +1,213 @@
+"""Hourly block extraction from Naver's weather comparison page.
+
+The page embeds every widget's data in one `var blockApiResult = {...}`
+script literal, but only `compareHourlyFcast~~1` is used. Both helpers
+locate that block's value and raw_decode() it in place from its start
+index: no slice of the page is made and the other blocks are never
+decoded. HourlyBlockReader does the same over a streamed body and says
+when the block is complete, so the rest of the page need not be read.
+ProviderCache remembers each provider's issuance (fcastYmdt) and built
+service per region, revalidating the page with conditional requests.
+
+Stdlib only, like kma_forecast.
+"""
+
+import codecs
+import json
+import re
+import threading
+
+BLOCK_MARKER = "var blockApiResult = "
+HOURLY_BLOCK = "compareHourlyFcast~~1"
+CHUNK_SIZE = 16 * 1024
+
+_KEY_TOKEN = json.dumps(HOURLY_BLOCK)
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+def find_hourly_value(text, pos=0):
+    """
+    (index, None) with the index of the hourly block's value in text,
+    searching from pos, or (None, resume) when text ends first; resume is
+    where the search can continue once more text has arrived.
+    """
+    while True:
+        at = text.find(_KEY_TOKEN, pos)
+        if at < 0:
+            return None, max(pos, len(text) - len(_KEY_TOKEN) + 1)
+        index = _WHITESPACE.match(text, at + len(_KEY_TOKEN)).end()
+        if index >= len(text):
+            return None, at
+        if text[index] != ":":
+            pos = at + 1  # The name as a string value, not a key
+            continue
+        index = _WHITESPACE.match(text, index + 1).end()
+        if index >= len(text):
+            return None, at
+        return index, None
+
+
+def extract_hourly_block(html):
+    """The decoded hourly block of a full page; {} if the page has none."""
+    start = html.find(BLOCK_MARKER)
+    if start < 0:
+        raise ValueError("Naver compare payload not found")
+    index, _ = find_hourly_value(html, start + len(BLOCK_MARKER))
+    if index is None:
+        return {}
+    block, _ = _DECODER.raw_decode(html, index)
+    return block
+
+
+class HourlyBlockReader:
+    """
+    Streams the page body and keeps only what can still matter: the tail
+    that may hold a split marker or key, then the hourly block itself.
+    feed() returns True once the block has decoded, so the caller can
+    drop the connection.
+    """
+    def __init__(self):
+        self.block = None
+        self.bytes_read = 0
+        self._text = codecs.getincrementaldecoder("utf-8")("replace")
+        self._buffer = ""
+        self._in_payload = False
+        self._in_block = False
+
+    @property
+    def done(self):
+        return self.block is not None
+
+    def feed(self, chunk):
+        if self.done:
+            return True
+        self.bytes_read += len(chunk)
+        self._buffer += self._text.decode(chunk)
+        self._scan()
+        return self.done
+
+    def finish(self):
+        if not self.done:
+            self._buffer += self._text.decode(b"", final=True)
+            self._scan()
+        if self.done:
+            return self.block
+        if not self._in_payload:
+            raise ValueError("Naver compare payload not found")
+        if not self._in_block:
+            return {}
+        raise ValueError("Naver compare hourly block is truncated")
+
+    def _scan(self):
+        if not self._in_payload:
+            at = self._buffer.find(BLOCK_MARKER)
+            if at < 0:
+                self._buffer = self._buffer[-(len(BLOCK_MARKER) - 1):]
+                return
+            self._in_payload = True
+            self._buffer = self._buffer[at + len(BLOCK_MARKER):]
+        if not self._in_block:
+            index, resume = find_hourly_value(self._buffer)
+            if index is None:
+                self._buffer = self._buffer[resume:]
+                return
+            self._in_block = True
+            self._buffer = self._buffer[index:]
+        try:
+            self.block, _ = _DECODER.raw_decode(self._buffer)
+        except json.JSONDecodeError:
+            return  # Not complete yet
+        self._buffer = ""
+
+
+def fetch_hourly_block(session, url, headers=None, timeout=20, chunk_size=CHUNK_SIZE, validators=None):
+    """
+    (hourly block, body bytes read) for the page at url, reading the
+    response only until the block is complete.
+    With a validators dict (etag/last_modified) the request is conditional:
+    (None, 0) means 304 Not Modified, and the dict is updated from the reply.
+    """
+    if validators is not None:
+        headers = dict(headers or {})
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    reader = HourlyBlockReader()
+    with session.get(url, headers=headers, timeout=timeout, stream=True) as resp:
+        if validators and resp.status_code == 304:
+            return None, 0
+        resp.raise_for_status()
+        if validators is not None:
+            validators.clear()
+            validators.update(
+                (key, value) for key, value in
+                (("etag", resp.headers.get("ETag")), ("last_modified", resp.headers.get("Last-Modified")))
+                if value
+            )
+        for chunk in resp.iter_content(chunk_size):
+            if reader.feed(chunk):
+                break
+    return reader.finish(), reader.bytes_read
+
+
+def provider_stamp(rows):
+    """The provider's issuance: its latest fcastYmdt, '' if the rows have none."""
+    return max((str(row.get("fcastYmdt") or "") for row in rows), default="")
+
+
+class ProviderCache:
+    """
+    Per region: the page validators, the window (start hour, end hour,
+    target date) the services were built for, and per provider its
+    issuance stamp plus the built service (None when it had no rows).
+    A 304 answer reuses every service; otherwise only providers whose
+    stamp moved are built again. The state is plain JSON, so a cron job
+    can keep it between runs.
+    """
+    def __init__(self, state=None):
+        self._regions = dict(state or {})
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "skipped_providers": 0, "built_providers": 0}
+
+    def state(self):
+        with self._lock:
+            return json.loads(json.dumps(self._regions))
+
+    def get(self, session, region_code, url, window, build, headers=None, timeout=20):
+        """
+        (services in page order, body bytes read) for region_code.
+        build(provider_code, rows) makes one service dict or None.
+        """
+        window = list(window)
+        with self._lock:
+            entry = self._regions.get(region_code) or {}
+        # Cached services only answer for the window they were built for
+        same_window = entry.get("window") == window
+        validators = dict(entry.get("validators", {})) if same_window else {}
+        block, bytes_read = fetch_hourly_block(session, url, headers=headers, timeout=timeout, validators=validators)
+        cached = entry.get("providers", {}) if same_window else {}
+
+        if block is None:
+            with self._lock:
+                self.stats["hits"] += 1
+                self.stats["skipped_providers"] += len(cached)
+            return [p["service"] for p in cached.values() if p["service"]], 0
+
+        providers = {}
+        skipped = 0
+        for provider_code, rows in block.get("domesticHourlyListMap", {}).items():
+            stamp = provider_stamp(rows)
+            previous = cached.get(provider_code)
+            if stamp and previous and previous["stamp"] == stamp:
+                providers[provider_code] = previous
+                skipped += 1
+            else:
+                providers[provider_code] = {"stamp": stamp, "service": build(provider_code, rows)}
+        with self._lock:
+            self._regions[region_code] = {"validators": validators, "window": window, "providers": providers}
+            self.stats["misses"] += 1
+            self.stats["skipped_providers"] += skipped
+            self.stats["built_providers"] += len(providers) - skipped
+        return [p["service"] for p in providers.values() if p["service"]], bytes_read
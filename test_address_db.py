@@ -0,0 +1,130 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import address_db
+
+try:
+    import openpyxl
+except ImportError:  # build-only dependency
+    openpyxl = None
+
+
+class AddressTableTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.json_path = os.path.join(self.tmp.name, "weather_code.json")
+        self.data_map = {
+            "대전광역시 유성구 구성동": {"x": 67, "y": 101},
+            "서울특별시 강남구 역삼1동": {"x": 61, "y": 125},
+            "강원도": {"x": 83, "y": 134},
+            "부산광역시 해운대구 우제1동": {"x": 99, "y": 75},
+        }
+        with open(self.json_path, "w", encoding="utf-8") as f:
+            json.dump(self.data_map, f, ensure_ascii=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_compiled_table_behaves_like_the_json_dict(self):
+        table = address_db.open_address_db(self.json_path)
+        try:
+            self.assertEqual(list(table), sorted(self.data_map))
+            self.assertEqual(len(table), 4)
+            self.assertEqual(table["대전광역시 유성구 구성동"], {"x": 67, "y": 101})
+            self.assertEqual(table.coords("강원도"), (83, 134))
+            self.assertIn("서울특별시 강남구 역삼1동", table)
+            self.assertNotIn("서울특별시 강남구", table)
+            self.assertIsNone(table.coords("없는주소"))
+            self.assertEqual(table.keys_list[-1], "서울특별시 강남구 역삼1동")
+            with self.assertRaises(KeyError):
+                table["없는주소"]
+        finally:
+            table.close()
+
+    def test_stale_database_is_rebuilt_from_json(self):
+        db_path = address_db.db_path_for(self.json_path)
+        address_db.build(self.json_path, db_path)
+        self.data_map["제주특별자치도"] = {"x": 52, "y": 38}
+        with open(self.json_path, "w", encoding="utf-8") as f:
+            json.dump(self.data_map, f, ensure_ascii=False)
+        os.utime(db_path, (0, 0))
+
+        table = address_db.open_address_db(self.json_path)
+        try:
+            self.assertEqual(table.coords("제주특별자치도"), (52, 38))
+        finally:
+            table.close()
+
+
+@unittest.skipIf(openpyxl is None, "openpyxl not installed")
+class XlsxBuildTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.json_path = os.path.join(self.tmp.name, "weather_code.json")
+        self.guide = os.path.join(self.tmp.name, "guide.xlsx")
+        self.admin = os.path.join(self.tmp.name, "admin.xlsx")
+
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.append(["구분", "행정구역코드", "1단계", "2단계", "3단계", "격자 X", "격자 Y", "경도(초/100)", "위도(초/100)"])
+        ws.append(["kor", 1100000000, "서울특별시", None, None, 60, 127, 126.980008333333, 37.5635694444444])
+        ws.append(["kor", 1111051500, "서울특별시", "종로구", "청운효자동", 60, 127, 126.9706519, 37.5841367])
+        wb.save(self.guide)
+
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = "대전광역시"
+        ws.append(["시도", "시군구", "읍면동/구", "읍/면/리/동", "리", "위도", "경도"])
+        ws.append(["대전광역시", "유성구", "구성동", None, None, 36.3761, 127.3614])
+        # Already published by the guide: the guide's cell wins
+        ws.append(["서울특별시", None, None, None, None, 37.5666103, 126.9783882])
+        wb.save(self.admin)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_builds_json_and_binary_db_then_skips_unchanged_sources(self):
+        from kma_grid import CoordinateConverter
+
+        sources = [self.guide, self.admin]
+        stats = address_db.build_from_xlsx(sources, self.json_path)
+
+        self.assertFalse(stats["skipped"])
+        self.assertEqual((stats["rows"], stats["addresses"], stats["duplicates"]), (4, 3, 1))
+        with open(self.json_path, encoding="utf-8") as f:
+            data_map = json.load(f)
+        x, y = CoordinateConverter.to_grid(36.3761, 127.3614)
+        self.assertEqual(data_map, {
+            "대전광역시 유성구 구성동": {"x": x, "y": y},
+            "서울특별시": {"x": 60, "y": 127},
+            "서울특별시 종로구 청운효자동": {"x": 60, "y": 127},
+        })
+        table = address_db.AddressTable(address_db.db_path_for(self.json_path))
+        try:
+            self.assertEqual(dict(table), data_map)
+        finally:
+            table.close()
+
+        self.assertTrue(address_db.build_from_xlsx(sources, self.json_path)["skipped"])
+
+        wb = openpyxl.load_workbook(self.admin)
+        wb.active.append(["대전광역시", "유성구", "관평동", None, None, 36.4257, 127.3906])
+        wb.save(self.admin)
+        stats = address_db.build_from_xlsx(sources, self.json_path)
+        self.assertFalse(stats["skipped"])
+        self.assertEqual(stats["addresses"], 4)
+
+    def test_build_does_not_load_the_gui(self):
+        # Slim CI images have no Tk; the build must not import weather_app
+        code = "import sys, address_db; print(sorted({'weather_app', 'tkinter', 'dotenv'} & set(sys.modules)))"
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(address_db.__file__)), check=True)
+        self.assertEqual(out.stdout.strip(), "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
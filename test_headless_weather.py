@@ -0,0 +1,300 @@
+import asyncio
+import math
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from headless_weather import AdaptiveLimiter, AsyncFetchEngine, GridArchive, GridCellReader, WeatherFetcher
+
+
+def make_grid(var):
+    """Grid where every cell holds its own index (plus an offset per var)."""
+    offset = {"TMP": 0, "SKY": 100000, "PTY": 200000, "POP": 300000}[var]
+    size = WeatherFetcher.NX * WeatherFetcher.NY
+    return (np.arange(size, dtype=np.float32) + offset).reshape(WeatherFetcher.NY, WeatherFetcher.NX)
+
+
+def fake_grids(tmfc, keys):
+    return {key: make_grid(key[0]) for key in keys}
+
+
+class EmptyArchive:
+    """Archive stand-in that never has a grid and discards writes."""
+    def get(self, tmfc, tmef, var):
+        return None
+
+    def put(self, tmfc, tmef, var, grid):
+        pass
+
+
+class BatchTimeseriesTest(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(WeatherFetcher, "get_archive", return_value=EmptyArchive())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_each_grid_is_fetched_once_for_all_points(self):
+        calls = []
+
+        def fake_fetch(tmfc, keys):
+            calls.extend(keys)
+            return {key: make_grid(key[0]) for key in keys}
+
+        points = [(67, 101), (61, 125), (99, 75), (67, 101)]
+        with patch.object(WeatherFetcher, "get_tmfc", return_value="202607091400"), \
+                patch.object(WeatherFetcher, "get_tmef", return_value="202607091500"), \
+                patch.object(WeatherFetcher, "fetch_grids", side_effect=fake_fetch):
+            result = WeatherFetcher.get_timeseries_many(points, count=3)
+
+        self.assertEqual(len(calls), 3 * 4)
+        self.assertEqual(len(set(calls)), len(calls))
+        self.assertEqual(sorted(result), sorted({(67, 101), (61, 125), (99, 75)}))
+        series = result[(61, 125)]
+        self.assertEqual([row["tmef"] for row in series], ["202607091500", "202607091600", "202607091700"])
+        self.assertEqual(series[0]["TMP"], 125 * WeatherFetcher.NX + 61)
+        self.assertEqual(series[2]["POP"], 300000 + 125 * WeatherFetcher.NX + 61)
+
+    def test_single_point_wrapper_matches_batch(self):
+        with patch.object(WeatherFetcher, "get_tmfc", return_value="202607091400"), \
+                patch.object(WeatherFetcher, "get_tmef", return_value="202607091500"), \
+                patch.object(WeatherFetcher, "fetch_grids", side_effect=fake_grids):
+            single = WeatherFetcher.get_timeseries(67, 101, count=2)
+            batch = WeatherFetcher.get_timeseries_many([(67, 101)], count=2)[(67, 101)]
+
+        self.assertEqual(single, batch)
+
+
+class GridArchiveTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.archive = GridArchive(self.tmp.name, keep_issuances=2, max_bytes=10**9)
+
+    def test_round_trip_is_memory_mapped(self):
+        grid = make_grid("TMP")
+        self.archive.put("202607091400", "202607091500", "TMP", grid)
+
+        stored = self.archive.get("202607091400", "202607091500", "TMP")
+
+        self.assertIsInstance(stored, np.memmap)
+        self.assertEqual(float(stored[101, 67]), float(grid[101, 67]))
+        self.assertIsNone(self.archive.get("202607091400", "202607091600", "TMP"))
+
+    def test_prune_keeps_newest_issuances_and_size_cap(self):
+        grid = make_grid("TMP")
+        for tmfc in ("202607090800", "202607091100", "202607091400"):
+            for tmef in ("202607091500", "202607091600"):
+                self.archive.put(tmfc, tmef, "TMP", grid)
+
+        self.archive.prune()
+        self.assertEqual(self.archive.issuances(), ["202607091100", "202607091400"])
+
+        one_file = os.path.getsize(self.archive.path("202607091400", "202607091500", "TMP"))
+        self.archive.max_bytes = one_file
+        self.archive.prune()
+        self.assertEqual(self.archive.issuances(), ["202607091400"])
+        self.assertLessEqual(self.archive.size_bytes(), one_file)
+
+    def test_archived_grids_skip_the_network(self):
+        for var in ("TMP", "SKY", "PTY", "POP"):
+            self.archive.put("202607091400", "202607091500", var, make_grid(var))
+
+        with patch.object(WeatherFetcher, "get_archive", return_value=self.archive), \
+                patch.object(WeatherFetcher, "get_tmfc", return_value="202607091400"), \
+                patch.object(WeatherFetcher, "get_tmef", return_value="202607091500"), \
+                patch.object(WeatherFetcher, "fetch_grids", return_value={}) as fetch:
+            series = WeatherFetcher.get_timeseries(67, 101, count=1)
+
+        fetch.assert_called_once_with("202607091400", [])
+        self.assertEqual(series[0]["TMP"], 101 * WeatherFetcher.NX + 67)
+
+
+class GridParserTest(unittest.TestCase):
+    def make_response(self, values, per_line=10):
+        lines = ["#START7777", "# header line"]
+        for i in range(0, len(values), per_line):
+            lines.append(", ".join(f"{v:.1f}" for v in values[i:i + per_line]) + ",")
+        lines.append("=")
+        return "\n".join(lines)
+
+    def test_parse_grid_reads_values_row_major(self):
+        size = WeatherFetcher.NX * WeatherFetcher.NY
+        values = [float(i % 400) / 10 for i in range(size)]
+        values[5 * WeatherFetcher.NX + 7] = -99.0
+
+        grid = WeatherFetcher.parse_grid(self.make_response(values))
+
+        self.assertEqual(grid.shape, (WeatherFetcher.NY, WeatherFetcher.NX))
+        self.assertEqual(grid.dtype, np.float32)
+        self.assertAlmostEqual(float(grid[101, 67]), values[101 * WeatherFetcher.NX + 67], places=5)
+        self.assertTrue(np.isnan(grid[5, 7]))
+        self.assertEqual(int(np.isnan(grid).sum()), 1)
+
+    def test_parse_grid_rejects_short_or_garbled_responses(self):
+        self.assertIsNone(WeatherFetcher.parse_grid("1.0, 2.0, 3.0\n="))
+        self.assertIsNone(WeatherFetcher.parse_grid("<html>error</html>"))
+
+    @patch.object(WeatherFetcher, "get_archive", return_value=EmptyArchive())
+    def test_float32_cells_come_back_with_the_source_precision(self, _):
+        size = WeatherFetcher.NX * WeatherFetcher.NY
+        values = [0.0] * size
+        values[101 * WeatherFetcher.NX + 67] = 12.3  # Not exact in float32
+        text = self.make_response(values)
+
+        def fake_fetch(tmfc, keys):
+            return {key: WeatherFetcher.parse_grid(text) for key in keys}
+
+        with patch.object(WeatherFetcher, "get_tmfc", return_value="202607091400"), \
+                patch.object(WeatherFetcher, "get_tmef", return_value="202607091500"), \
+                patch.object(WeatherFetcher, "fetch_grids", side_effect=fake_fetch):
+            series = WeatherFetcher.get_timeseries(67, 101, count=1)
+
+        self.assertEqual(series[0]["TMP"], 12.3)
+        self.assertEqual(f"{series[0]['TMP']}℃", "12.3℃")
+
+    @patch.object(WeatherFetcher, "get_archive", return_value=EmptyArchive())
+    def test_missing_cells_are_left_out_of_the_timeseries(self, _):
+        def fake_fetch(tmfc, keys):
+            grids = fake_grids(tmfc, keys)
+            for (var, _), grid in grids.items():
+                if var == "POP":
+                    grid[101, 67] = np.nan
+            return grids
+
+        with patch.object(WeatherFetcher, "get_tmfc", return_value="202607091400"), \
+                patch.object(WeatherFetcher, "get_tmef", return_value="202607091500"), \
+                patch.object(WeatherFetcher, "fetch_grids", side_effect=fake_fetch):
+            series = WeatherFetcher.get_timeseries(67, 101, count=1)
+
+        self.assertNotIn("POP", series[0])
+        self.assertIn("TMP", series[0])
+
+
+class FakeEngine(AsyncFetchEngine):
+    """Engine whose transport replays scripted responses per URL."""
+    def __init__(self, script, delay=0.0, chunk_size=4096, **kwargs):
+        super().__init__(backoff_base=0.001, backoff_cap=0.002, **kwargs)
+        self.script = {url: list(responses) for url, responses in script.items()}
+        self.delay = delay
+        self.chunk_size = chunk_size
+
+    def _make_client(self):
+        return None
+
+    async def _get(self, client, url, timeout, reader):
+        await asyncio.sleep(self.delay)
+        response = self.script[url].pop(0)
+        if isinstance(response, Exception):
+            raise response
+        for start in range(0, len(response), self.chunk_size):
+            chunk = response[start:start + self.chunk_size]
+            self.bytes_read += len(chunk)
+            if reader.feed(chunk):
+                break
+
+
+class GridCellReaderTest(unittest.TestCase):
+    def make_body(self):
+        size = WeatherFetcher.NX * WeatherFetcher.NY
+        lines = ["#START7777"]
+        values = [f"{(i % 500) / 10:.1f}" for i in range(size)]
+        values[42] = "-99.0"
+        for i in range(0, size, 10):
+            lines.append(", ".join(values[i:i + 10]) + ",")
+        lines.append("=")
+        return "\n".join(lines).encode(), values
+
+    def test_reads_only_the_wanted_cells_and_stops_early(self):
+        body, values = self.make_body()
+        index = 101 * WeatherFetcher.NX + 67
+        engine = FakeEngine({"u": [body]}, chunk_size=1024)
+
+        result = engine.run_streaming({"K": "u"}, lambda key: GridCellReader([index, 42, 3]))["K"]
+
+        self.assertEqual(result[index], float(values[index]))
+        self.assertEqual(result[3], float(values[3]))
+        self.assertTrue(math.isnan(result[42]))
+        self.assertLess(engine.bytes_read, len(body) * 0.6)
+
+    def test_matches_full_grid_parser_across_chunk_sizes(self):
+        body, _ = self.make_body()
+        grid = WeatherFetcher.parse_grid(body.decode())
+        wanted = [0, 148, 149, 12345, WeatherFetcher.NX * WeatherFetcher.NY - 1]
+        for chunk_size in (7, 100, 65536):
+            reader = GridCellReader(wanted)
+            for start in range(0, len(body), chunk_size):
+                if reader.feed(body[start:start + chunk_size]):
+                    break
+            values = reader.finish()
+            for index in wanted:
+                self.assertAlmostEqual(values[index], float(grid.flat[index]), places=4)
+
+    def test_truncated_body_is_rejected(self):
+        body, _ = self.make_body()
+        reader = GridCellReader([WeatherFetcher.NX * WeatherFetcher.NY - 1])
+        reader.feed(body[:len(body) // 2])
+        self.assertIsNone(reader.finish())
+
+    def test_timeseries_streams_cells_without_archive(self):
+        calls = []
+
+        def fake_cells(tmfc, keys, indices):
+            calls.append((len(keys), sorted(indices)))
+            return {key: {i: float(i) for i in indices} for key in keys}
+
+        with patch.object(WeatherFetcher, "get_archive", return_value=None), \
+                patch.object(WeatherFetcher, "get_tmfc", return_value="202607091400"), \
+                patch.object(WeatherFetcher, "get_tmef", return_value="202607091500"), \
+                patch.object(WeatherFetcher, "fetch_cells", side_effect=fake_cells):
+            series = WeatherFetcher.get_timeseries_many([(67, 101), (1, 0)], count=2)
+
+        self.assertEqual(calls, [(8, [1, 101 * WeatherFetcher.NX + 67])])
+        self.assertEqual(series[(1, 0)][1]["SKY"], 1.0)
+
+
+class AsyncFetchEngineTest(unittest.TestCase):
+    def test_retries_until_success_and_reports_percentiles(self):
+        engine = FakeEngine({
+            "a": [OSError("reset"), b"bad", b"ok-a"],
+            "b": [b"ok-b"],
+        })
+
+        values = engine.run({"A": "a", "B": "b"}, lambda body: body.decode() if body.startswith(b"ok") else None)
+
+        self.assertEqual(values, {"A": "ok-a", "B": "ok-b"})
+        self.assertEqual(engine.stats["requests"], 4)
+        self.assertEqual(engine.stats["retries"], 2)
+        self.assertEqual(engine.stats["failures"], 0)
+        self.assertEqual(sorted(engine.latency_percentiles()), [50, 90, 99])
+        self.assertIn("p50=", engine.report())
+
+    def test_gives_up_after_max_attempts_and_deadline(self):
+        engine = FakeEngine({"a": [OSError("down")] * 2}, max_attempts=2)
+        self.assertEqual(engine.run({"A": "a"}, bytes.decode), {"A": None})
+        self.assertEqual(engine.stats["failures"], 1)
+
+        slow = FakeEngine({"a": [OSError("down")] * 5}, delay=0.05, deadline=0.01)
+        self.assertEqual(slow.run({"A": "a"}, bytes.decode), {"A": None})
+        self.assertEqual(slow.stats["deadline_exceeded"], 1)
+
+    def test_limiter_grows_on_fast_success_and_halves_on_error(self):
+        async def scenario():
+            limiter = AdaptiveLimiter(initial=4, minimum=1, maximum=8)
+            for _ in range(8):
+                await limiter.acquire()
+                await limiter.release(0.1, ok=True)
+            grown = limiter.limit
+            await limiter.acquire()
+            await limiter.release(None, ok=False)
+            return grown, limiter.limit
+
+        grown, after_error = asyncio.run(scenario())
+        self.assertGreater(grown, 4)
+        self.assertAlmostEqual(after_error, grown / 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import math
+import threading
+import unittest
+
+from kma_forecast import ForecastAPIError, ForecastPager, ForecastTable, page_covering, plan_window
+
+
+def item(date, time, category, value):
+    return {"fcstDate": date, "fcstTime": time, "category": category, "fcstValue": value}
+
+
+class ForecastTableTest(unittest.TestCase):
+    def setUp(self):
+        self.items = [
+            item("20260709", "2300", "TMP", "24"),
+            item("20260709", "2300", "SKY", "3"),
+            item("20260709", "2300", "PCP", "강수없음"),
+            item("20260709", "2300", "UUU", "1.2"),  # not decoded
+            item("20260710", "0000", "TMP", "23.5"),
+            item("20260710", "0000", "PCP", "1mm 미만"),
+            item("20260710", "0000", "SNO", "적설없음"),
+            item("20260710", "0100", "PCP", "30.0~50.0mm"),
+            item("20260710", "0100", "PTY", "bad"),
+            item("20260710", "0200", "PCP", "5.0mm"),
+            item("20260710", "0200", "SNO", "1cm 미만"),
+        ]
+
+    def test_items_are_decoded_into_hour_indexed_columns(self):
+        table = ForecastTable.from_items(self.items)
+
+        self.assertEqual((table.start, len(table)), ("202607092300", 4))
+        self.assertEqual(sorted(table.columns), ["PCP", "SKY", "SNO", "TMP"])
+        self.assertEqual(table.get("TMP", 1), 23.5)
+        self.assertEqual(table.get("SKY", 0), 3)
+        self.assertIsInstance(table.get("SKY", 0), int)
+        self.assertEqual([table.get("PCP", i) for i in range(4)], [0, 1, 3, 2])
+        self.assertEqual([table.get("SNO", i, "-") for i in range(4)], ["-", 0, "-", 1])
+        self.assertIsNone(table.get("PTY", 1))  # undecodable value is dropped
+        self.assertTrue(math.isnan(table.columns["TMP"][2]))
+        self.assertEqual([table.tmef(i) for i in range(4)],
+                         ["202607092300", "202607100000", "202607100100", "202607100200"])
+        self.assertEqual(table.offset_of("202607100100"), 2)
+        self.assertIsNone(table.offset_of("202607100300"))
+
+    def test_rows_read_like_the_old_per_hour_dicts(self):
+        table = ForecastTable.from_items(self.items, count=2)
+
+        self.assertEqual(table.to_dicts(), [
+            {"tmef": "202607092300", "TMP": 24.0, "SKY": 3, "PCP": 0},
+            {"tmef": "202607100000", "TMP": 23.5, "PCP": 1, "SNO": 0},
+        ])
+        row = table[-1]
+        self.assertEqual(row["tmef"], "202607100000")
+        self.assertNotIn("SKY", row)
+        self.assertEqual(row.get("SKY", 0), 0)
+        with self.assertRaises(KeyError):
+            row["SKY"]
+        with self.assertRaises(IndexError):
+            table[2]
+
+    def test_empty_or_unusable_items_give_an_empty_table(self):
+        self.assertFalse(ForecastTable.from_items([]))
+        self.assertFalse(ForecastTable.from_items([item("", "", "TMP", "1")]))
+
+
+class PlanWindowTest(unittest.TestCase):
+    def test_page_covering_is_the_smallest_single_page(self):
+        for lo in range(0, 120, 7):
+            for hi in range(lo + 1, lo + 90, 11):
+                rows, page = page_covering(lo, hi)
+                self.assertLessEqual((page - 1) * rows, lo)
+                self.assertGreaterEqual(page * rows, hi)
+                for smaller in range(hi - lo, rows):
+                    self.assertNotEqual(lo // smaller, (hi - 1) // smaller)
+
+    def test_window_rows_follow_the_hourly_layout(self):
+        # Base 02:00 -> first row is 03:00; 03..23 is 21 hours incl. TMN and TMX
+        rows, page = plan_window("20260709", "0200", ["202607100400", "202607100800"], slack=0)
+        lo = 21 * 12 + 2 + 4 * 12  # rows before 04:00 next day
+        hi = lo + 5 * 12 + 1  # 04..08 plus TMN
+        self.assertLessEqual((page - 1) * rows, lo)
+        self.assertGreaterEqual(page * rows, hi)
+        self.assertLess(rows, 2 * (hi - lo))
+
+        self.assertIsNone(plan_window("20260709", "0200", ["202607090200"]))
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class PagedSession:
+    """getVilageFcst stand-in serving `total` numbered items."""
+    def __init__(self, total, result_code="00"):
+        self.total = total
+        self.result_code = result_code
+        self.barrier = None  # pages that must be in flight together
+        self.barrier_pages = ()
+        self.pages = []
+        self.lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None):
+        page, rows = params["pageNo"], params["numOfRows"]
+        with self.lock:
+            self.pages.append(page)
+        if page in self.barrier_pages:
+            self.barrier.wait(5)
+        start = (page - 1) * rows
+        items = [{"n": n} for n in range(start, min(start + rows, self.total))]
+        return FakeResponse({"response": {
+            "header": {"resultCode": self.result_code, "resultMsg": "NO_DATA"},
+            "body": {"totalCount": self.total, "items": {"item": items}},
+        }})
+
+
+class ForecastPagerTest(unittest.TestCase):
+    params = {"numOfRows": 1000, "pageNo": 1, "base_date": "20260709", "base_time": "2300"}
+
+    def test_remaining_pages_are_fetched_concurrently_and_merged_in_order(self):
+        session = PagedSession(2300)
+        session.barrier, session.barrier_pages = threading.Barrier(2), (2, 3)
+        pager = ForecastPager(session, "url")
+
+        items = pager.fetch(self.params)
+
+        self.assertEqual([item["n"] for item in items], list(range(2300)))
+        self.assertEqual(session.pages[0], 1)
+        self.assertEqual(sorted(session.pages), [1, 2, 3])
+
+    def test_known_page_count_is_requested_up_front(self):
+        session = PagedSession(2300)
+        pager = ForecastPager(session, "url")
+        pager.fetch(self.params)
+
+        session.barrier, session.barrier_pages = threading.Barrier(3), (1, 2, 3)
+        items = pager.fetch(self.params)
+
+        self.assertEqual(len(items), 2300)
+        self.assertEqual(pager.stats["speculative_pages"], 2)
+        self.assertEqual(pager.stats["wasted_pages"], 0)
+
+    def test_api_errors_raise(self):
+        pager = ForecastPager(PagedSession(10, result_code="03"), "url")
+        with self.assertRaises(ForecastAPIError):
+            pager.fetch(self.params)
+
+
+if __name__ == "__main__":
+    unittest.main()
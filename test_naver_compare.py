@@ -0,0 +1,166 @@
+import json
+import unittest
+
+from naver_compare import HourlyBlockReader, ProviderCache, extract_hourly_block, fetch_hourly_block
+
+HOURLY = {"domesticHourlyListMap": {"TWC": [
+    {"aplYmd": "20260710", "aplTm": "04", "wetrTxt": "흐림", "tmpr": 22.0, "fcastYmdt": "20260709151200"},
+]}}
+
+
+def make_page(hourly=HOURLY, trailer="<footer>" + "x" * 50000 + "</footer>"):
+    choice = {"compareDailyFcast~~1": {"note": "compareHourlyFcast~~1"}}
+    if hourly is not None:
+        choice["compareHourlyFcast~~1"] = hourly
+    choice["compareWeeklyFcast~~1"] = {"rows": list(range(5000))}
+    payload = json.dumps({"success": True, "results": {"choiceResult": choice}}, ensure_ascii=False, indent=1)
+    return "<html><head><script>var blockApiResult = " + payload + ";</script></head>" + trailer + "</html>"
+
+
+def chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class ExtractHourlyBlockTest(unittest.TestCase):
+    def test_decodes_only_the_hourly_block(self):
+        # The name also appears as a string value in an earlier block
+        self.assertEqual(extract_hourly_block(make_page()), HOURLY)
+
+    def test_missing_payload_and_missing_block(self):
+        with self.assertRaises(ValueError):
+            extract_hourly_block("<html></html>")
+        self.assertEqual(extract_hourly_block(make_page(hourly=None)), {})
+
+
+class HourlyBlockReaderTest(unittest.TestCase):
+    def read(self, page, size):
+        reader = HourlyBlockReader()
+        for chunk in chunks(page.encode("utf-8"), size):
+            if reader.feed(chunk):
+                break
+        return reader
+
+    def test_any_chunking_gives_the_block_and_stops_early(self):
+        page = make_page()
+        # 1-byte chunks split the markers and the UTF-8 sequences
+        for size in (1, 7, 4096):
+            reader = self.read(page, size)
+            self.assertEqual(reader.finish(), HOURLY)
+            self.assertLess(reader.bytes_read, page.index("compareWeeklyFcast") + size)
+
+    def test_end_of_body_without_a_complete_block(self):
+        with self.assertRaises(ValueError):
+            self.read("<html></html>", 5).finish()
+        self.assertEqual(self.read(make_page(hourly=None), 512).finish(), {})
+        page = make_page()
+        truncated = page[:page.index("aplTm")]
+        with self.assertRaises(ValueError):
+            self.read(truncated, 512).finish()
+
+
+class FakeStreamResponse:
+    def __init__(self, body, status_code=200, headers=None):
+        self.body = body
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed = True
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        return iter(chunks(self.body, chunk_size))
+
+
+class FetchHourlyBlockTest(unittest.TestCase):
+    def test_streams_and_closes_early(self):
+        body = make_page().encode("utf-8")
+        response = FakeStreamResponse(body)
+        session = type("Session", (), {"get": lambda self, url, **kwargs: response})()
+
+        block, bytes_read = fetch_hourly_block(session, "https://example.invalid", chunk_size=1024)
+
+        self.assertEqual(block, HOURLY)
+        self.assertLess(bytes_read, len(body) // 2)
+        self.assertTrue(response.closed)
+
+
+def hourly(stamps):
+    return {"domesticHourlyListMap": {
+        code: [{"aplYmd": "20260710", "aplTm": "05", "tmpr": 21.0, "fcastYmdt": stamp}]
+        for code, stamp in stamps.items()
+    }}
+
+
+class ETagSession:
+    """Serves the current page; answers 304 while the ETag still matches."""
+    def __init__(self):
+        self.version = 0
+        self.page = None
+        self.requests = []
+
+    def publish(self, stamps):
+        self.version += 1
+        self.page = make_page(hourly(stamps)).encode("utf-8")
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append(dict(headers or {}))
+        etag = f'"v{self.version}"'
+        if (headers or {}).get("If-None-Match") == etag:
+            return FakeStreamResponse(b"", status_code=304)
+        return FakeStreamResponse(self.page, headers={"ETag": etag})
+
+
+class ProviderCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.session = ETagSession()
+        self.built = []
+
+    def build(self, code, rows):
+        self.built.append(code)
+        return {"provider_code": code, "stamp": rows[0]["fcastYmdt"]}
+
+    def get(self, cache, window=(4, 8, "20260710")):
+        services, _ = cache.get(self.session, "07200124", "https://example.invalid", window, self.build)
+        return services
+
+    def test_only_moved_providers_are_rebuilt(self):
+        cache = ProviderCache()
+        self.session.publish({"TWC": "202607090500", "ACCUWEATHER": "202607090500"})
+        first = self.get(cache)
+        self.assertEqual(self.built, ["TWC", "ACCUWEATHER"])
+
+        # Same page: conditional request, nothing rebuilt
+        self.assertEqual(self.get(cache), first)
+        self.assertEqual(self.session.requests[-1]["If-None-Match"], '"v1"')
+        self.assertEqual(self.built, ["TWC", "ACCUWEATHER"])
+
+        self.session.publish({"TWC": "202607091100", "ACCUWEATHER": "202607090500"})
+        services = self.get(cache)
+        self.assertEqual(self.built, ["TWC", "ACCUWEATHER", "TWC"])
+        self.assertEqual([service["stamp"] for service in services], ["202607091100", "202607090500"])
+        self.assertEqual(cache.stats, {"hits": 1, "misses": 2, "skipped_providers": 3, "built_providers": 3})
+
+    def test_state_round_trip_and_window_change(self):
+        self.session.publish({"TWC": "202607090500"})
+        cache = ProviderCache()
+        self.get(cache)
+
+        restored = ProviderCache(json.loads(json.dumps(cache.state())))
+        self.get(restored)
+        self.assertEqual(restored.stats["hits"], 1)
+
+        # Another target date: unconditional request, every provider rebuilt
+        self.get(restored, window=(4, 8, "20260711"))
+        self.assertNotIn("If-None-Match", self.session.requests[-1])
+        self.assertEqual(self.built, ["TWC", "TWC"])
+
+
+if __name__ == "__main__":
+    unittest.main()
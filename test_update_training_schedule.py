@@ -1,6 +1,15 @@
+import json
+import os
+import re
+import tempfile
+import threading
 import unittest
 from datetime import date, datetime
+from io import BytesIO
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch
+from urllib.parse import parse_qs, urlsplit
 from zoneinfo import ZoneInfo
 
 from PIL import Image, ImageDraw
@@ -80,6 +89,53 @@ class TrainingScheduleImageTests(unittest.TestCase):
         with self.assertRaisesRegex(RuntimeError, "날짜와 요일"):
             schedule.validate_schedule(invalid)
 
+    def test_table_profile_matches_the_per_pixel_rules(self):
+        # Colours straddling the grey and header-green thresholds
+        values = (0, 120, 144, 145, 170, 188, 200, 212, 218, 229, 230, 255)
+        colors = [(r, g, b) for r in values for g in values for b in values]
+        image = Image.new("RGB", (48, len(colors) // 48))
+        image.putdata(colors)
+
+        profile = schedule.analyze_table(image)
+
+        pixels = image.load()
+
+        def dark(x, y):
+            return max(pixels[x, y]) < 230 and max(pixels[x, y]) - min(pixels[x, y]) < 12
+
+        def green(x, y):
+            r, g, b = pixels[x, y]
+            return g >= 145 and g >= r + 25 and g >= b + 45
+
+        rows, columns = range(image.height), range(image.width)
+        self.assertEqual([sum(dark(x, y) for x in columns) for y in rows], profile.dark_rows.tolist())
+        self.assertEqual([sum(green(x, y) for x in columns) for y in rows], profile.green_rows.tolist())
+        self.assertEqual(
+            [sum(dark(x, y) for y in range(3, 20)) for x in columns],
+            profile.dark_columns(3, 19).tolist(),
+        )
+
+    def test_scraper_blocks_heavy_and_third_party_requests(self):
+        blocked = [
+            ("image", "https://cafeptthumb-phinf.pstatic.net/a.png"),
+            ("font", "https://ssl.pstatic.net/static/font.woff2"),
+            ("media", "https://cafe.naver.com/video.mp4"),
+            ("script", "https://www.googletagmanager.com/gtag/js"),
+            ("script", "https://evil-naver.com/tracker.js"),
+        ]
+        allowed = [
+            ("document", "https://cafe.naver.com/f-e/cafes/30488045/menus/13"),
+            ("script", "https://ssl.pstatic.net/static/cafe/app.js"),
+            ("script", "https://cafe.naver.com/main.js"),
+            ("xhr", "https://apis.naver.com/cafe-web/articles"),
+            ("stylesheet", "https://ssl.pstatic.net/static/cafe.css"),
+        ]
+
+        for resource_type, url in blocked:
+            self.assertTrue(schedule.should_block_request(resource_type, url), url)
+        for resource_type, url in allowed:
+            self.assertFalse(schedule.should_block_request(resource_type, url), url)
+
     @staticmethod
     def make_table_image(row_ends=(111, 148, 185, 222, 259, 296, 333), height=337):
         image = Image.new("RGB", (532, height), "white")
@@ -91,5 +147,211 @@ class TrainingScheduleImageTests(unittest.TestCase):
         return image
 
 
+# Shape of an ArticleListV2dot1 answer for the training menu, newest first
+ARTICLE_LIST_FIXTURE = {
+    "message": {
+        "status": "200",
+        "result": {
+            "articleList": [
+                {"articleId": 912, "subject": "[공지] 8월 대회 접수 안내"},
+                {"articleId": 911, "subject": "8월 2주  주간  훈련 일정"},
+                {"articleId": 905, "subject": "8월 1주 주간 훈련 일정"},
+            ]
+        },
+    }
+}
+
+
+class ArticleListServer(ThreadingHTTPServer):
+    """Local stand-in for the cafe article-list API."""
+
+    def __init__(self, payload):
+        super().__init__(("127.0.0.1", 0), ArticleListHandler)
+        self.payload = payload
+        self.queries = []
+
+
+class ArticleListHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.queries.append(parse_qs(urlsplit(self.path).query))
+        body = json.dumps(self.server.payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ArticleListFastPathTests(unittest.TestCase):
+    def setUp(self):
+        self.server = ArticleListServer(ARTICLE_LIST_FIXTURE)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        host, port = self.server.server_address
+        patcher = patch.object(schedule, "ARTICLE_LIST_API_URL", f"http://{host}:{port}/list.json")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_latest_schedule_article_from_the_json_list(self):
+        article = schedule.find_latest_article_http()
+
+        self.assertEqual(911, article["article_id"])
+        self.assertEqual("8월 2주 주간 훈련 일정", article["title"])
+        self.assertEqual("https://cafe.naver.com/f-e/cafes/30488045/articles/911", article["url"])
+        query = self.server.queries[0]
+        self.assertEqual(([schedule.CAFE_ID], [schedule.MENU_ID]), (query["search.clubid"], query["search.menuid"]))
+
+    def test_known_article_never_starts_the_browser(self):
+        with patch.object(schedule, "load_existing", return_value={"article_id": 911}), \
+                patch.object(schedule, "CafeScraper", side_effect=AssertionError("browser started")), \
+                patch("builtins.print"):
+            self.assertFalse(schedule.update_from_cafe())
+
+    def test_new_article_starts_the_browser_only_for_images(self):
+        with patch.object(schedule, "load_existing", return_value={"article_id": 905}), \
+                patch.object(schedule, "CafeScraper") as scraper, \
+                patch.object(schedule, "find_latest_article") as browser_list, \
+                patch.object(schedule, "find_schedule_images", return_value=[]) as images, \
+                patch("builtins.print"):
+            with self.assertRaisesRegex(RuntimeError, "일정 이미지를 찾지"):
+                schedule.update_from_cafe()
+
+        scraper.assert_called_once_with()
+        browser_list.assert_not_called()
+        self.assertEqual(911, images.call_args.args[0]["article_id"])
+
+
+class ImageServer(ThreadingHTTPServer):
+    """Serves PNG files by path, honouring single byte-range requests."""
+
+    def __init__(self, files):
+        super().__init__(("127.0.0.1", 0), ImageHandler)
+        self.files = files
+        self.requests = []
+
+    def url(self, name):
+        host, port = self.server_address
+        return f"http://{host}:{port}/{name}"
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        name = self.path.lstrip("/")
+        body = self.server.files[name]
+        match = re.fullmatch(r"bytes=(\d+)-(\d+)", self.headers.get("Range", ""))
+        self.server.requests.append((name, bool(match)))
+        if match:
+            start, end = int(match.group(1)), min(int(match.group(2)), len(body) - 1)
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(body)}")
+            body = body[start : end + 1]
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CandidateImageTests(unittest.TestCase):
+    def setUp(self):
+        def png(image):
+            buffer = BytesIO()
+            image.save(buffer, format="PNG")
+            return buffer.getvalue()
+
+        table = TrainingScheduleImageTests.make_table_image()
+        self.server = ImageServer(
+            {
+                "thumbnail.png": png(Image.new("RGB", (120, 90), "red")),
+                "banner.png": png(Image.new("RGB", (1200, 80), "blue")),
+                "table.png": png(table),
+                "large-table.png": png(table.resize((table.width * 2, table.height * 2), Image.NEAREST)),
+                "photo.png": png(Image.new("RGB", (1600, 1200), "white")),
+            }
+        )
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def test_headers_rank_candidates_and_rule_out_small_images(self):
+        urls = [self.server.url(name) for name in ("thumbnail.png", "table.png", "banner.png", "photo.png", "large-table.png")]
+        errors = []
+
+        candidates = schedule.rank_candidates(urls, errors)
+
+        self.assertEqual(
+            [self.server.url(name) for name in ("photo.png", "large-table.png", "table.png")],
+            [url for url, _ in candidates],
+        )
+        self.assertEqual([], errors)
+        # Only ranged header probes so far
+        self.assertTrue(all(ranged for _, ranged in self.server.requests))
+
+    def test_largest_valid_table_is_selected(self):
+        article = {"article_id": 1, "title": "8월2주 주간 일정", "url": "https://example.com"}
+        dates = [date(2026, 8, 10 + offset) for offset in range(7)]
+        urls = [self.server.url(name) for name in ("table.png", "photo.png", "large-table.png", "thumbnail.png")]
+        errors = []
+
+        with patch.object(schedule, "schedule_dates_for_run", return_value=dates):
+            content, data = schedule.find_best_candidate(article, schedule.rank_candidates(urls, errors), errors)
+
+        self.assertEqual(self.server.url("large-table.png"), data["source_image_url"])
+        self.assertEqual((1064, 674), Image.open(BytesIO(content)).size)
+        self.assertEqual(1, len(errors))  # The photo, rejected first
+        self.assertNotIn(("thumbnail.png", False), self.server.requests)
+
+
+class RowImageExportTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.image_dir = self.root / "assets" / "training" / "current"
+        for name, value in (("IMAGE_DIR", self.image_dir), ("OUTPUT_PATH", self.root / "training_schedule.json")):
+            patcher = patch.object(schedule, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def write(self, image):
+        data = {"schedule": [{"day": day} for day in schedule.TARGET_ROW_INDEXES.values()]}
+        with patch("builtins.print"):
+            schedule.write_schedule_images(image, data)
+        return data
+
+    def touched(self):
+        """Names of files written since the last call."""
+        names = sorted(path.name for path in self.image_dir.iterdir() if os.path.getmtime(path) != 0)
+        for path in self.image_dir.iterdir():
+            os.utime(path, (0, 0))
+        return names
+
+    def test_only_changed_rows_are_encoded_again(self):
+        image = TrainingScheduleImageTests.make_table_image()
+        data = self.write(image)
+        self.assertEqual(9, len(self.touched()))
+        self.assertEqual("assets/training/current/original.webp", data["source_image_path"])
+        self.assertEqual("assets/training/current/wednesday.webp", data["schedule"][2]["image_path"])
+        with Image.open(self.image_dir / "wednesday.webp") as row:
+            self.assertEqual(schedule.pixel_hash(schedule.split_schedule_rows(image)[2]), schedule.pixel_hash(row))
+
+        self.write(image.copy())
+        self.assertEqual([], self.touched())
+
+        # Text added to Wednesday's row only
+        ImageDraw.Draw(image).rectangle((200, 160, 260, 170), fill=(0, 0, 0))
+        self.write(image)
+        self.assertEqual(["manifest.json", "original.webp", "wednesday.webp"], self.touched())
+
+
 if __name__ == "__main__":
     unittest.main()
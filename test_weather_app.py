@@ -1,6 +1,15 @@
+import math
 import unittest
 
-from weather_app import NaverCompareFetcher
+from weather_app import (
+    CoordinateConverter,
+    DataLoader,
+    ForecastCache,
+    NaverCompareFetcher,
+    ReverseGeocoder,
+    SingleFlight,
+    WeatherFetcher,
+)
 
 
 class NaverCompareFetcherTest(unittest.TestCase):
@@ -70,5 +79,265 @@ class NaverCompareFetcherTest(unittest.TestCase):
         self.assertEqual(services[0]["rows"][0]["rain_probability"], "60%")
 
 
+class CoordinateConverterTest(unittest.TestCase):
+    def test_to_grid_matches_kma_reference_points(self):
+        # From the KMA 격자_위경도 guide: 서울특별시, 종로구 청운효자동
+        self.assertEqual(CoordinateConverter.to_grid(37.5635694444444, 126.980008333333), (60, 127))
+        self.assertEqual(CoordinateConverter.to_grid(37.5841367, 126.9706519), (60, 127))
+
+    def test_to_grid_many_is_identical_to_scalar(self):
+        import random
+
+        rng = random.Random(3)
+        lats = [rng.uniform(32.5, 39.0) for _ in range(2000)]
+        lons = [rng.uniform(124.0, 132.0) for _ in range(2000)]
+
+        xs, ys = CoordinateConverter.to_grid_many(lats, lons)
+
+        expected = [CoordinateConverter.to_grid(lat, lon) for lat, lon in zip(lats, lons)]
+        self.assertEqual(list(zip(xs.tolist(), ys.tolist())), expected)
+
+    def test_to_latlon_inverts_to_grid(self):
+        for x, y in ((60, 127), (67, 101), (98, 76), (52, 38)):
+            self.assertEqual(CoordinateConverter.to_grid(*CoordinateConverter.to_latlon(x, y)), (x, y))
+
+
+class ReverseGeocoderTest(unittest.TestCase):
+    def setUp(self):
+        import random
+
+        rng = random.Random(5)
+        self.data_map = {
+            "서울특별시 종로구 청운효자동": {"x": 60, "y": 127},
+            "서울특별시 종로구 사직동": {"x": 60, "y": 127},
+            "대전광역시 유성구 구성동": {"x": 67, "y": 101},
+        }
+        for i in range(300):
+            self.data_map[f"주소{i:03d}"] = {"x": rng.randint(40, 120), "y": rng.randint(30, 140)}
+        self.geocoder = ReverseGeocoder.from_mapping(self.data_map)
+
+    def brute_force(self, fx, fy):
+        cells = {(c["x"], c["y"]) for c in self.data_map.values()}
+        return min((math.hypot(x - fx, y - fy), (x, y)) for x, y in cells)
+
+    def test_nearest_returns_every_address_in_the_cell(self):
+        lat, lon = CoordinateConverter.to_latlon(60, 127)
+        found = self.geocoder.nearest(lat, lon, limit=10)
+        self.assertEqual(
+            [address for address, _, _ in found],
+            ["서울특별시 종로구 사직동", "서울특별시 종로구 청운효자동"],
+        )
+        self.assertEqual({cell for _, _, cell in found}, {(60, 127)})
+        self.assertAlmostEqual(found[0][1], 0.0, places=6)
+        self.assertEqual(self.geocoder.addresses_in_cell(67, 101), ["대전광역시 유성구 구성동"])
+        self.assertEqual(self.geocoder.addresses_in_cell(0, 0), [])
+
+    def test_nearest_cells_and_batch_match_brute_force(self):
+        import random
+
+        rng = random.Random(9)
+        lats = [rng.uniform(33.0, 38.5) for _ in range(500)]
+        lons = [rng.uniform(125.0, 130.0) for _ in range(500)]
+
+        batch = self.geocoder.nearest_many(lats, lons)
+
+        for lat, lon, result in zip(lats, lons, batch):
+            fx, fy = CoordinateConverter.project(lat, lon)
+            dist, cell = self.brute_force(fx, fy)
+            self.assertEqual(self.geocoder.nearest_cells(fx, fy, 1), [(dist, cell)])
+            self.assertEqual(result[0][2], cell)
+            self.assertAlmostEqual(result[0][1], dist * CoordinateConverter.GRID)
+
+
+class DataLoaderSearchTest(unittest.TestCase):
+    def make_loader(self, keys):
+        loader = DataLoader("unused.json")
+        loader.search_keys = sorted(keys)
+        loader.build_index()
+        return loader
+
+    def test_search_matches_substring_scan(self):
+        keys = [
+            "대전광역시 유성구 구성동",
+            "대전광역시 유성구 관평동",
+            "서울특별시 강남구 역삼1동",
+            "서울특별시 강남구 역삼2동",
+            "충청북도 충주시 호암.직동",
+            "충청북도 충주시 호암동",
+        ]
+        loader = self.make_loader(keys)
+
+        for typed in ["동", "구성", "구성동", "강남구 역삼", "호암.", "역삼3", "없는주소"]:
+            expected = [k for k in loader.search_keys if typed in k]
+            self.assertEqual(loader.search(typed), expected, typed)
+
+    def test_search_returns_first_matches_in_sorted_order(self):
+        keys = [f"테스트시 {i:03d}동" for i in range(120)]
+        loader = self.make_loader(keys)
+
+        self.assertEqual(loader.search("동", limit=50), loader.search_keys[:50])
+        self.assertEqual(loader.search("1", limit=3), ["테스트시 001동", "테스트시 010동", "테스트시 011동"])
+        self.assertEqual(loader.search(""), [])
+
+    def test_load_data_reports_progress_and_sets_ready(self):
+        import json
+        import os
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = os.path.join(tmp, "weather_code.json")
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump({"대전광역시 유성구 구성동": {"x": 67, "y": 101}}, f, ensure_ascii=False)
+            loader = DataLoader(json_path)
+            progress = []
+
+            success, _ = loader.load_data(progress_cb=lambda cur, total, msg: progress.append((cur, total)))
+
+            self.assertTrue(success)
+            self.assertTrue(loader.ready.is_set())
+            self.assertEqual(progress, [(1, 3), (2, 3), (3, 3)])
+            self.assertEqual(loader.search("구성"), ["대전광역시 유성구 구성동"])
+            loader.data_map.close()
+
+
+class ForecastCacheTest(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_memory_then_disk_hits(self):
+        key = (67, 101, "20260709", "1400")
+        items = [{"category": "TMP", "fcstValue": "25"}]
+        cache = ForecastCache(self.tmp.name)
+
+        self.assertIsNone(cache.get(key))
+        cache.put(key, items)
+        self.assertEqual(cache.get(key), items)
+
+        reopened = ForecastCache(self.tmp.name)
+        self.assertEqual(reopened.get(key), items)
+        self.assertEqual(cache.stats["misses"], 1)
+        self.assertEqual(cache.stats["memory_hits"], 1)
+        self.assertEqual(reopened.stats["disk_hits"], 1)
+
+    def test_lru_and_disk_size_bounds(self):
+        cache = ForecastCache(self.tmp.name, max_entries=2, max_disk_entries=2)
+        for nx in range(3):
+            cache.put((nx, 100, "20260709", "1400"), [nx])
+
+        self.assertEqual(list(cache._memory), [(1, 100, "20260709", "1400"), (2, 100, "20260709", "1400")])
+        self.assertEqual(len(cache._disk_files()), 2)
+        self.assertGreaterEqual(cache.stats["evictions"], 2)
+
+    def test_expire_drops_previous_issuance(self):
+        cache = ForecastCache(self.tmp.name)
+        cache.put((67, 101, "20260709", "1100"), ["old"])
+        cache.put((67, 101, "20260709", "1400"), ["new"])
+
+        cache.expire("20260709", "1400")
+
+        self.assertEqual(list(cache._memory), [(67, 101, "20260709", "1400")])
+        self.assertIsNone(ForecastCache(self.tmp.name).get((67, 101, "20260709", "1100")))
+        self.assertEqual(cache.get((67, 101, "20260709", "1400")), ["new"])
+
+
+class SingleFlightTest(unittest.TestCase):
+    def test_concurrent_calls_share_one_execution_and_its_error(self):
+        import threading
+        import time
+
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        runs = []
+
+        def slow():
+            runs.append(1)
+            started.set()
+            release.wait(5)
+            return ["result"]
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do("k", slow)))
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=lambda: results.append(flight.do("k", slow))) for _ in range(3)]
+        for t in followers:
+            t.start()
+        while flight.stats["coalesced"] < 3:
+            time.sleep(0.001)
+        release.set()
+        for t in [leader] + followers:
+            t.join(5)
+
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(sorted(shared for _, shared in results), [False, True, True, True])
+        self.assertTrue(all(value is results[0][0] for value, _ in results))
+        self.assertEqual(flight.stats, {"calls": 4, "executed": 1, "coalesced": 3})
+
+        # Finished calls are not remembered
+        self.assertEqual(flight.do("k", lambda: "again"), ("again", False))
+        with self.assertRaises(ValueError):
+            flight.do("k", lambda: int("x"))
+
+
+class WeatherFetcherCoalescingTest(unittest.TestCase):
+    def test_same_cell_requests_share_one_http_call(self):
+        import tempfile
+        import threading
+        import time
+        from unittest import mock
+
+        entered, release = threading.Event(), threading.Event()
+        http_calls = []
+        items = [
+            {"fcstDate": "20260709", "fcstTime": "1500", "category": "TMP", "fcstValue": "25"},
+            {"fcstDate": "20260709", "fcstTime": "1500", "category": "SKY", "fcstValue": "1"},
+        ]
+
+        class FakeResponse:
+            def raise_for_status(self):
+                pass
+
+            def json(self):
+                return {"response": {"header": {"resultCode": "00"},
+                                     "body": {"totalCount": len(items), "items": {"item": items}}}}
+
+        class FakeSession:
+            def get(self, url, params=None, timeout=None):
+                http_calls.append(params)
+                entered.set()
+                release.wait(5)
+                return FakeResponse()
+
+        flight = SingleFlight()
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(WeatherFetcher, "_session", FakeSession()), \
+                mock.patch.object(WeatherFetcher, "_pager", None), \
+                mock.patch.object(WeatherFetcher, "_cache", ForecastCache(tmp)), \
+                mock.patch.object(WeatherFetcher, "_cache_issuance", None), \
+                mock.patch.object(WeatherFetcher, "_inflight", flight):
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(WeatherFetcher.get_timeseries(67, 101)))]
+            threads[0].start()
+            entered.wait(5)
+            threads += [threading.Thread(target=lambda: results.append(WeatherFetcher.get_timeseries(67, 101)))
+                        for _ in range(2)]
+            for t in threads[1:]:
+                t.start()
+            while flight.stats["coalesced"] < 2:
+                time.sleep(0.001)
+            release.set()
+            for t in threads:
+                t.join(5)
+
+        self.assertEqual(len(http_calls), 1)
+        self.assertTrue(all(table is results[0] for table in results))
+        self.assertEqual(results[0].to_dicts(), [{"tmef": "202607091500", "TMP": 25.0, "SKY": 1}])
+        self.assertEqual(flight.stats["coalesced"], 2)
+
+
 if __name__ == "__main__":
     unittest.main()
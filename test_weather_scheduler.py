@@ -0,0 +1,223 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import weather_scheduler
+from kma_forecast import HOUR_CATEGORIES
+from weather_scheduler import WeatherFetcher
+
+
+def vilage_items(base_date, base_time, last_day_offset=3):
+    """getVilageFcst items in API order: hour by hour, TMN at 06, TMX at 15."""
+    base = datetime.strptime(base_date + base_time, "%Y%m%d%H%M")
+    end = (base + timedelta(days=last_day_offset)).replace(hour=23)
+    items = []
+    t = base + timedelta(hours=1)
+    while t <= end:
+        categories = list(HOUR_CATEGORIES)
+        if t.hour == 6:
+            categories.append("TMN")
+        if t.hour == 15:
+            categories.append("TMX")
+        for category in categories:
+            value = {"SKY": "1", "PTY": "0", "PCP": "강수없음", "SNO": "적설없음"}.get(category, str(t.hour))
+            items.append({"baseDate": base_date, "baseTime": base_time, "category": category,
+                          "fcstDate": t.strftime("%Y%m%d"), "fcstTime": t.strftime("%H%M"),
+                          "fcstValue": value, "nx": 67, "ny": 101})
+        t += timedelta(hours=1)
+    return items
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class FakeVilageSession:
+    def __init__(self, items, barrier=None):
+        self.items = items
+        self.barrier = barrier  # requests that must be in flight together
+        self.requests = []
+
+    def get(self, url, params=None, timeout=None):
+        rows, page = params["numOfRows"], params["pageNo"]
+        self.requests.append((rows, page))
+        if self.barrier:
+            self.barrier.wait(5)
+        chunk = self.items[(page - 1) * rows:page * rows]
+        return FakeResponse(json.dumps({"response": {
+            "header": {"resultCode": "00", "resultMsg": "NORMAL_SERVICE"},
+            "body": {"dataType": "JSON", "items": {"item": chunk}, "pageNo": page,
+                     "numOfRows": rows, "totalCount": len(self.items)},
+        }}, ensure_ascii=False))
+
+
+class FetchWindowTest(unittest.TestCase):
+    targets = [f"20260710{h:02d}00" for h in range(4, 9)]
+
+    def fetch(self, items):
+        session = FakeVilageSession(items)
+        with patch.object(WeatherFetcher, "_session", session), \
+                patch.object(WeatherFetcher, "_pager", None), \
+                patch.object(WeatherFetcher, "get_base_datetime", return_value=("20260709", "0200")):
+            table = WeatherFetcher.fetch_window(67, 101, self.targets)
+        return table, session.requests
+
+    def test_one_small_page_covers_the_window(self):
+        table, requests = self.fetch(vilage_items("20260709", "0200"))
+
+        self.assertEqual(len(requests), 1)
+        self.assertLess(requests[0][0], 100)
+        self.assertTrue(table.covers(self.targets, weather_scheduler.TARGET_CATEGORIES))
+        self.assertEqual(sorted(table.columns), sorted(weather_scheduler.TARGET_CATEGORIES))
+        self.assertEqual(table.get("TMP", table.offset_of("202607100600")), 6.0)
+
+    def test_unexpected_layout_falls_back_to_the_full_forecast(self):
+        items = vilage_items("20260709", "0200")
+        items = items[60:] + items[:60]  # rows no longer where the plan expects
+
+        table, requests = self.fetch(items)
+
+        self.assertEqual(requests[1:], [(1000, 1), (1000, 2)])
+        self.assertTrue(table.covers(self.targets, weather_scheduler.TARGET_CATEGORIES))
+
+
+class MultiLocationTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = self.tmp.name
+        with open(os.path.join(self.root, "weather_code.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "대전광역시 유성구 구성동": {"x": 67, "y": 101},
+                "대전광역시 유성구 관평동": {"x": 67, "y": 101},
+                "서울특별시 종로구 청운효자동": {"x": 60, "y": 127},
+            }, f, ensure_ascii=False)
+        with open(os.path.join(self.root, "weather_locations.json"), "w", encoding="utf-8") as f:
+            json.dump({"default": "guseong", "locations": [
+                {"id": "guseong", "label": "구성동", "address": "대전광역시 유성구 구성동",
+                 "naver_region_code": "07200124", "lat": 36.35, "lon": 127.38},
+                {"id": "gwanpyeong", "address": "대전광역시 유성구 관평동", "naver_region_code": "07200124"},
+                {"id": "seoul", "address": "서울특별시 종로구 청운효자동"},
+                {"id": "typo", "address": "없는 주소"},
+            ]}, f, ensure_ascii=False)
+
+    def path(self, name):
+        return os.path.join(self.root, name)
+
+    def read(self, name):
+        with open(self.path(name), encoding="utf-8") as f:
+            return json.load(f)
+
+    def run_main(self, service, base=("20260709", "0200")):
+        """main() against a fake KMA API; returns the session used."""
+        # Two unique cells; the barrier only opens if both requests overlap
+        session = FakeVilageSession(vilage_items(*base), barrier=threading.Barrier(2, timeout=5))
+        with patch.object(WeatherFetcher, "_session", session), \
+                patch.object(WeatherFetcher, "_pager", None), \
+                patch.object(WeatherFetcher, "get_base_datetime", return_value=base), \
+                patch.object(weather_scheduler, "get_target_times",
+                             return_value=[f"20260710{h:02d}00" for h in range(4, 9)]), \
+                patch.object(weather_scheduler, "fetch_service", return_value=service) as fetch_service, \
+                patch.multiple(weather_scheduler,
+                               LOCATIONS_FILE=self.path("weather_locations.json"),
+                               JSON_DB_PATH=self.path("weather_code.json"),
+                               SHARD_DIR=self.path("weather"),
+                               MANIFEST_FILE=self.path("weather/manifest.json"),
+                               OUTPUT_FILE=self.path("weather_data.json"),
+                               SERVICE_OUTPUT_FILE=self.path("service_weather_data.json"),
+                               STATE_FILE=self.path("weather_state.json")), \
+                patch("builtins.print"):
+            weather_scheduler.main()
+        fetch_service.assert_called_once_with("07200124")
+        return session
+
+    def mtimes(self):
+        """Pin every output's mtime to 0 so rewrites show up."""
+        paths = [os.path.join(d, f) for d, _, files in os.walk(self.root) for f in files
+                 if f.endswith(".json") and f not in ("weather_code.json", "weather_locations.json")]
+        for path in paths:
+            os.utime(path, (0, 0))
+        return paths
+
+    def test_unique_cells_are_fetched_concurrently_and_sharded(self):
+        session = self.run_main({"region_code": "07200124", "services": []})
+
+        self.assertEqual(len(session.requests), 2)
+
+        manifest = self.read("weather/manifest.json")
+        self.assertEqual(manifest["default"], "guseong")
+        self.assertEqual([loc["id"] for loc in manifest["locations"]], ["guseong", "gwanpyeong", "seoul"])
+        self.assertEqual(manifest["locations"][0]["lat"], 36.35)
+
+        shard = self.read("weather/seoul.json")
+        self.assertEqual((shard["nx"], shard["ny"]), (60, 127))
+        self.assertEqual([row["time"] for row in shard["rows"]], ["04:00", "05:00", "06:00", "07:00", "08:00"])
+        self.assertIsNone(shard["service"])
+
+        self.assertEqual(self.read("weather_data.json"), self.read("weather/guseong.json")["rows"])
+        self.assertTrue(os.path.exists(self.path("service_weather_data.json")))
+
+    def naver_service(self, run_stamp, issued):
+        row = {"time": "07/10 04:00", "temperature": "20℃", "updated_at": issued}
+        return {"region_code": "07200124", "updated_at": run_stamp, "services": [
+            {"provider": "웨더채널", "provider_code": "TWC", "updated_at": issued, "rows": [row]},
+        ]}
+
+    def test_unchanged_issuance_skips_the_api_and_every_write(self):
+        self.run_main(self.naver_service("2026-07-09 19:00 UTC", "2026-07-10 03:12"))
+        state = self.read("weather_state.json")
+        self.assertEqual(state["kma"]["base_time"], "0200")
+        paths = self.mtimes()
+
+        # Only the run's own timestamp moved
+        session = self.run_main(self.naver_service("2026-07-09 20:00 UTC", "2026-07-10 03:12"))
+
+        self.assertEqual(session.requests, [])
+        self.assertEqual([path for path in paths if os.path.getmtime(path) != 0], [])
+
+    def test_provider_reissue_with_same_values_is_published(self):
+        self.run_main(self.naver_service("2026-07-09 19:00 UTC", "2026-07-10 03:12"))
+        paths = self.mtimes()
+
+        # A new fcastYmdt with identical forecast values still shows on the page
+        self.run_main(self.naver_service("2026-07-09 20:00 UTC", "2026-07-10 04:12"))
+
+        written = sorted(os.path.relpath(path, self.root) for path in paths if os.path.getmtime(path) != 0)
+        self.assertEqual(written, sorted([
+            "service_weather_data.json", "weather_state.json",
+            os.path.join("weather", "guseong.json"), os.path.join("weather", "gwanpyeong.json"),
+            os.path.join("weather", "manifest.json"),
+        ]))
+        self.assertEqual(self.read("weather/guseong.json")["service"]["services"][0]["updated_at"], "2026-07-10 04:12")
+
+    def test_new_issuance_is_fetched_and_changed_shards_rewritten(self):
+        service = {"region_code": "07200124", "services": []}
+        self.run_main(service)
+        hashes = [loc["hash"] for loc in self.read("weather/manifest.json")["locations"]]
+        self.mtimes()
+
+        service = {"region_code": "07200124", "services": [{"provider_code": "kma", "rows": []}]}
+        session = self.run_main(service, base=("20260709", "0500"))
+
+        self.assertEqual(len(session.requests), 2)
+        self.assertEqual(self.read("weather_state.json")["kma"]["base_time"], "0500")
+        # The Naver block is shared by the two Daejeon shards only
+        self.assertNotEqual(os.path.getmtime(self.path("weather/guseong.json")), 0)
+        self.assertEqual(os.path.getmtime(self.path("weather/seoul.json")), 0)
+        manifest = self.read("weather/manifest.json")
+        self.assertNotEqual(manifest["locations"][0]["hash"], hashes[0])
+        self.assertEqual(manifest["locations"][2]["hash"], hashes[2])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,22 +3,34 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import multiprocessing
 import re
 import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from io import BytesIO
 from pathlib import Path
+from urllib.parse import urlsplit
 from zoneinfo import ZoneInfo
 
+import numpy as np
 import requests
-from PIL import Image
+from PIL import Image, ImageFile
 from playwright.sync_api import sync_playwright
 
 
 CAFE_ID = "30488045"
 MENU_ID = "13"
 MENU_URL = f"https://cafe.naver.com/f-e/cafes/{CAFE_ID}/menus/{MENU_ID}"
+ARTICLE_URL = "https://cafe.naver.com/f-e/cafes/{cafe_id}/articles/{article_id}"
+# The JSON list behind the menu page; no browser needed to spot a new article
+ARTICLE_LIST_API_URL = "https://apis.naver.com/cafe-web/cafe2/ArticleListV2dot1.json"
+ARTICLE_LIST_SIZE = 15
 OUTPUT_PATH = Path(__file__).with_name("training_schedule.json")
 IMAGE_DIR = Path(__file__).with_name("assets") / "training" / "current"
 TARGET_ROW_INDEXES = {
@@ -45,20 +57,170 @@ USER_AGENT = (
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/126.0 Safari/537.36"
 )
+# Only link hrefs and img src attributes are read from the cafe pages
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+FIRST_PARTY_DOMAINS = ("naver.com", "naver.net", "pstatic.net")
+IMAGE_WORKERS = 6
+ANALYSIS_WORKERS = 2
+# Image headers sit in the first bytes, so sizes are probed before downloading
+PROBE_BYTES = 64 * 1024
+# Hard filter on the probed (width, height): smaller images are never
+# downloaded or analysed. Cafe thumbnails, stickers and banners fall below
+# it; the real tables are 500+ px wide and 300+ px tall (w1600 when posted).
+MIN_TABLE_SIZE = (400, 250)
+# Worker processes start from a clean server process, never forked from
+# this one while download threads may hold requests/ssl locks
+PROCESS_CONTEXT = multiprocessing.get_context("forkserver")
+# Pixel hashes of the published WEBP files, so unchanged rows are not re-encoded
+IMAGE_MANIFEST_NAME = "manifest.json"
+ENCODE_WORKERS = 4
+
+_session: requests.Session | None = None
+
+
+WEEK_TITLE_PATTERN = re.compile(r"\d+월\s*\d+주")
+SCHEDULE_TITLE_PATTERN = re.compile(r"일정|훈련")
 
 
 def normalize_text(text: str) -> str:
     return re.sub(r"\s+", " ", text).strip()
 
 
-def find_latest_article() -> dict:
-    with sync_playwright() as playwright:
-        browser = playwright.chromium.launch(headless=True)
-        page = browser.new_page(
-            user_agent=USER_AGENT,
-            locale="ko-KR",
-            timezone_id="Asia/Seoul",
+def select_schedule_article(articles: list[dict]) -> dict:
+    """The first (latest) article whose title names a week's training schedule."""
+    seen = set()
+    for article in articles:
+        title = normalize_text(article["title"])
+        if not title or "댓글수" in title or article["article_id"] in seen:
+            continue
+        seen.add(article["article_id"])
+        if WEEK_TITLE_PATTERN.search(title) and SCHEDULE_TITLE_PATTERN.search(title):
+            return {**article, "title": title}
+    raise RuntimeError("주간 훈련 일정 게시물을 찾지 못했습니다.")
+
+
+def parse_article_list(payload: dict) -> list[dict]:
+    """Articles of an article-list API answer, newest first."""
+    result = (payload.get("message") or payload).get("result") or {}
+    articles = []
+    for entry in result.get("articleList") or []:
+        item = entry.get("item", entry)
+        article_id = item.get("articleId")
+        if article_id is None:
+            continue
+        articles.append(
+            {
+                "article_id": int(article_id),
+                "title": item.get("subject") or "",
+                "url": ARTICLE_URL.format(cafe_id=CAFE_ID, article_id=article_id),
+            }
         )
+    return articles
+
+
+def find_latest_article_http() -> dict:
+    response = requests.get(
+        ARTICLE_LIST_API_URL,
+        params={
+            "search.clubid": CAFE_ID,
+            "search.menuid": MENU_ID,
+            "search.queryType": "lastArticle",
+            "search.page": 1,
+            "search.perPage": ARTICLE_LIST_SIZE,
+        },
+        headers={"User-Agent": USER_AGENT, "Referer": "https://cafe.naver.com/"},
+        timeout=15,
+    )
+    response.raise_for_status()
+    return select_schedule_article(parse_article_list(response.json()))
+
+
+def should_block_request(resource_type: str, url: str) -> bool:
+    if resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+    if resource_type == "script":
+        host = urlsplit(url).hostname or ""
+        return not any(host == domain or host.endswith("." + domain) for domain in FIRST_PARTY_DOMAINS)
+    return False
+
+
+@contextmanager
+def timed(step: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        print(f"{step}: {time.perf_counter() - start:.1f}초")
+
+
+class CafeScraper:
+    """One headless Chromium and context per run, shared by every scraping step."""
+
+    def __init__(self) -> None:
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.blocked = 0
+
+    def __enter__(self) -> CafeScraper:
+        with timed("브라우저 시작"):
+            self.playwright = sync_playwright().start()
+            try:
+                self.browser = self.playwright.chromium.launch(headless=True)
+                self.context = self.browser.new_context(
+                    user_agent=USER_AGENT,
+                    locale="ko-KR",
+                    timezone_id="Asia/Seoul",
+                )
+                self.context.route("**/*", self.route)
+            except Exception:
+                self.close()
+                raise
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.browser is not None:
+            self.browser.close()
+            self.browser = self.context = None
+        if self.playwright is not None:
+            self.playwright.stop()
+            self.playwright = None
+        if self.blocked:
+            print(f"차단한 요청: {self.blocked}개")
+            self.blocked = 0
+
+    def route(self, route) -> None:
+        request = route.request
+        if should_block_request(request.resource_type, request.url):
+            self.blocked += 1
+            route.abort()
+        else:
+            route.continue_()
+
+    @contextmanager
+    def page(self):
+        page = self.context.new_page()
+        try:
+            yield page
+        finally:
+            page.close()
+
+
+@contextmanager
+def scraper_session(scraper: CafeScraper | None):
+    """The given scraper, or a temporary one for a standalone call."""
+    if scraper is not None:
+        yield scraper
+        return
+    with CafeScraper() as own:
+        yield own
+
+
+def find_latest_article(scraper: CafeScraper | None = None) -> dict:
+    with scraper_session(scraper) as session, timed("게시물 목록 조회"), session.page() as page:
         page.goto(MENU_URL, wait_until="domcontentloaded", timeout=60_000)
         page.wait_for_selector('a[href*="/articles/"]', timeout=30_000)
         links = page.locator('a[href*="/articles/"]').evaluate_all(
@@ -67,135 +229,235 @@ def find_latest_article() -> dict:
                 href: a.href
             }))"""
         )
-        browser.close()
 
-    seen = set()
-    candidates = []
+    articles = []
     for link in links:
-        title = normalize_text(link["title"])
         match = re.search(r"/articles/(\d+)", link["href"])
-        if not match or not title or "댓글수" in title:
-            continue
-        article_id = int(match.group(1))
-        if article_id in seen:
-            continue
-        seen.add(article_id)
-        if re.search(r"\d+월\s*\d+주", title) and re.search(r"일정|훈련", title):
-            candidates.append(
-                {"article_id": article_id, "title": title, "url": link["href"]}
+        if match:
+            articles.append(
+                {"article_id": int(match.group(1)), "title": link["title"], "url": link["href"]}
             )
+    return select_schedule_article(articles)
 
-    if not candidates:
-        raise RuntimeError("주간 훈련 일정 게시물을 찾지 못했습니다.")
-    return candidates[0]
 
-
-def find_schedule_images(article: dict) -> list[str]:
-    with sync_playwright() as playwright:
-        browser = playwright.chromium.launch(headless=True)
-        page = browser.new_page(
-            user_agent=USER_AGENT,
-            locale="ko-KR",
-            timezone_id="Asia/Seoul",
-        )
+def find_schedule_images(article: dict, scraper: CafeScraper | None = None) -> list[str]:
+    with scraper_session(scraper) as session, timed("일정 이미지 주소 조회"), session.page() as page:
         page.goto(article["url"], wait_until="domcontentloaded", timeout=60_000)
         frame = page.frame_locator('iframe[title="카페 메인"]')
         frame.locator("img.se-image-resource").first.wait_for(
             state="attached", timeout=30_000
         )
+        # Image loads are blocked, but src/srcset are still resolved
         urls = frame.locator("img.se-image-resource").evaluate_all(
             "elements => elements.map(img => img.currentSrc || img.src)"
         )
-        browser.close()
     return list(dict.fromkeys(urls))
 
 
-def download_image(url: str) -> Image.Image:
-    response = requests.get(
-        url,
-        headers={"User-Agent": USER_AGENT, "Referer": "https://cafe.naver.com/"},
-        timeout=30,
-    )
+def http_session() -> requests.Session:
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=IMAGE_WORKERS)
+        _session.mount("https://", adapter)
+        _session.mount("http://", adapter)
+        _session.headers.update({"User-Agent": USER_AGENT, "Referer": "https://cafe.naver.com/"})
+    return _session
+
+
+def download_image_bytes(url: str) -> bytes:
+    response = http_session().get(url, timeout=30)
     response.raise_for_status()
-    return Image.open(BytesIO(response.content)).convert("RGB")
+    return response.content
 
 
-def find_horizontal_grid_lines(image: Image.Image) -> list[int]:
-    pixels = image.convert("RGB").load()
-    minimum_dark_pixels = int(image.width * 0.72)
+def download_image(url: str) -> Image.Image:
+    return Image.open(BytesIO(download_image_bytes(url))).convert("RGB")
+
+
+def probe_image_size(url: str) -> tuple[int, int] | None:
+    """(width, height) from the image header in the first PROBE_BYTES, or None."""
+    parser = ImageFile.Parser()
+    read = 0
+    try:
+        with http_session().get(
+            url, headers={"Range": f"bytes=0-{PROBE_BYTES - 1}"}, stream=True, timeout=15
+        ) as response:
+            response.raise_for_status()
+            # A server ignoring Range sends the whole file; stop reading all the same
+            for chunk in response.iter_content(8192):
+                parser.feed(chunk)
+                if parser.image is not None:
+                    return parser.image.size
+                read += len(chunk)
+                if read >= PROBE_BYTES:
+                    break
+    except Exception:
+        return None
+    return None
+
+
+def probe_candidate(url: str) -> tuple[tuple[int, int], str, bytes | None]:
+    """Size of one image; downloaded in full only when the header probe fails."""
+    size = probe_image_size(url)
+    if size is not None:
+        return size, url, None
+    content = download_image_bytes(url)
+    with Image.open(BytesIO(content)) as image:
+        return image.size, url, content
+
+
+def rank_candidates(image_urls: list[str], errors: list[str]) -> list[tuple[str, bytes | None]]:
+    """Table-sized candidates as (url, content if already downloaded), largest first."""
+    with ThreadPoolExecutor(max_workers=IMAGE_WORKERS) as pool:
+        futures = [pool.submit(probe_candidate, url) for url in image_urls]
     candidates = []
-    for y in range(image.height):
-        dark_pixels = sum(
-            1
-            for x in range(image.width)
-            if max(pixels[x, y]) < 230 and max(pixels[x, y]) - min(pixels[x, y]) < 12
-        )
-        if dark_pixels >= minimum_dark_pixels:
-            candidates.append(y)
+    for future in futures:
+        try:
+            (width, height), url, content = future.result()
+        except Exception as error:
+            errors.append(str(error))
+            continue
+        if width >= MIN_TABLE_SIZE[0] and height >= MIN_TABLE_SIZE[1]:
+            candidates.append((width * height, url, content))
+    # Stable: equal areas keep the article order, like max() did
+    candidates.sort(key=lambda item: item[0], reverse=True)
+    return [(url, content) for _, url, content in candidates]
+
+
+def analyze_candidate(article: dict, image_url: str, content: bytes, dates: list) -> dict:
+    """Process-pool worker: the schedule data of one downloaded image."""
+    image = Image.open(BytesIO(content)).convert("RGB")
+    return build_schedule_from_table(article, image_url, image, dates)
+
+
+def find_best_candidate(
+    article: dict, candidates: list[tuple[str, bytes | None]], errors: list[str]
+) -> tuple[bytes, dict] | None:
+    """
+    Download the candidates on threads and analyse them in worker
+    processes, largest first. Analyses are submitted from this thread as
+    downloads finish. The first valid table in size order is the largest
+    one, so the remaining work is cancelled as soon as it is known.
+    """
+    dates = schedule_dates_for_run(datetime.now(KST))
+    downloads = ThreadPoolExecutor(max_workers=IMAGE_WORKERS)
+    analysis = ProcessPoolExecutor(max_workers=ANALYSIS_WORKERS, mp_context=PROCESS_CONTEXT)
+    try:
+        fetched = [
+            downloads.submit(lambda url=url, content=content: content or download_image_bytes(url))
+            for url, content in candidates
+        ]
+        position = {future: index for index, future in enumerate(fetched)}
+        analyses = {}  # index -> analysis future (or the failed download)
+        pending = set(fetched)
+        for index, (url, _) in enumerate(candidates):
+            while index not in analyses:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = position[future]
+                    if future.exception() is not None:
+                        analyses[i] = future
+                    else:
+                        analyses[i] = analysis.submit(
+                            analyze_candidate, article, candidates[i][0], future.result(), dates
+                        )
+            try:
+                return fetched[index].result(), analyses[index].result()
+            except Exception as error:
+                errors.append(str(error))
+        return None
+    finally:
+        downloads.shutdown(wait=False, cancel_futures=True)
+        analysis.shutdown(wait=False, cancel_futures=True)
+
+
+@dataclass(frozen=True)
+class TableProfile:
+    """Per-pixel grid-line and header masks of a table image, reduced to row counts."""
+
+    width: int
+    height: int
+    dark: np.ndarray  # (height, width) bool: grey grid-line pixels
+    dark_rows: np.ndarray  # dark pixels per row
+    green_rows: np.ndarray  # header-green pixels per row
+
+    def dark_columns(self, top: int, bottom: int) -> np.ndarray:
+        """Dark pixels per column between rows top and bottom, inclusive."""
+        return self.dark[top : bottom + 1].sum(axis=0)
+
+
+def analyze_table(image: Image.Image) -> TableProfile:
+    """Convert the image once and classify every pixel in one vectorized pass."""
+    pixels = np.asarray(image.convert("RGB"), dtype=np.int16)
+    red, green, blue = pixels[..., 0], pixels[..., 1], pixels[..., 2]
+    brightest = pixels.max(axis=2)
+    dark = (brightest < 230) & (brightest - pixels.min(axis=2) < 12)
+    header_green = (green >= 145) & (green >= red + 25) & (green >= blue + 45)
+    return TableProfile(
+        width=image.width,
+        height=image.height,
+        dark=dark,
+        dark_rows=dark.sum(axis=1),
+        green_rows=header_green.sum(axis=1),
+    )
 
+
+def group_runs(values: list[int]) -> list[list[int]]:
     groups = []
-    for y in candidates:
-        if not groups or y > groups[-1][-1] + 1:
-            groups.append([y])
+    for value in values:
+        if not groups or value > groups[-1][-1] + 1:
+            groups.append([value])
         else:
-            groups[-1].append(y)
-    return [round(sum(group) / len(group)) for group in groups]
-
-
-def find_schedule_header_bottom(image: Image.Image) -> int:
-    pixels = image.convert("RGB").load()
-    minimum_green_pixels = int(image.width * 0.55)
-    green_rows = []
-    for y in range(image.height):
-        green_pixels = sum(
-            1
-            for x in range(image.width)
-            if (
-                pixels[x, y][1] >= 145
-                and pixels[x, y][1] >= pixels[x, y][0] + 25
-                and pixels[x, y][1] >= pixels[x, y][2] + 45
-            )
-        )
-        if green_pixels >= minimum_green_pixels:
-            green_rows.append(y)
+            groups[-1].append(value)
+    return groups
+
+
+def find_horizontal_grid_lines(
+    image: Image.Image, profile: TableProfile | None = None
+) -> list[int]:
+    profile = profile or analyze_table(image)
+    minimum_dark_pixels = int(profile.width * 0.72)
+    candidates = np.flatnonzero(profile.dark_rows >= minimum_dark_pixels).tolist()
+    return [round(sum(group) / len(group)) for group in group_runs(candidates)]
+
+
+def find_schedule_header_bottom(
+    image: Image.Image, profile: TableProfile | None = None
+) -> int:
+    profile = profile or analyze_table(image)
+    minimum_green_pixels = int(profile.width * 0.55)
+    green_rows = np.flatnonzero(profile.green_rows >= minimum_green_pixels).tolist()
 
     if not green_rows:
         raise RuntimeError("훈련 일정 표의 초록색 머리글을 찾지 못했습니다.")
 
-    groups = []
-    for y in green_rows:
-        if not groups or y > groups[-1][-1] + 1:
-            groups.append([y])
-        else:
-            groups[-1].append(y)
-    header = max(groups, key=len)
-    if len(header) < max(4, int(image.height * 0.025)):
+    header = max(group_runs(green_rows), key=len)
+    if len(header) < max(4, int(profile.height * 0.025)):
         raise RuntimeError("훈련 일정 표의 초록색 머리글 영역이 너무 작습니다.")
     return header[-1] + 1
 
 
-def find_training_column_start(image: Image.Image, top: int, bottom: int) -> int:
-    pixels = image.convert("RGB").load()
+def find_training_column_start(
+    image: Image.Image, top: int, bottom: int, profile: TableProfile | None = None
+) -> int:
+    profile = profile or analyze_table(image)
     minimum_dark_pixels = int((bottom - top) * 0.72)
-    candidates = []
-    for x in range(1, image.width - 1):
-        dark_pixels = sum(
-            1
-            for y in range(top, bottom + 1)
-            if max(pixels[x, y]) < 230 and max(pixels[x, y]) - min(pixels[x, y]) < 12
-        )
-        if dark_pixels >= minimum_dark_pixels:
-            candidates.append(x)
+    columns = profile.dark_columns(top, bottom)
+    candidates = (np.flatnonzero(columns[1 : profile.width - 1] >= minimum_dark_pixels) + 1).tolist()
 
-    interior = [x for x in candidates if image.width * 0.12 < x < image.width * 0.42]
+    interior = [x for x in candidates if profile.width * 0.12 < x < profile.width * 0.42]
     if not interior:
         raise RuntimeError("훈련 일정 표의 날짜/내용 구분선을 찾지 못했습니다.")
     return round(sum(interior) / len(interior))
 
 
-def schedule_row_boundaries(image: Image.Image) -> list[int]:
-    header_bottom = find_schedule_header_bottom(image)
-    lines = find_horizontal_grid_lines(image)
+def schedule_row_boundaries(
+    image: Image.Image, profile: TableProfile | None = None
+) -> list[int]:
+    profile = profile or analyze_table(image)
+    header_bottom = find_schedule_header_bottom(image, profile)
+    lines = find_horizontal_grid_lines(image, profile)
     row_ends = [line for line in lines if line > header_bottom + 2][:7]
     if len(row_ends) < 7:
         raise RuntimeError(
@@ -205,8 +467,9 @@ def schedule_row_boundaries(image: Image.Image) -> list[int]:
 
 
 def validate_schedule_table(image: Image.Image) -> list[int]:
-    boundaries = schedule_row_boundaries(image)
-    find_training_column_start(image, boundaries[0], boundaries[-1])
+    profile = analyze_table(image)
+    boundaries = schedule_row_boundaries(image, profile)
+    find_training_column_start(image, boundaries[0], boundaries[-1], profile)
     return boundaries
 
 
@@ -221,18 +484,53 @@ def split_schedule_rows(image: Image.Image) -> list[Image.Image]:
     return rows
 
 
+def pixel_hash(image: Image.Image) -> str:
+    digest = hashlib.sha256(f"{image.mode}:{image.width}x{image.height}:".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def encode_webp(image: Image.Image, path: str) -> None:
+    """Process-pool worker: the slowest lossless WEBP setting, for the smallest files."""
+    image.save(path, format="WEBP", lossless=True, method=6)
+
+
+def load_image_manifest() -> dict:
+    path = IMAGE_DIR / IMAGE_MANIFEST_NAME
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
 def write_schedule_images(image: Image.Image, data: dict) -> None:
+    rows = split_schedule_rows(image)
+    outputs = {"original.webp": image}
+    for row_index, weekday in TARGET_ROW_INDEXES.items():
+        outputs[DAY_IMAGE_NAMES[weekday]] = rows[row_index]
+
     IMAGE_DIR.mkdir(parents=True, exist_ok=True)
-    original_path = IMAGE_DIR / "original.webp"
-    image.save(original_path, format="WEBP", lossless=True, method=6)
-    data["source_image_path"] = original_path.relative_to(OUTPUT_PATH.parent).as_posix()
+    manifest = load_image_manifest()
+    hashes = {name: pixel_hash(output) for name, output in outputs.items()}
+    changed = [
+        name
+        for name in outputs
+        if manifest.get(name) != hashes[name] or not (IMAGE_DIR / name).exists()
+    ]
+    if changed:
+        with ProcessPoolExecutor(
+            max_workers=min(ENCODE_WORKERS, len(changed)), mp_context=PROCESS_CONTEXT
+        ) as pool:
+            list(pool.map(encode_webp, [outputs[name] for name in changed], [str(IMAGE_DIR / name) for name in changed]))
+    print(f"WEBP 인코딩 {len(changed)}개, 변경 없음 {len(outputs) - len(changed)}개")
+    if manifest != hashes:
+        (IMAGE_DIR / IMAGE_MANIFEST_NAME).write_text(
+            json.dumps(hashes, indent=2) + "\n", encoding="utf-8"
+        )
 
-    rows = split_schedule_rows(image)
+    data["source_image_path"] = (IMAGE_DIR / "original.webp").relative_to(OUTPUT_PATH.parent).as_posix()
     schedule_by_day = {item["day"]: item for item in data["schedule"]}
-    for row_index, weekday in TARGET_ROW_INDEXES.items():
-        row_path = IMAGE_DIR / DAY_IMAGE_NAMES[weekday]
-        rows[row_index].save(row_path, format="WEBP", lossless=True, method=6)
-        schedule_by_day[weekday]["image_path"] = row_path.relative_to(
+    for weekday, name in DAY_IMAGE_NAMES.items():
+        schedule_by_day[weekday]["image_path"] = (IMAGE_DIR / name).relative_to(
             OUTPUT_PATH.parent
         ).as_posix()
 
@@ -259,14 +557,16 @@ def validate_schedule(schedule: list[dict]) -> None:
             raise RuntimeError(f"날짜와 요일이 일치하지 않습니다: {item}")
 
 
-def build_schedule_from_table(article: dict, image_url: str, image: Image.Image) -> dict:
+def build_schedule_from_table(
+    article: dict, image_url: str, image: Image.Image, dates: list | None = None
+) -> dict:
     now = datetime.now(KST)
     week_label = parse_week_label(article["title"])
     match = re.fullmatch(r"(\d{1,2})월 (\d)주", week_label)
     if not match:
         raise RuntimeError("게시물 제목에서 일정 주차를 인식하지 못했습니다.")
 
-    dates = schedule_dates_for_run(now)
+    dates = dates or schedule_dates_for_run(now)
     month = int(match.group(1))
     if month not in {date.month for date in dates}:
         raise RuntimeError(
@@ -302,31 +602,45 @@ def load_existing() -> dict:
 
 
 def update_from_cafe(force: bool = False) -> bool:
-    article = find_latest_article()
     existing = load_existing()
-    if not force and existing.get("article_id") == article["article_id"]:
+    try:
+        with timed("게시물 목록 조회 (HTTP)"):
+            article = find_latest_article_http()
+    except Exception as error:
+        print(f"HTTP 게시물 목록 조회 실패, 브라우저로 다시 조회합니다: {error}")
+        article = None
+
+    # Chromium only starts for a new article (or when the HTTP list failed)
+    if article and not force and existing.get("article_id") == article["article_id"]:
         print(f"이미 반영된 게시물입니다: {article['title']}")
         return False
 
-    image_urls = find_schedule_images(article)
+    with CafeScraper() as scraper:
+        if article is None:
+            article = find_latest_article(scraper)
+            if not force and existing.get("article_id") == article["article_id"]:
+                print(f"이미 반영된 게시물입니다: {article['title']}")
+                return False
+
+        image_urls = find_schedule_images(article, scraper)
+
     if not image_urls:
         raise RuntimeError("게시물에서 일정 이미지를 찾지 못했습니다.")
 
-    candidates = []
     errors = []
-    for image_url in image_urls:
-        image = download_image(image_url)
-        try:
-            data = build_schedule_from_table(article, image_url, image)
-            candidates.append((image.width * image.height, image, data))
-        except Exception as error:
-            errors.append(str(error))
+    with timed(f"일정 이미지 {len(image_urls)}개 크기 확인"):
+        candidates = rank_candidates(image_urls, errors)
+    print(f"표 크기 후보 이미지: {len(candidates)}개")
+    with timed("일정 이미지 다운로드/분석"):
+        found = find_best_candidate(article, candidates, errors)
 
-    if not candidates:
+    if found is None:
         raise RuntimeError("훈련 일정 표 분석에 실패했습니다: " + " | ".join(errors[-5:]))
 
-    _, best_image, best = max(candidates, key=lambda item: item[0])
-    write_schedule_images(best_image, best)
+    content, best = found
+    best_image = Image.open(BytesIO(content)).convert("RGB")
+    with timed("행 이미지 저장"):
+        write_schedule_images(best_image, best)
     OUTPUT_PATH.write_text(
         json.dumps(best, ensure_ascii=False, indent=2) + "\n",
         encoding="utf-8",
@@ -11,55 +11,16 @@ import webbrowser
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
+from address_db import open_address_db
+from kma_grid import CoordinateConverter
+from kma_forecast import ForecastAPIError, ForecastPager, ForecastTable
+from naver_compare import ProviderCache, extract_hourly_block
+
 # Load environment variables from .env file
 load_dotenv()
 
 # --- 1. Coordinate Converter ---
-class CoordinateConverter:
-    """
-    Converts Latitude/Longitude to KMA Grid (X, Y).
-    Based on the official KMA conversion algorithm.
-    """
-    RE = 6371.00877  # Earth radius (km)
-    GRID = 5.0       # Grid interval (km)
-    SLAT1 = 30.0     # Projection latitude 1
-    SLAT2 = 60.0     # Projection latitude 2
-    OLON = 126.0     # Origin longitude
-    OLAT = 38.0      # Origin latitude
-    XO = 43          # Origin X (Grid)
-    YO = 136         # Origin Y (Grid)
-
-    @classmethod
-    def to_grid(cls, lat, lon):
-        degrad = math.pi / 180.0
-        
-        re = cls.RE / cls.GRID
-        slat1 = cls.SLAT1 * degrad
-        slat2 = cls.SLAT2 * degrad
-        olon = cls.OLON * degrad
-        olat = cls.OLAT * degrad
-
-        sn = math.tan(math.pi * 0.25 + slat2 * 0.5) / math.tan(math.pi * 0.25 + slat1 * 0.5)
-        sn = math.log(math.cos(slat1) / math.cos(slat2)) / math.log(sn)
-        sf = math.tan(math.pi * 0.25 + slat1 * 0.5)
-        sf = math.pow(sf, sn) * math.cos(slat1) / sn
-        ro = math.tan(math.pi * 0.25 + olat * 0.5)
-        ro = re * sf / math.pow(ro, sn)
-
-        ra = math.tan(math.pi * 0.25 + lat * degrad * 0.5)
-        ra = re * sf / math.pow(ra, sn)
-
-        theta = lon * degrad - olon
-        if theta > math.pi:
-            theta -= 2.0 * math.pi
-        if theta < -math.pi:
-            theta += 2.0 * math.pi
-        theta *= sn
-
-        x = math.floor(ra * math.sin(theta) + cls.XO + 0.5)
-        y = math.floor(ro - ra * math.cos(theta) + cls.YO + 0.5)
-        
-        return int(x), int(y)
+# Lives in kma_grid so non-GUI tools can project without importing Tk
 
 # --- 2. Data Loader ---
 # --- 2. Data Loader ---
@@ -67,25 +28,109 @@ class CoordinateConverter:
 class DataLoader:
     """
     Loads address and coordinate data.
-    Uses optimized JSON file 'weather_code.json' for instant loading.
+    Reads 'weather_code.json' through the memory-mapped address DB
+    (address_db.py) for instant loading. Builds a character n-gram inverted index so autocomplete does not
+    scan every key on each keystroke.
     """
+    NGRAM_SIZES = (1, 2, 3)
+
     def __init__(self, json_path):
         self.json_path = json_path
         self.data_map = {}  # "Original Address String" -> {'x': ..., 'y': ...}
-        self.search_keys = [] 
+        self.search_keys = []
+        self.ngram_index = {}  # n-gram -> array of key ids (ascending)
+        self.geocoder = None  # ReverseGeocoder: grid cell <-> addresses
+        self.ready = threading.Event()  # set once lookups and search are usable
+
+    def build_index(self):
+        """
+        Build posting lists of key ids for every 1/2/3-character gram.
+        Key ids are positions in the sorted search_keys, so each posting
+        list is already sorted and walking it yields keys in sorted order.
+        """
+        from array import array
+
+        index = {}
+        for key_id, key in enumerate(self.search_keys):
+            grams = set()
+            for n in self.NGRAM_SIZES:
+                for i in range(len(key) - n + 1):
+                    grams.add(key[i:i + n])
+            for gram in grams:
+                postings = index.get(gram)
+                if postings is None:
+                    postings = index[gram] = array('I')
+                postings.append(key_id)
+        self.ngram_index = index
+
+    def search(self, typed, limit=50):
+        """
+        Return the first `limit` keys (in sorted order) containing `typed`.
+        Same result as `[k for k in search_keys if typed in k][:limit]`.
+        """
+        if not typed:
+            return []
 
-    def load_data(self):
+        n = min(len(typed), self.NGRAM_SIZES[-1])
+        grams = {typed[i:i + n] for i in range(len(typed) - n + 1)}
+        postings = []
+        for gram in grams:
+            ids = self.ngram_index.get(gram)
+            if not ids:
+                return []
+            postings.append(ids)
+
+        # Intersect by walking the rarest posting list; the substring check
+        # covers every other gram and keeps results exact for long queries.
+        rarest = min(postings, key=len)
+        keys = self.search_keys
+        if len(typed) <= n:
+            return [keys[key_id] for key_id in rarest[:limit]]
+
+        matches = []
+        for key_id in rarest:
+            key = keys[key_id]
+            if typed in key:
+                matches.append(key)
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    def addresses_in_cell(self, x, y):
+        """All addresses sharing grid cell (x, y), i.e. the same forecast."""
+        if self.geocoder is None:
+            return []
+        return self.geocoder.addresses_in_cell(x, y)
+
+    def load_data(self, progress_cb=None):
         import time
         import json
         
         start_t = time.time()
-        print(f"[DEBUG] Loading Data from Optimized JSON: {self.json_path}")
+        print(f"[DEBUG] Loading Data from Address DB: {self.json_path}")
+        self.ready.clear()
         
         try:
-            with open(self.json_path, 'r', encoding='utf-8') as f:
-                self.data_map = json.load(f)
-            
-            self.search_keys = sorted(self.data_map.keys())
+            if progress_cb:
+                progress_cb(1, 3, "주소 DB 여는 중...")
+            try:
+                # Memory-mapped binary DB (compiled from the JSON on first use)
+                table = open_address_db(self.json_path)
+                self.data_map = table
+                self.search_keys = table.keys_list
+            except Exception as e:
+                print(f"[DEBUG] Binary DB unavailable ({e}), falling back to JSON")
+                with open(self.json_path, 'r', encoding='utf-8') as f:
+                    self.data_map = json.load(f)
+                self.search_keys = sorted(self.data_map.keys())
+
+            if progress_cb:
+                progress_cb(2, 3, "검색 인덱스 생성 중...")
+            self.build_index()
+            self.geocoder = ReverseGeocoder.from_mapping(self.data_map)
+            self.ready.set()
+            if progress_cb:
+                progress_cb(3, 3, "완료!")
             elapsed = time.time() - start_t
             print(f"[DEBUG] Load Complete. Loaded {len(self.search_keys)} items in {elapsed:.4f}s.")
             return True, f"데이터 로딩 완료: {len(self.search_keys)}개 지역 ({elapsed:.2f}초)"
@@ -93,7 +138,321 @@ class DataLoader:
         except Exception as e:
             print(f"[DEBUG] Load Failed: {e}")
             return False, str(e)
-# --- 3. Weather Fetcher (공공데이터포털 API) ---
+
+# --- 2-1. Reverse Geocoder ---
+class ReverseGeocoder:
+    """
+    Nearest-address lookup over the grid cells in weather_code.json.
+    Addresses are grouped by (x, y) cell, and cells are bucketed into
+    BUCKET x BUCKET tiles. A query is projected to continuous grid
+    coordinates and rings of tiles around it are searched until no closer
+    cell can exist, so a lookup touches a few tiles instead of every address.
+    """
+    BUCKET = 4  # tile size in grid cells
+
+    def __init__(self, cells, keys):
+        self.cells = cells  # (x, y) -> [key id, ...] in sorted key order
+        self.keys = keys
+        self.tiles = {}  # (tx, ty) -> [(x, y), ...]
+        for x, y in cells:
+            self.tiles.setdefault((x // self.BUCKET, y // self.BUCKET), []).append((x, y))
+        if self.tiles:
+            txs = [t[0] for t in self.tiles]
+            tys = [t[1] for t in self.tiles]
+            self.tile_bounds = (min(txs), max(txs), min(tys), max(tys))
+        else:
+            self.tile_bounds = (0, -1, 0, -1)
+
+    @classmethod
+    def from_mapping(cls, data_map):
+        cells = {}
+        if hasattr(data_map, 'coord_at'):
+            # AddressTable: walk the i16 arrays without per-key lookups
+            keys = data_map.keys_list
+            for key_id in range(len(keys)):
+                cells.setdefault(data_map.coord_at(key_id), []).append(key_id)
+        else:
+            keys = sorted(data_map)
+            for key_id, key in enumerate(keys):
+                coord = data_map[key]
+                cells.setdefault((coord['x'], coord['y']), []).append(key_id)
+        return cls(cells, keys)
+
+    def addresses_in_cell(self, x, y):
+        return [self.keys[key_id] for key_id in self.cells.get((x, y), ())]
+
+    def nearest_cells(self, fx, fy, k=1):
+        """
+        The k cells nearest to continuous grid position (fx, fy), as
+        [(distance_in_cells, (x, y)), ...] sorted by distance.
+        """
+        b = self.BUCKET
+        min_tx, max_tx, min_ty, max_ty = self.tile_bounds
+        qx, qy = int(math.floor(fx / b)), int(math.floor(fy / b))
+        # Beyond this ring every tile is outside the populated bounds
+        max_r = max(qx - min_tx, max_tx - qx, qy - min_ty, max_ty - qy, 0)
+        # Distance from (fx, fy) to the edges of its own tile
+        edge = min(fx - qx * b, (qx + 1) * b - fx, fy - qy * b, (qy + 1) * b - fy)
+        found = []
+        for r in range(max_r + 1):
+            # Cells in tile ring r are at least edge + (r - 1) * BUCKET away
+            if len(found) >= k and r and edge + (r - 1) * b > found[k - 1][0]:
+                break
+            if r == 0:
+                ring = [(qx, qy)]
+            else:
+                ring = [(qx + dx, qy + dy) for dx in (-r, r) for dy in range(-r, r + 1)]
+                ring += [(qx + dx, qy + dy) for dy in (-r, r) for dx in range(-r + 1, r)]
+            hits = [
+                (math.hypot(x - fx, y - fy), (x, y))
+                for tile in ring
+                for x, y in self.tiles.get(tile, ())
+            ]
+            if hits:
+                found = sorted(found + hits)[:max(k, 1)]
+        return found[:k]
+
+    def nearest(self, lat, lon, k=1, limit=10):
+        """
+        Addresses in the k grid cells nearest to (lat, lon):
+        [(address, distance_km, (x, y)), ...], at most `limit` entries.
+        """
+        fx, fy = CoordinateConverter.project(lat, lon)
+        return self._addresses(self.nearest_cells(fx, fy, k), limit)
+
+    def nearest_many(self, lats, lons, limit=1):
+        """
+        Batch nearest() for k=1. Rings are searched for all queries at once
+        over a dense occupancy grid, so 100k points cost a few hundred numpy
+        passes instead of 100k Python ring walks. Ties resolve like
+        nearest_cells (smaller (x, y) first).
+        """
+        import numpy as np
+
+        fx, fy = CoordinateConverter.project_many(lats, lons)
+        fx = np.atleast_1d(np.asarray(fx, dtype=np.float64)).ravel()
+        fy = np.atleast_1d(np.asarray(fy, dtype=np.float64)).ravel()
+        n = fx.size
+        if not self.cells or not n:
+            return [[] for _ in range(n)]
+
+        occupied, x0, y0 = self._occupancy()
+        h, w = occupied.shape
+        cx = np.floor(fx + 0.5).astype(np.int64)
+        cy = np.floor(fy + 0.5).astype(np.int64)
+        best = np.full(n, np.inf)
+        best_x = np.zeros(n, dtype=np.int64)
+        best_y = np.zeros(n, dtype=np.int64)
+        # Beyond this ring every cell is outside the populated bounds
+        max_r = np.maximum.reduce([x0 - cx, cx - (x0 + w - 1), y0 - cy, cy - (y0 + h - 1)])
+        max_r = np.maximum(max_r, 0) + max(w, h)
+
+        active = np.arange(n)
+        r = 0
+        while active.size:
+            if r == 0:
+                ring = [(0, 0)]
+            else:
+                ring = [(dx, dy) for dx in (-r, r) for dy in range(-r, r + 1)]
+                ring += [(dx, dy) for dy in (-r, r) for dx in range(-r + 1, r)]
+            qx, qy = fx[active], fy[active]
+            ax, ay = cx[active], cy[active]
+            for dx, dy in ring:
+                x = ax + dx
+                y = ay + dy
+                inside = (x >= x0) & (x < x0 + w) & (y >= y0) & (y < y0 + h)
+                hit = np.zeros(active.size, dtype=bool)
+                hit[inside] = occupied[y[inside] - y0, x[inside] - x0]
+                if not hit.any():
+                    continue
+                d = np.hypot(x - qx, y - qy)
+                b = best[active]
+                better = hit & ((d < b) | ((d == b) & (
+                    (x < best_x[active]) | ((x == best_x[active]) & (y < best_y[active])))))
+                idx = active[better]
+                best[idx] = d[better]
+                best_x[idx] = x[better]
+                best_y[idx] = y[better]
+            r += 1
+            # Cells in ring r are at least r - 0.5 away from the query
+            active = active[(r - 0.5 <= best[active]) & (r <= max_r[active])]
+
+        return [
+            self._addresses([(dist, (x, y))], limit)
+            for dist, x, y in zip(best.tolist(), best_x.tolist(), best_y.tolist())
+        ]
+
+    def _occupancy(self):
+        """Boolean (H, W) grid of populated cells and its (x0, y0) origin."""
+        if getattr(self, '_occupied', None) is None:
+            import numpy as np
+            xs = [x for x, _ in self.cells]
+            ys = [y for _, y in self.cells]
+            x0, y0 = min(xs), min(ys)
+            occupied = np.zeros((max(ys) - y0 + 1, max(xs) - x0 + 1), dtype=bool)
+            occupied[np.array(ys) - y0, np.array(xs) - x0] = True
+            self._occupied = (occupied, x0, y0)
+        return self._occupied
+
+    def _addresses(self, cells, limit):
+        results = []
+        for dist, cell in cells:
+            for key_id in self.cells[cell]:
+                if len(results) >= limit:
+                    return results
+                results.append((self.keys[key_id], dist * CoordinateConverter.GRID, cell))
+        return results
+
+# --- 3. Forecast Cache ---
+class ForecastCache:
+    """
+    Two-level cache (in-memory LRU + on-disk JSON) for getVilageFcst items,
+    keyed by (nx, ny, base_date, base_time).
+    Entries live exactly as long as their issuance: when get_base_datetime
+    rolls over to the next base time, expire() drops everything older.
+    """
+    def __init__(self, cache_dir, max_entries=32, max_disk_entries=256):
+        from collections import OrderedDict
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+
+    @staticmethod
+    def _file_name(key):
+        nx, ny, base_date, base_time = key
+        return f"{nx}_{ny}_{base_date}{base_time}.json"
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, self._file_name(key))
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return self._memory[key]
+
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                items = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+
+        with self._lock:
+            self.stats["disk_hits"] += 1
+            self._remember(key, items)
+        return items
+
+    def put(self, key, items):
+        with self._lock:
+            self._remember(key, items)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(key)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(items, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            self._prune_disk()
+        except OSError as e:
+            print(f"[DEBUG] Forecast cache write failed: {e}")
+
+    def _remember(self, key, items):
+        # Caller holds the lock
+        self._memory[key] = items
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _disk_files(self):
+        try:
+            names = [n for n in os.listdir(self.cache_dir) if n.endswith(".json")]
+        except OSError:
+            return []
+        return [os.path.join(self.cache_dir, n) for n in names]
+
+    def _prune_disk(self):
+        files = self._disk_files()
+        if len(files) <= self.max_disk_entries:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.max_disk_entries]:
+            try:
+                os.remove(path)
+                self.stats["evictions"] += 1
+            except OSError:
+                pass
+
+    def expire(self, base_date, base_time):
+        """Drop every entry that does not belong to the given issuance."""
+        issuance = f"{base_date}{base_time}"
+        with self._lock:
+            for key in [k for k in self._memory if f"{k[2]}{k[3]}" != issuance]:
+                del self._memory[key]
+                self.stats["expired"] += 1
+        for path in self._disk_files():
+            if not os.path.basename(path).endswith(f"_{issuance}.json"):
+                try:
+                    os.remove(path)
+                    self.stats["expired"] += 1
+                except OSError:
+                    pass
+
+    def hit_rate(self):
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
+
+# --- 3-1. Request Coalescing ---
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key: the first caller runs the
+    function, later callers block until it finishes and get the same result
+    (or exception). Nothing is kept afterwards; caching is ForecastCache's job.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> in-flight call state
+        self.stats = {'calls': 0, 'executed': 0, 'coalesced': 0}
+
+    def do(self, key, fn):
+        """Run fn() once per in-flight key. Returns (result, shared)."""
+        with self._lock:
+            self.stats['calls'] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = {'done': threading.Event(), 'result': None, 'error': None}
+                self._calls[key] = call
+                self.stats['executed'] += 1
+            else:
+                self.stats['coalesced'] += 1
+
+        if not leader:
+            call['done'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result'], True
+
+        try:
+            call['result'] = fn()
+        except BaseException as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call['done'].set()
+        return call['result'], False
+
+
+# --- 4. Weather Fetcher (공공데이터포털 API) ---
 class WeatherFetcher:
     """
     Fetches weather from Korea Open Data Portal (공공데이터포털).
@@ -102,8 +461,13 @@ class WeatherFetcher:
     """
     BASE_URL = "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getVilageFcst"
     SERVICE_KEY = os.environ.get("DATA_GO_KR_API_KEY", "")
+    CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.forecast_cache')
     
     _session = None
+    _pager = None
+    _cache = None
+    _cache_issuance = None
+    _inflight = SingleFlight()
 
     @classmethod
     def get_session(cls):
@@ -114,6 +478,23 @@ class WeatherFetcher:
             cls._session.mount('http://', adapter)
         return cls._session
 
+    @classmethod
+    def get_pager(cls):
+        if cls._pager is None:
+            cls._pager = ForecastPager(cls.get_session(), cls.BASE_URL, timeout=30)
+        return cls._pager
+
+    @classmethod
+    def get_cache(cls):
+        if cls._cache is None:
+            cls._cache = ForecastCache(cls.CACHE_DIR)
+        return cls._cache
+
+    @classmethod
+    def get_inflight(cls):
+        """SingleFlight shared by every fetch; see its stats for coalescing."""
+        return cls._inflight
+
     @staticmethod
     def get_base_datetime():
         """
@@ -147,9 +528,40 @@ class WeatherFetcher:
         """
         Fetch all forecast data in 1-2 API calls.
         Returns list of items with all weather categories.
+        Served from ForecastCache while the issuance is unchanged.
         """
         base_date, base_time = WeatherFetcher.get_base_datetime()
+        cache = WeatherFetcher.get_cache()
+        if WeatherFetcher._cache_issuance != (base_date, base_time):
+            # New issuance: everything cached so far is outdated
+            cache.expire(base_date, base_time)
+            WeatherFetcher._cache_issuance = (base_date, base_time)
+
+        cache_key = (nx, ny, base_date, base_time)
+        items = cache.get(cache_key)
+        if items is not None:
+            print(f"[DEBUG] Forecast cache hit {cache_key} (hit rate {cache.hit_rate():.0%}, {cache.stats})")
+            if progress_cb:
+                progress_cb(3, 3, "캐시 사용")
+            return items, base_date, base_time
         
+        # Concurrent requests for one cell and issuance share a single call
+        items, shared = WeatherFetcher.get_inflight().do(
+            ('items',) + cache_key,
+            lambda: WeatherFetcher._request_forecast(cache_key, progress_cb),
+        )
+        if items is None:
+            return None, None, None
+        if shared:
+            print(f"[DEBUG] Coalesced forecast request {cache_key} ({WeatherFetcher.get_inflight().stats})")
+            if progress_cb:
+                progress_cb(3, 3, "완료!")
+        return items, base_date, base_time
+
+    @staticmethod
+    def _request_forecast(cache_key, progress_cb=None):
+        """One getVilageFcst call. Returns the items (cached) or None on error."""
+        nx, ny, base_date, base_time = cache_key
         if progress_cb:
             progress_cb(1, 3, "API 요청 중...")
         
@@ -165,98 +577,52 @@ class WeatherFetcher:
         }
         
         try:
-            session = WeatherFetcher.get_session()
-            resp = session.get(WeatherFetcher.BASE_URL, params=params, timeout=30)
-            resp.raise_for_status()
+            # Every page of the horizon, not just the first numOfRows
+            items = WeatherFetcher.get_pager().fetch(params)
             
             if progress_cb:
                 progress_cb(2, 3, "데이터 파싱 중...")
             
-            data = resp.json()
-            
-            # Check for API errors
-            header = data.get('response', {}).get('header', {})
-            if header.get('resultCode') != '00':
-                print(f"API Error: {header.get('resultMsg')}")
-                return None
-            
-            items = data.get('response', {}).get('body', {}).get('items', {}).get('item', [])
+            if items:
+                WeatherFetcher.get_cache().put(cache_key, items)
             
             if progress_cb:
                 progress_cb(3, 3, "완료!")
             
-            return items, base_date, base_time
+            return items
             
+        except ForecastAPIError as e:
+            print(f"API Error: {e}")
+            return None
         except Exception as e:
             print(f"Fetch error: {e}")
-            return None, None, None
+            return None
 
     @staticmethod
     def get_timeseries(grid_x, grid_y, count=36, progress_cb=None):
         """
-        Get time series forecast data.
-        Returns list of dicts with tmef and weather values.
+        Get time series forecast data as a ForecastTable (rows behave like
+        the old {'tmef': .., 'TMP': ..} dicts). Concurrent calls for the same cell share one fetch and one parsed
+        list, so callers must not modify it.
         """
+        base_date, base_time = WeatherFetcher.get_base_datetime()
+        results, shared = WeatherFetcher.get_inflight().do(
+            ('timeseries', grid_x, grid_y, base_date, base_time, count),
+            lambda: WeatherFetcher._build_timeseries(grid_x, grid_y, count, progress_cb),
+        )
+        if shared and progress_cb:
+            progress_cb(3, 3, "완료!")
+        return results
+
+    @staticmethod
+    def _build_timeseries(grid_x, grid_y, count, progress_cb=None):
         result = WeatherFetcher.fetch_all_forecasts(grid_x, grid_y, progress_cb)
         
         if result[0] is None:
-            return []
-        
-        items, base_date, base_time = result
-        
-        # Group items by forecast datetime
-        forecast_map = {}
-        
-        for item in items:
-            fcst_date = item.get('fcstDate', '')
-            fcst_time = item.get('fcstTime', '')
-            category = item.get('category', '')
-            value = item.get('fcstValue', '')
-            
-            key = f"{fcst_date}{fcst_time}"
-            if key not in forecast_map:
-                forecast_map[key] = {'tmef': key}
-            
-            # Parse value
-            try:
-                if category in ['TMP', 'WSD', 'REH', 'POP']:
-                    forecast_map[key][category] = float(value)
-                elif category in ['SKY', 'PTY', 'PCP', 'SNO']:
-                    # Handle categorical values
-                    if category == 'PCP':
-                        # Convert precipitation string to category
-                        if value == '강수없음':
-                            forecast_map[key][category] = 0
-                        elif '1mm' in value or '미만' in value:
-                            forecast_map[key][category] = 1
-                        elif '30' in value or '50' in value:
-                            forecast_map[key][category] = 3
-                        else:
-                            try:
-                                forecast_map[key][category] = 2  # Normal range
-                            except:
-                                forecast_map[key][category] = 0
-                    elif category == 'SNO':
-                        # Convert snow string to category
-                        if value == '적설없음':
-                            forecast_map[key][category] = 0
-                        elif '1cm' in value or '미만' in value:
-                            forecast_map[key][category] = 1
-                        else:
-                            forecast_map[key][category] = 2
-                    else:
-                        forecast_map[key][category] = int(value)
-            except:
-                pass
+            return ForecastTable(None, 0)
         
-        # Sort by time and limit to count
-        sorted_keys = sorted(forecast_map.keys())[:count]
-        
-        results = []
-        for key in sorted_keys:
-            results.append(forecast_map[key])
-        
-        return results
+        # One pass, values decoded once into per-category arrays
+        return ForecastTable.from_items(result[0], count=count)
 
 class NaverCompareFetcher:
     BASE_URL = "https://weather.naver.com/compare/{region_code}"
@@ -274,6 +640,7 @@ class NaverCompareFetcher:
     }
 
     _session = None
+    _cache = ProviderCache()
 
     @classmethod
     def get_session(cls):
@@ -290,10 +657,16 @@ class NaverCompareFetcher:
         target_date = target_date or cls.get_target_date()
         url = cls.BASE_URL.format(region_code=region_code)
         headers = {"User-Agent": "Mozilla/5.0"}
-        resp = cls.get_session().get(url, headers=headers, timeout=20)
-        resp.raise_for_status()
-        resp.encoding = "utf-8"
-        return cls.parse_hourly_services(resp.text, start_hour=start_hour, end_hour=end_hour, target_date=target_date)
+        # Only the hourly block is read, and only providers with a new issuance are rebuilt
+        services, bytes_read = cls._cache.get(
+            cls.get_session(), region_code, url, (start_hour, end_hour, target_date),
+            lambda code, rows: cls.build_service(code, rows, start_hour, end_hour, target_date),
+            headers=headers, timeout=20,
+        )
+        stats = cls._cache.stats
+        print(f"[DEBUG] 네이버 비교 예보: {bytes_read / 1024:.0f}KB 읽음 "
+              f"(캐시 적중 {stats['hits']}/{stats['hits'] + stats['misses']}, 재사용 제공자 {stats['skipped_providers']})")
+        return cls.sort_services(services)
 
     @staticmethod
     def get_target_date():
@@ -304,58 +677,57 @@ class NaverCompareFetcher:
 
     @classmethod
     def parse_hourly_services(cls, html, start_hour=4, end_hour=8, target_date=None):
-        block_api_result = cls.extract_block_api_result(html)
-        choice_result = block_api_result.get("results", {}).get("choiceResult", {})
-        hourly_block = choice_result.get("compareHourlyFcast~~1", {})
+        return cls.from_hourly_block(extract_hourly_block(html), start_hour=start_hour, end_hour=end_hour, target_date=target_date)
+
+    @classmethod
+    def from_hourly_block(cls, hourly_block, start_hour=4, end_hour=8, target_date=None):
         hourly_map = hourly_block.get("domesticHourlyListMap", {})
 
         services = []
         for provider_code, rows in hourly_map.items():
-            if provider_code == "KMA":
-                continue
+            service = cls.build_service(provider_code, rows, start_hour, end_hour, target_date)
+            if service:
+                services.append(service)
+        return cls.sort_services(services)
 
-            normalized_rows = []
-            updated_at = ""
-            service_target_date = target_date or ""
-            for row in rows:
-                try:
-                    hour = int(str(row.get("aplTm", "")).zfill(2))
-                except ValueError:
-                    continue
-                if hour < start_hour or hour > end_hour:
-                    continue
-                row_date = str(row.get("aplYmd", ""))
-                if not service_target_date:
-                    service_target_date = row_date
-                if row_date != service_target_date:
-                    continue
-                normalized = cls.normalize_hourly_row(row)
-                normalized_rows.append(normalized)
-                if not updated_at:
-                    updated_at = normalized.get("updated_at", "")
-
-            if normalized_rows:
-                services.append({
-                    "provider": cls.PROVIDER_NAMES.get(provider_code, provider_code),
-                    "provider_code": provider_code,
-                    "updated_at": updated_at,
-                    "rows": normalized_rows,
-                })
+    @classmethod
+    def sort_services(cls, services):
+        return sorted(services, key=lambda service: cls.PROVIDER_ORDER.get(service["provider_code"], 99))
 
-        services.sort(key=lambda service: cls.PROVIDER_ORDER.get(service["provider_code"], 99))
+    @classmethod
+    def build_service(cls, provider_code, rows, start_hour=4, end_hour=8, target_date=None):
+        """One provider's rows inside the window, or None (KMA is shown from the API instead)."""
+        if provider_code == "KMA":
+            return None
 
-        return services
+        normalized_rows = []
+        updated_at = ""
+        service_target_date = target_date or ""
+        for row in rows:
+            try:
+                hour = int(str(row.get("aplTm", "")).zfill(2))
+            except ValueError:
+                continue
+            if hour < start_hour or hour > end_hour:
+                continue
+            row_date = str(row.get("aplYmd", ""))
+            if not service_target_date:
+                service_target_date = row_date
+            if row_date != service_target_date:
+                continue
+            normalized = cls.normalize_hourly_row(row)
+            normalized_rows.append(normalized)
+            if not updated_at:
+                updated_at = normalized.get("updated_at", "")
 
-    @staticmethod
-    def extract_block_api_result(html):
-        marker = "var blockApiResult = "
-        start = html.find(marker)
-        if start < 0:
-            raise ValueError("Naver compare payload not found")
-        json_start = start + len(marker)
-        decoder = json.JSONDecoder()
-        payload, _ = decoder.raw_decode(html[json_start:])
-        return payload
+        if not normalized_rows:
+            return None
+        return {
+            "provider": cls.PROVIDER_NAMES.get(provider_code, provider_code),
+            "provider_code": provider_code,
+            "updated_at": updated_at,
+            "rows": normalized_rows,
+        }
 
     @staticmethod
     def normalize_hourly_row(row):
@@ -386,9 +758,11 @@ class NaverCompareFetcher:
             return "-"
         return f"{value}{suffix}"
 
-# --- 4. GUI Application ---
+# --- 5. GUI Application ---
 class WeatherApp:
     def __init__(self, root):
+        import time
+        self.start_t = time.perf_counter()
         self.root = root
         self.root.title("전국 동네예보 검색 (KMA Weather)")
         self.root.geometry("800x1000") 
@@ -400,6 +774,7 @@ class WeatherApp:
         self.setup_ui()
         
         self.fetcher = WeatherFetcher()
+        self.fetch_seq = 0
         
         # Initialize Logic
         # Data Loader (Optimized JSON)
@@ -407,12 +782,15 @@ class WeatherApp:
         
         self.loader = DataLoader(json_path)
         
-        # Initial data loading
+        # Initial data loading runs on a worker thread so the window is usable
+        # immediately; searches typed meanwhile are replayed once it's ready.
+        self.pending_query = None
+        self.pending_fetch = None
         self.output_log("주소 데이터를 로딩중입니다...")
-        self.root.update() # Force UI update to show loading status
-        
-        success, msg = self.loader.load_data()
-        self.output_log(msg)
+        self.prog_frame.pack(fill='x', padx=5, pady=5, before=self.tree)
+        self.progress['value'] = 0
+        self.root.after_idle(self.on_window_ready)
+        threading.Thread(target=self.load_data_thread, daemon=True).start()
 
     def load_recents(self):
         import json
@@ -557,8 +935,29 @@ class WeatherApp:
 
     # ... (Load, Search, Recents same) ...
     def load_data_thread(self):
-        success, msg = self.loader.load_data()
-        self.root.after(0, lambda: self.output_log(msg))
+        success, msg = self.loader.load_data(progress_cb=self.update_prog)
+        self.root.after(0, lambda: self.on_data_loaded(success, msg))
+
+    def on_window_ready(self):
+        import time
+        elapsed = time.perf_counter() - self.start_t
+        print(f"[DEBUG] Window interactive in {elapsed:.4f}s.")
+
+    def on_data_loaded(self, success, msg):
+        import time
+        elapsed = time.perf_counter() - self.start_t
+        print(f"[DEBUG] Time-to-interactive (address search ready): {elapsed:.4f}s.")
+        self.prog_frame.pack_forget()
+        self.output_log(f"{msg} / 검색 가능까지 {elapsed:.2f}초" if success else msg)
+        if not success:
+            return
+
+        pending_fetch, self.pending_fetch = self.pending_fetch, None
+        pending_query, self.pending_query = self.pending_query, None
+        if pending_fetch:
+            self.fetch_weather_action(pending_fetch)
+        elif pending_query and self.search_var.get() == pending_query:
+            self.on_search_change()
 
     def update_recents_ui(self):
         for widget in self.recent_buttons_frame.winfo_children():
@@ -593,9 +992,15 @@ class WeatherApp:
             return
 
         if not typed:
+            self.pending_query = None
             self.listbox_frame.pack_forget()
             return
-        matches = [k for k in self.loader.search_keys if typed in k][:50]
+        if not self.loader.ready.is_set():
+            # Queue the latest query; answered in on_data_loaded
+            self.pending_query = typed
+            self.output_log("주소 데이터를 로딩중입니다... 로딩 후 검색 결과를 표시합니다.")
+            return
+        matches = self.loader.search(typed, limit=50)
         if matches:
             self.listbox.delete(0, tk.END)
             for m in matches:
@@ -649,6 +1054,10 @@ class WeatherApp:
         self.fetch_weather_action(addr)
 
     def fetch_weather_action(self, addr):
+        if not self.loader.ready.is_set():
+            self.pending_fetch = addr
+            self.output_log("주소 데이터를 로딩중입니다... 로딩 후 조회합니다.")
+            return
         if addr not in self.loader.data_map:
             messagebox.showerror("오류", "리스트에 없는 주소입니다.\n검색어를 확인해주세요.")
             return
@@ -667,7 +1076,11 @@ class WeatherApp:
         gx, gy = data['x'], data['y']
         
         self.location_label.config(text=f"주소: {addr} (X:{gx}, Y:{gy})")
-        self.output_log("조회 시작...")
+        shared = len(self.loader.addresses_in_cell(gx, gy))
+        if shared > 1:
+            self.output_log(f"조회 시작... (같은 격자 {shared}개 지역 공통 예보)")
+        else:
+            self.output_log("조회 시작...")
         
         # Clear tree
         for item in self.tree.get_children():
@@ -678,58 +1091,52 @@ class WeatherApp:
         self.prog_frame.pack(fill='x', padx=5, pady=5, before=self.tree)
         self.progress['value'] = 0
             
-        threading.Thread(target=self.do_fetch, args=(gx, gy), daemon=True).start()
+        # Only the latest request may fill the table; an older one for the
+        # same cell is coalesced by WeatherFetcher and finishes at once
+        self.fetch_seq += 1
+        threading.Thread(target=self.do_fetch, args=(gx, gy, self.fetch_seq), daemon=True).start()
         self.fetch_service_forecast_btn()
 
-    def do_fetch(self, gx, gy):
+    def do_fetch(self, gx, gy, seq=None):
         # Fetch 36 hours with callback
-        data_list = self.fetcher.get_timeseries(gx, gy, count=36, progress_cb=self.update_prog)
+        table = self.fetcher.get_timeseries(gx, gy, count=36, progress_cb=self.update_prog)
         
-        self.root.after(0, lambda: self.fill_tree(data_list))
+        self.root.after(0, lambda: self.fill_tree(table, seq))
 
-    def fill_tree(self, data_list):
+    def fill_tree(self, table, seq=None):
+        if seq is not None and seq != self.fetch_seq:
+            return  # superseded by a newer fetch
         self.prog_frame.pack_forget() # Hide progress
         
-        if not data_list:
+        if not table:
             self.output_log("데이터 조회 실패")
             return
 
         cnt = 0
-        def safe_int(val, default=0):
-            if val is None: return default
-            try: return int(val)
-            except: return default
-            
         sky_map = {1: "맑음", 3: "구름많음", 4: "흐림"}
         pty_map = {0: "없음", 1: "비", 2: "비/눈", 3: "눈", 4: "소나기"}
 
-        for row in data_list:
-            if not row: continue
+        for i in range(len(table)):
+            if not table.has_data(i): continue
             
-            t_str = row.get("tmef", "")
-            if len(t_str) == 12:
-                time_disp = f"{t_str[4:6]}/{t_str[6:8]} {t_str[8:10]}:{t_str[10:12]}"
-            else:
-                time_disp = t_str
+            t_str = table.tmef(i)
+            time_disp = f"{t_str[4:6]}/{t_str[6:8]} {t_str[8:10]}:{t_str[10:12]}"
                 
-            tmp = row.get("TMP")
+            tmp = table.get("TMP", i)
             # Robust missing check: None, -50, or -99 (often API missing)
-            if tmp is None or tmp <= -50 or tmp == -99.0: tmp = "-"
-            
-            sky_val = safe_int(row.get("SKY"), 0)
-            sky = sky_map.get(sky_val, "-")
+            if tmp is None or tmp <= -50: tmp = "-"
             
-            pty_val = safe_int(row.get("PTY"), 0)
-            pty = pty_map.get(pty_val, "-")
+            sky = sky_map.get(table.get("SKY", i, 0), "-")
+            pty = pty_map.get(table.get("PTY", i, 0), "-")
             
-            pop = row.get("POP", "-")
+            pop = table.get("POP", i, "-")
             if pop == -1 or pop == -99.0: pop = "-"
             
-            reh = row.get("REH", "-")
+            reh = table.get("REH", i, "-")
             if reh == -1 or reh == -99.0: reh = "-"
             
-            wsd = row.get("WSD", 0)
-            if wsd == -1 or wsd is None or wsd == -99.0: wsd = 0
+            wsd = table.get("WSD", i, 0)
+            if wsd == -1 or wsd == -99.0: wsd = 0
             
             wsd_desc = ""
             if wsd >= 9: wsd_desc = "(강)"
@@ -737,19 +1144,17 @@ class WeatherApp:
             
             wsd_str = f"{wsd} {wsd_desc}" if wsd_desc else f"{wsd}"
             
-            pcp = safe_int(row.get("PCP"), 0)
-            sno = safe_int(row.get("SNO"), 0)
+            pcp = table.get("PCP", i, 0)
+            sno = table.get("SNO", i, 0)
             
             pcp_str = "-"
             if pcp == 1: pcp_str = "<3mm"
             elif pcp == 2: pcp_str = "3-15mm"
             elif pcp >= 3: pcp_str = "15mm+"
-            elif pcp == -99: pcp_str = "-"
             
             sno_str = "-"
             if sno == 1: sno_str = "<1cm"
             elif sno >= 2: sno_str = "1cm+"
-            elif sno == -99: sno_str = "-"
 
             self.tree.insert("", "end", values=(
                 time_disp,
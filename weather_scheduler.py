@@ -1,9 +1,15 @@
+import hashlib
 import json
 import requests
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
+from address_db import open_address_db
+from kma_forecast import ForecastAPIError, ForecastPager, ForecastTable, plan_window
+from naver_compare import ProviderCache, extract_hourly_block
+
 # Load environment variables
 load_dotenv()
 
@@ -14,6 +20,20 @@ GRID_Y = 101
 OUTPUT_FILE = "weather_data.json"
 SERVICE_OUTPUT_FILE = "service_weather_data.json"
 NAVER_COMPARE_REGION_CODE = "07200124"
+# Multi-location: addresses resolved through weather_code.json
+LOCATIONS_FILE = "weather_locations.json"
+JSON_DB_PATH = "weather_code.json"
+SHARD_DIR = "weather"
+MANIFEST_FILE = os.path.join(SHARD_DIR, "manifest.json")
+FETCH_WORKERS = 8
+# Last run's issuance and output hashes, committed with the outputs
+STATE_FILE = "weather_state.json"
+# Run timestamps, by path: the top-level stamp of the manifest and the Naver
+# payload, and the payload embedded in a shard. Providers' own updated_at
+# (their fcastYmdt issuance) is content and stays in the hash.
+VOLATILE_PATHS = (("updated_at",), ("service", "updated_at"))
+# Categories weather_data.json is built from
+TARGET_CATEGORIES = ("TMP", "SKY", "WSD", "POP", "PTY")
 
 def get_kst_now():
     """Returns current datetime in KST (UTC+9)."""
@@ -27,6 +47,24 @@ class WeatherFetcher:
     BASE_URL = "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getVilageFcst"
     SERVICE_KEY = os.environ.get("DATA_GO_KR_API_KEY", "")
     
+    _session = None
+    _pager = None
+
+    @classmethod
+    def get_session(cls):
+        if cls._session is None:
+            cls._session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=FETCH_WORKERS, pool_maxsize=FETCH_WORKERS, max_retries=3)
+            cls._session.mount('https://', adapter)
+            cls._session.mount('http://', adapter)
+        return cls._session
+
+    @classmethod
+    def get_pager(cls):
+        if cls._pager is None:
+            cls._pager = ForecastPager(cls.get_session(), cls.BASE_URL, timeout=30)
+        return cls._pager
+
     @staticmethod
     def get_base_datetime():
         """
@@ -73,24 +111,55 @@ class WeatherFetcher:
         }
         
         try:
-            resp = requests.get(WeatherFetcher.BASE_URL, params=params, timeout=30)
-            resp.raise_for_status()
-            
-            data = resp.json()
-            
-            # Check for API errors
-            header = data.get('response', {}).get('header', {})
-            if header.get('resultCode') != '00':
-                print(f"API Error: {header.get('resultMsg')}")
-                return None
-            
-            items = data.get('response', {}).get('body', {}).get('items', {}).get('item', [])
-            return items
+            # Remaining pages (totalCount > numOfRows) are fetched concurrently
+            return WeatherFetcher.get_pager().fetch(params)
             
+        except ForecastAPIError as e:
+            print(f"API Error: {e}")
+            return None
         except Exception as e:
             print(f"Fetch error: {e}")
             return None
 
+    @staticmethod
+    def fetch_window(nx, ny, target_times, categories=TARGET_CATEGORIES):
+        """
+        Fetch only the rows around target_times (plan_window) and parse
+        just `categories`. Falls back to the full forecast when the slice
+        does not cover every target hour. Returns a ForecastTable or None.
+        """
+        base_date, base_time = WeatherFetcher.get_base_datetime()
+        plan = plan_window(base_date, base_time, target_times)
+        if plan:
+            num_of_rows, page_no = plan
+            params = {
+                'serviceKey': WeatherFetcher.SERVICE_KEY,
+                'numOfRows': num_of_rows,
+                'pageNo': page_no,
+                'dataType': 'JSON',
+                'base_date': base_date,
+                'base_time': base_time,
+                'nx': nx,
+                'ny': ny
+            }
+            try:
+                items = WeatherFetcher.get_pager().fetch_page(params, page_no)
+                table = ForecastTable.from_items(items, categories=categories)
+                if table.covers(target_times, categories):
+                    print(f"Fetched {len(items)} forecast items (numOfRows={num_of_rows}, pageNo={page_no})")
+                    return table
+                print("Planned slice missed the target window, fetching the full forecast")
+            except ForecastAPIError as e:
+                print(f"API Error: {e}")
+            except Exception as e:
+                print(f"Fetch error: {e}")
+        
+        items = WeatherFetcher.fetch_forecast(nx, ny)
+        if not items:
+            return None
+        print(f"Fetched {len(items)} forecast items")
+        return ForecastTable.from_items(items, categories=categories)
+
 
 class NaverCompareFetcher:
     BASE_URL = "https://weather.naver.com/compare/{region_code}"
@@ -105,78 +174,77 @@ class NaverCompareFetcher:
         "TWC": 1,
         "WEATHERNEWS": 2,
     }
+    # Provider issuances and built services; main() restores and saves it
+    # through STATE_FILE so unchanged providers are skipped across runs
+    cache = ProviderCache()
 
     @classmethod
     def fetch_hourly_services(cls, region_code=NAVER_COMPARE_REGION_CODE, start_hour=4, end_hour=8, target_date=None):
         target_date = target_date or get_target_times()[0][:8]
         url = cls.BASE_URL.format(region_code=region_code)
         headers = {"User-Agent": "Mozilla/5.0"}
-        resp = requests.get(url, headers=headers, timeout=30)
-        resp.raise_for_status()
-        resp.encoding = "utf-8"
-        return cls.parse_hourly_services(resp.text, start_hour=start_hour, end_hour=end_hour, target_date=target_date)
+        # Reading stops once the hourly block is complete
+        services, bytes_read = cls.cache.get(
+            requests, region_code, url, (start_hour, end_hour, target_date),
+            lambda code, rows: cls.build_service(code, rows, start_hour, end_hour, target_date),
+            headers=headers, timeout=30,
+        )
+        print(f"Read {bytes_read / 1024:.0f} KiB of the Naver compare page for {region_code}")
+        return cls.build_payload(region_code, services, target_date)
 
     @classmethod
-    def parse_hourly_services(cls, html, start_hour=4, end_hour=8, target_date=None):
-        block_api_result = cls.extract_block_api_result(html)
-        choice_result = block_api_result.get("results", {}).get("choiceResult", {})
-        hourly_map = choice_result.get("compareHourlyFcast~~1", {}).get("domesticHourlyListMap", {})
-        services = []
-
-        for provider_code, rows in hourly_map.items():
-            if provider_code == "KMA":
-                continue
-
-            service_target_date = target_date or ""
-            normalized_rows = []
-            updated_at = ""
-
-            for row in rows:
-                try:
-                    hour = int(str(row.get("aplTm", "")).zfill(2))
-                except ValueError:
-                    continue
-                if hour < start_hour or hour > end_hour:
-                    continue
-                row_date = str(row.get("aplYmd", ""))
-                if not service_target_date:
-                    service_target_date = row_date
-                if row_date != service_target_date:
-                    continue
-
-                normalized = cls.normalize_hourly_row(row)
-                normalized_rows.append(normalized)
-                if not updated_at:
-                    updated_at = normalized.get("updated_at", "")
-
-            if normalized_rows:
-                services.append({
-                    "provider": cls.PROVIDER_NAMES.get(provider_code, provider_code),
-                    "provider_code": provider_code,
-                    "updated_at": updated_at,
-                    "rows": normalized_rows,
-                })
-
-        services.sort(key=lambda service: cls.PROVIDER_ORDER.get(service["provider_code"], 99))
+    def parse_hourly_services(cls, html, start_hour=4, end_hour=8, target_date=None, region_code=NAVER_COMPARE_REGION_CODE):
+        hourly_map = extract_hourly_block(html).get("domesticHourlyListMap", {})
+        services = [cls.build_service(code, rows, start_hour, end_hour, target_date) for code, rows in hourly_map.items()]
+        return cls.build_payload(region_code, [service for service in services if service], target_date)
 
+    @classmethod
+    def build_payload(cls, region_code, services, target_date):
         return {
-            "region_code": NAVER_COMPARE_REGION_CODE,
-            "source_url": cls.BASE_URL.format(region_code=NAVER_COMPARE_REGION_CODE),
+            "region_code": region_code,
+            "source_url": cls.BASE_URL.format(region_code=region_code),
             "target_hours": "04:00-08:00",
             "target_date": target_date or "",
             "updated_at": datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC"),
-            "services": services,
+            "services": sorted(services, key=lambda service: cls.PROVIDER_ORDER.get(service["provider_code"], 99)),
         }
 
-    @staticmethod
-    def extract_block_api_result(html):
-        marker = "var blockApiResult = "
-        start = html.find(marker)
-        if start < 0:
-            raise ValueError("Naver compare payload not found")
-        decoder = json.JSONDecoder()
-        payload, _ = decoder.raw_decode(html[start + len(marker):])
-        return payload
+    @classmethod
+    def build_service(cls, provider_code, rows, start_hour=4, end_hour=8, target_date=None):
+        """One provider's rows inside the window, or None (KMA comes from the API)."""
+        if provider_code == "KMA":
+            return None
+
+        service_target_date = target_date or ""
+        normalized_rows = []
+        updated_at = ""
+
+        for row in rows:
+            try:
+                hour = int(str(row.get("aplTm", "")).zfill(2))
+            except ValueError:
+                continue
+            if hour < start_hour or hour > end_hour:
+                continue
+            row_date = str(row.get("aplYmd", ""))
+            if not service_target_date:
+                service_target_date = row_date
+            if row_date != service_target_date:
+                continue
+
+            normalized = cls.normalize_hourly_row(row)
+            normalized_rows.append(normalized)
+            if not updated_at:
+                updated_at = normalized.get("updated_at", "")
+
+        if not normalized_rows:
+            return None
+        return {
+            "provider": cls.PROVIDER_NAMES.get(provider_code, provider_code),
+            "provider_code": provider_code,
+            "updated_at": updated_at,
+            "rows": normalized_rows,
+        }
 
     @staticmethod
     def normalize_hourly_row(row):
@@ -208,32 +276,6 @@ class NaverCompareFetcher:
         return f"{value}{suffix}"
 
 
-def parse_forecast_items(items):
-    """
-    Parse API response items into structured forecast data.
-    Groups by fcstDate + fcstTime and extracts weather categories.
-    """
-    if not items:
-        return []
-    
-    # Group items by forecast datetime
-    forecast_map = {}
-    
-    for item in items:
-        fcst_date = item.get('fcstDate', '')
-        fcst_time = item.get('fcstTime', '')
-        category = item.get('category', '')
-        value = item.get('fcstValue', '')
-        
-        key = f"{fcst_date}{fcst_time}"
-        if key not in forecast_map:
-            forecast_map[key] = {'fcstDate': fcst_date, 'fcstTime': fcst_time}
-        
-        forecast_map[key][category] = value
-    
-    return forecast_map
-
-
 def get_target_times():
     """
     Determine target morning hours (04:00 - 08:00).
@@ -253,103 +295,258 @@ def get_target_times():
     return target_times
 
 
-def main():
-    print("Starting Weather Update (Public Data Portal API)...")
+def load_locations(path=LOCATIONS_FILE, json_db_path=JSON_DB_PATH):
+    """
+    Locations from the config, each resolved to its grid cell through
+    weather_code.json (explicit nx/ny in the config win). Unknown addresses
+    are skipped. Without a config the built-in GRID_X/GRID_Y location is used.
+    Returns (locations, default_id).
+    """
+    if not os.path.exists(path):
+        builtin = {"id": "default", "label": "", "address": "", "nx": GRID_X, "ny": GRID_Y,
+                   "naver_region_code": NAVER_COMPARE_REGION_CODE}
+        return [builtin], "default"
+
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    coords_map = None
+    locations = []
+    for entry in config.get("locations", []):
+        loc = dict(entry)
+        if "nx" not in loc or "ny" not in loc:
+            if coords_map is None:
+                coords_map = open_address_db(json_db_path)
+            coord = coords_map.get(loc.get("address", ""))
+            if coord is None:
+                print(f"[SKIP] Unknown address for {loc.get('id')}: {loc.get('address')}")
+                continue
+            loc["nx"], loc["ny"] = coord["x"], coord["y"]
+        locations.append(loc)
+    default_id = config.get("default") or (locations[0]["id"] if locations else None)
+    return locations, default_id
+
+
+def build_rows(table, target_times):
+    """weather_data.json rows for the target hours present in table."""
+    # Category mappings
+    sky_map = {
+        1: 'Clear',
+        3: 'Cloudy', 
+        4: 'Overcast'
+    }
+    
+    output_list = []
+    for target in target_times:
+        i = table.offset_of(target)
+        if i is None or not table.has_data(i):
+            print(f"No data for {target}")
+            continue
+        
+        obj = {
+            "time": f"{target[8:10]}:00",
+            "temp": table.get('TMP', i, -99),
+            "sky": sky_map.get(table.get('SKY', i, 1), 'Unknown'),
+            "wind": table.get('WSD', i, 0),
+            "pop": int(table.get('POP', i, 0)),
+            "pty": table.get('PTY', i, 0)
+        }
+        
+        output_list.append(obj)
+    return output_list
+
+
+def fetch_service(region_code):
     try:
-        service_data = NaverCompareFetcher.fetch_hourly_services()
-        with open(SERVICE_OUTPUT_FILE, "w", encoding='utf-8') as f:
-            json.dump(service_data, f, indent=2, ensure_ascii=False)
-        service_count = sum(len(service.get("rows", [])) for service in service_data.get("services", []))
-        print(f"Saved {service_count} service forecast rows to {SERVICE_OUTPUT_FILE}")
+        return NaverCompareFetcher.fetch_hourly_services(region_code=region_code)
     except Exception as e:
-        print(f"Naver service forecast fetch failed: {e}")
-    
-    # Fetch forecast
-    items = WeatherFetcher.fetch_forecast(GRID_X, GRID_Y)
-    
-    if not items:
-        print("Failed to fetch forecast data!")
-        return
-    
-    print(f"Fetched {len(items)} forecast items")
-    
-    # Parse items
-    forecast_map = parse_forecast_items(items)
+        print(f"Naver service forecast fetch failed ({region_code}): {e}")
+        return None
+
+
+def write_json(path, data, compact=False):
+    """Atomically write data; shards are compact, legacy files indented."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding='utf-8') as f:
+        if compact:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        else:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+# --- Run state: skip what cannot have changed since the last run ---
+def semantic_hash(data):
+    """sha256 of data without the run timestamps at VOLATILE_PATHS."""
+    def strip(value, paths):
+        if not isinstance(value, dict) or not paths:
+            return value
+        stripped = {}
+        for key, item in value.items():
+            if (key,) in paths:
+                continue
+            stripped[key] = strip(item, {path[1:] for path in paths if len(path) > 1 and path[0] == key})
+        return stripped
+    text = json.dumps(strip(data, set(VOLATILE_PATHS)), ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def load_state(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_if_changed(path, data, hashes, compact=False):
+    """
+    write_json() only if the semantic content differs from the last write
+    recorded in hashes (path -> hash). Returns True if the file was written.
+    """
+    digest = semantic_hash(data)
+    if hashes.get(path) == digest and os.path.exists(path):
+        return False
+    write_json(path, data, compact=compact)
+    hashes[path] = digest
+    return True
+
+
+def load_cached_rows(locations):
+    """{id: rows} from the existing shards, or None if any is unusable."""
+    cached = {}
+    for loc in locations:
+        try:
+            with open(os.path.join(SHARD_DIR, f"{loc['id']}.json"), "r", encoding="utf-8") as f:
+                shard = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (shard.get("nx"), shard.get("ny")) != (loc["nx"], loc["ny"]) or not shard.get("rows"):
+            return None
+        cached[loc["id"]] = shard["rows"]
+    return cached
+
+
+def main():
+    print("Starting Weather Update (Public Data Portal API)...")
     
     # Get target morning times
     target_times = get_target_times()
     print(f"Target times: {target_times}")
     
-    # Extract data for target times
-    output_list = []
+    locations, default_id = load_locations(LOCATIONS_FILE, JSON_DB_PATH)
+    if not locations:
+        print("No locations configured!")
+        return
+    cells = list(dict.fromkeys((loc["nx"], loc["ny"]) for loc in locations))
+    region_codes = list(dict.fromkeys(loc["naver_region_code"] for loc in locations if loc.get("naver_region_code")))
+    print(f"{len(locations)} locations -> {len(cells)} grid cells, {len(region_codes)} Naver regions")
     
-    # Category mappings
-    sky_map = {
-        '1': 'Clear',
-        '3': 'Cloudy', 
-        '4': 'Overcast'
+    # A KMA issuance never changes once published: while the base time,
+    # target date and locations match the last run, reuse its rows
+    state = load_state(STATE_FILE)
+    hashes = dict(state.get("outputs", {}))
+    base_date, base_time = WeatherFetcher.get_base_datetime()
+    kma_key = {
+        "base_date": base_date,
+        "base_time": base_time,
+        "target_date": target_times[0][:8],
+        "locations": semantic_hash(locations),
     }
+    cached_rows = load_cached_rows(locations) if state.get("kma") == kma_key else None
+    if cached_rows is not None:
+        print(f"KMA issuance {base_date} {base_time} unchanged since the last run, skipping the API")
+    NaverCompareFetcher.cache = ProviderCache(state.get("providers"))
     
-    for target in target_times:
-        fcst_date = target[:8]
-        fcst_time = target[8:]
-        key = f"{fcst_date}{fcst_time}"
+    # Every unique cell and region is fetched once, all at the same time
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        table_futures = {} if cached_rows is not None else {
+            cell: pool.submit(WeatherFetcher.fetch_window, cell[0], cell[1], target_times) for cell in cells
+        }
+        service_futures = {code: pool.submit(fetch_service, code) for code in region_codes}
+        tables = {cell: future.result() for cell, future in table_futures.items()}
+        services = {code: future.result() for code, future in service_futures.items()}
+    
+    manifest = {
+        "updated_at": get_kst_now().strftime("%Y-%m-%d %H:%M KST"),
+        "target_date": target_times[0][:8],
+        "target_hours": f"{target_times[0][8:10]}:00-{target_times[-1][8:10]}:00",
+        "default": default_id,
+        "locations": [],
+    }
+    written = []
+    all_rows = True
+    for loc in locations:
+        cell = (loc["nx"], loc["ny"])
+        service = services.get(loc.get("naver_region_code"))
+        if cached_rows is not None:
+            rows = cached_rows[loc["id"]]
+        else:
+            table = tables.get(cell)
+            rows = build_rows(table, target_times) if table else []
         
-        if key not in forecast_map:
-            print(f"No data for {key}")
+        if loc["id"] == default_id and service is not None:
+            # Single-location files kept for older pages
+            if write_if_changed(SERVICE_OUTPUT_FILE, service, hashes):
+                written.append(SERVICE_OUTPUT_FILE)
+                service_count = sum(len(s.get("rows", [])) for s in service.get("services", []))
+                print(f"Saved {service_count} service forecast rows to {SERVICE_OUTPUT_FILE}")
+        if not rows:
+            print(f"No data collected for {loc['id']} {cell}!")
+            all_rows = False
             continue
         
-        data = forecast_map[key]
-        
-        # Parse values
-        try:
-            temp = float(data.get('TMP', -99))
-        except:
-            temp = -99
-            
-        try:
-            wind = float(data.get('WSD', 0))
-        except:
-            wind = 0
-            
-        try:
-            pop = int(data.get('POP', 0))
-        except:
-            pop = 0
-            
-        try:
-            pty = int(data.get('PTY', 0))
-        except:
-            pty = 0
-            
-        sky_code = data.get('SKY', '1')
-        sky = sky_map.get(sky_code, 'Unknown')
-        
-        obj = {
-            "time": f"{fcst_time[:2]}:00",
-            "temp": temp,
-            "sky": sky,
-            "wind": wind,
-            "pop": pop,
-            "pty": pty
+        shard_path = os.path.join(SHARD_DIR, f"{loc['id']}.json")
+        shard = {
+            "id": loc["id"],
+            "label": loc.get("label", ""),
+            "nx": loc["nx"],
+            "ny": loc["ny"],
+            "rows": rows,
+            "service": service,
         }
+        if write_if_changed(shard_path, shard, hashes, compact=True):
+            written.append(shard_path)
+        entry = {key: loc[key] for key in ("id", "label", "address", "nx", "ny", "lat", "lon") if key in loc}
+        entry["shard"] = shard_path.replace(os.sep, "/")
+        # Content version for the page's cache busting; changes with the shard
+        entry["hash"] = hashes[shard_path][:12]
+        manifest["locations"].append(entry)
         
-        output_list.append(obj)
+        if loc["id"] == default_id:
+            if write_if_changed(OUTPUT_FILE, rows, hashes):
+                written.append(OUTPUT_FILE)
+                print(f"Saved {len(rows)} items to {OUTPUT_FILE}")
+        
+        # Print summary
+        print(f"[{loc['id']}] {loc.get('label', '')} ({cell[0]}, {cell[1]})")
+        for item in rows:
+            print(f"  {item['time']}: {item['temp']}°C, {item['sky']}, 강수확률 {item['pop']}%")
     
-    # Validate
-    if not output_list:
+    if manifest["locations"]:
+        if write_if_changed(MANIFEST_FILE, manifest, hashes, compact=True):
+            written.append(MANIFEST_FILE)
+    else:
         print("No data collected for target times!")
-        return
     
-    # Save to file
-    with open(OUTPUT_FILE, "w", encoding='utf-8') as f:
-        json.dump(output_list, f, indent=2, ensure_ascii=False)
-    
-    print(f"Saved {len(output_list)} items to {OUTPUT_FILE}")
-    
-    # Print summary
-    for item in output_list:
-        print(f"  {item['time']}: {item['temp']}°C, {item['sky']}, 강수확률 {item['pop']}%")
+    new_state = {
+        # Only a complete run lets the next one skip the KMA API
+        "kma": kma_key if all_rows else None,
+        "outputs": hashes,
+        "providers": NaverCompareFetcher.cache.state(),
+    }
+    stats = NaverCompareFetcher.cache.stats
+    print(f"Naver providers: {stats['hits']} pages not modified, {stats['misses']} fetched, "
+          f"{stats['skipped_providers']} providers unchanged, {stats['built_providers']} rebuilt")
+    # Provider stamps alone do not justify a commit; they ride along with real changes
+    if written or new_state["kma"] != state.get("kma") or new_state["outputs"] != state.get("outputs"):
+        write_json(STATE_FILE, new_state)
+    if written:
+        print(f"Updated {len(written)} files: {', '.join(written)}")
+    else:
+        print("No semantic changes, nothing written")
 
 
 if __name__ == "__main__":